@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.db.session import get_db
 from app.services.category_service import get_all_categories
 from app.schemas.category import CategoryResponse
+from app.services.category_crawler import BESTSELLERS_URL, crawl_category_tree
+from app.services.job_service import JOB_KIND_CRAWL_TREE, JOB_KIND_SYNC_CATEGORIES, create_job
 from app.utils.scheduler import sync_amazon_categories
 
 router = APIRouter(prefix="/categories", tags=["categories"])
@@ -14,7 +17,26 @@ async def get_categories(db: AsyncSession = Depends(get_db)):
     categories = await get_all_categories(db)
     return categories
 
+# In worker mode the browser work is queued for worker.py instead of run here
+
 @router.post("/api/admin/force-sync-categories")
-async def force_sync_categories(background_tasks: BackgroundTasks):
+async def force_sync_categories(
+    background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)
+):
+    if settings.JOB_EXECUTION_MODE == "worker":
+        job = await create_job(db, BESTSELLERS_URL, kind=JOB_KIND_SYNC_CATEGORIES)
+        return {"message": "Category sync queued", "job_id": job.id}
     background_tasks.add_task(sync_amazon_categories)
     return {"message": "Syncing category"}
+
+
+@router.post("/api/admin/crawl-tree")
+async def crawl_tree(
+    background_tasks: BackgroundTasks, reset: bool = False, db: AsyncSession = Depends(get_db)
+):
+    if settings.JOB_EXECUTION_MODE == "worker":
+        mode = "reset" if reset else None
+        job = await create_job(db, BESTSELLERS_URL, mode=mode, kind=JOB_KIND_CRAWL_TREE)
+        return {"message": "Category tree crawl queued", "job_id": job.id}
+    background_tasks.add_task(crawl_category_tree, reset=reset)
+    return {"message": "Crawling category tree"}
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.schemas import HistoryPointResponse, PriceDropResponse, RankMoverResponse
+from app.services.history_service import (
+    get_category_id,
+    get_price_drops,
+    get_product_history,
+    get_rank_movers,
+)
+
+router = APIRouter(prefix="/history", tags=["history"])
+
+
+@router.get("/price-drops", response_model=list[PriceDropResponse])
+async def price_drops(
+    days: int = Query(7, ge=1, le=365, description="Look-back window in days"),
+    category_url: str = Query(None, description="Filter by category URL"),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+):
+    category_id = None
+    if category_url:
+        category_id = await get_category_id(db, category_url)
+        if category_id is None:
+            raise HTTPException(status_code=404, detail="Category not found")
+    return await get_price_drops(db, days, category_id, limit)
+
+
+@router.get("/rank-movers", response_model=list[RankMoverResponse])
+async def rank_movers(
+    category_url: str = Query(..., description="Category URL"),
+    days: int = Query(7, ge=1, le=365, description="Look-back window in days"),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+):
+    category_id = await get_category_id(db, category_url)
+    if category_id is None:
+        raise HTTPException(status_code=404, detail="Category not found")
+    return await get_rank_movers(db, category_id, days, limit)
+
+
+@router.get("/products/{asin}", response_model=list[HistoryPointResponse])
+async def product_history(
+    asin: str,
+    days: int = Query(None, ge=1, description="Only points from the last N days"),
+    db: AsyncSession = Depends(get_db),
+):
+    history = await get_product_history(db, asin, days)
+    if history is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return history
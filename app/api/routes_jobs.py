@@ -0,0 +1,79 @@
+import asyncio
+import json
+from typing import AsyncGenerator
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal, get_db
+from app.schemas import JobCreate, JobResponse
+from app.services.job_runner import job_runner
+from app.services.job_service import TERMINAL_STATUSES, create_job, get_job, get_job_stats
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/", response_model=JobResponse, status_code=202)
+async def enqueue_parse_job(request: JobCreate, db: AsyncSession = Depends(get_db)):
+    job = await create_job(db, request.category_url, request.mode)
+    job_runner.notify()
+    return job
+
+
+@router.get("/stats")
+async def get_jobs_stats(db: AsyncSession = Depends(get_db)):
+    return await get_job_stats(db)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_parse_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    job = await get_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}/events")
+async def stream_parse_job_events(job_id: str, request: Request):
+    """Server-Sent Events: one `progress` event per finished product, then `done`."""
+    async with AsyncSessionLocal() as db:
+        if await get_job(db, job_id) is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+    async def event_stream() -> AsyncGenerator[str, None]:
+        sent = 0
+        last_status = None
+        while not await request.is_disconnected():
+            async with AsyncSessionLocal() as db:
+                job = await get_job(db, job_id)
+            if job is None:
+                return
+
+            if job.status != last_status:
+                last_status = job.status
+                yield _sse("status", {"status": job.status, "total": job.total})
+
+            for entry in job.progress[sent:]:
+                yield _sse("progress", {**entry, "completed": sent + 1, "total": job.total})
+                sent += 1
+
+            if job.status in TERMINAL_STATUSES:
+                yield _sse(
+                    "done",
+                    {"status": job.status, "result": job.result, "error": job.error},
+                )
+                return
+
+            await asyncio.sleep(settings.JOB_EVENTS_POLL_INTERVAL_SECONDS)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
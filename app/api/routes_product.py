@@ -1,53 +1,106 @@
-from fastapi import APIRouter, Query, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Query, Depends, HTTPException, Response
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.db.session import get_db
-from app.schemas import ProductResponse
+from app.schemas import ProductListItem, ScrapeMode
 
-from app.services.amazon_parser import parse_category_full
-from app.services.category_service import get_or_create_category
-from app.services.product_service import ProductService
+from app.services.category_service import get_or_create_category, is_category_fresh
+from app.services.job_service import create_job
+from app.services.product_service import DEFAULT_PAGE_SIZE, ProductService
+from app.services.scrape_service import refresh_category, scrape_category
 
 router = APIRouter()
 
 
 class ParseRequest(BaseModel):
     category_url: str
+    # "listing" reads only the best-seller grid; defaults to settings.SCRAPE_MODE
+    mode: ScrapeMode | None = None
 
 
-@router.get("/", response_model=list[ProductResponse])
+@router.get("/", response_model=list[ProductListItem], response_model_exclude_unset=True)
 async def get_products(
+    response: Response,
     category_url: str = Query(None, description="Filter by category URL"),
     min_rating: float = Query(None, description="Minimal rating"),
     max_price: float = Query(None, description="Maximal price"),
-    sort_by: str = Query(None, description="Sort by (price, rating, -rating)"),
+    sort_by: str = Query(None, description="Sort by (price, -price, rating)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=1000, description="Page size"),
+    cursor: str = Query(None, description="X-Next-Cursor of the previous page"),
+    fields: str = Query(None, description="Comma-separated columns, e.g. asin,title,price"),
     db: AsyncSession = Depends(get_db),
 ):
-    products = await ProductService.get_filtered_products(db, category_url, min_rating, max_price, sort_by)
+    try:
+        products, next_cursor = await ProductService.get_products_page(
+            db,
+            category_url,
+            min_rating,
+            max_price,
+            sort_by,
+            limit=limit,
+            cursor=cursor,
+            fields=[field.strip() for field in fields.split(",") if field.strip()]
+            if fields
+            else None,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return products
 
 
 @router.post("/parse")
-async def parse_category(request: ParseRequest, db: AsyncSession = Depends(get_db)):
+async def parse_category(
+    request: ParseRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+):
     category = await get_or_create_category(db, request.category_url)
 
     if await ProductService.check_products_exist(db, category.id):
+        if is_category_fresh(category):
+            return {
+                "status": "success",
+                "detail": "Data already exists in database. Skipping Playwright.",
+                "cached": True,
+                "stale": False,
+            }
+
+        # Stale-while-revalidate: answer from the database, refresh afterwards
+        if settings.JOB_EXECUTION_MODE == "worker":
+            await create_job(db, request.category_url, request.mode)
+        else:
+            background_tasks.add_task(refresh_category, request.category_url, request.mode)
         return {
             "status": "success",
-            "detail": "Data already exists in database. Skipping Playwright.",
-            "cached": True
+            "detail": "Returning stale data. Refresh queued in background.",
+            "cached": True,
+            "stale": True,
         }
 
-    products_data = await parse_category_full(request.category_url)
-    
-    if not products_data:
-        raise HTTPException(status_code=404, detail="Amazon returned no products")
+    if settings.JOB_EXECUTION_MODE == "worker":
+        job = await create_job(db, request.category_url, request.mode)
+        return {
+            "status": "queued",
+            "detail": "Scrape queued for a worker process.",
+            "cached": False,
+            "job_id": job.id,
+        }
 
-    await ProductService.save_parsed_products(db, products_data, category.id)
+    result = await scrape_category(category, mode=request.mode)
+
+    if result is None:
+        raise HTTPException(status_code=404, detail="Amazon returned no products")
 
     return {
         "status": "success",
-        "detail": f"Successfully parsed {len(products_data)} products",
-        "cached": False
+        "detail": f"Successfully parsed {result['parsed']} products",
+        "cached": False,
+        "stale": False,
+        "modified": result["inserted"] + result["updated"],
+        **result,
     }
@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.services.browser_pool import browser_pool
+from app.services.html_archive import find_pages, page_to_dict
+from app.services.proxy_pool import proxy_pool
+from app.services.reparse_service import reparse_archive
+from app.utils.circuit_breaker import circuit_breaker
+from app.utils.rate_limiter import rate_limiter
+from app.utils.resource_blocking import resource_blocking_stats
+
+router = APIRouter(prefix="/system", tags=["system"])
+
+
+@router.get("/browser-pool")
+async def get_browser_pool_stats():
+    return browser_pool.stats()
+
+
+@router.get("/resource-blocking")
+async def get_resource_blocking_stats():
+    return resource_blocking_stats.snapshot()
+
+
+@router.get("/rate-limiter")
+async def get_rate_limiter_stats():
+    return rate_limiter.stats()
+
+
+@router.get("/circuit-breaker")
+async def get_circuit_breaker_stats():
+    return circuit_breaker.stats()
+
+
+@router.get("/proxies")
+async def get_proxy_stats():
+    return proxy_pool.stats()
+
+
+@router.get("/archive/pages")
+async def get_archived_pages(
+    url: str = Query(None, description="Exact page URL"),
+    asin: str = Query(None),
+    page_type: Literal["product", "category"] = Query(None),
+    since: datetime = Query(None, description="Fetched at or after"),
+    until: datetime = Query(None, description="Fetched before"),
+    latest_only: bool = Query(False, description="Only the latest fetch per URL"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+):
+    pages = await find_pages(
+        db,
+        url=url,
+        asin=asin,
+        page_type=page_type,
+        since=since,
+        until=until,
+        latest_only=latest_only,
+        limit=limit,
+    )
+    return [page_to_dict(page) for page in pages]
+
+
+@router.post("/archive/reparse")
+async def reparse_archived_pages(
+    page_type: Literal["product", "category"] = Query(None),
+    category_url: str = Query(None),
+    asin: str = Query(None),
+    since: datetime = Query(None, description="Fetched at or after"),
+    until: datetime = Query(None, description="Fetched before"),
+    latest_only: bool = Query(True, description="Only the latest fetch per URL"),
+    limit: int = Query(None, ge=1),
+    workers: int = Query(None, ge=1, description="Parse processes (default: all cores)"),
+):
+    """Re-extract archived pages and upsert the products. Large runs: use reparse.py."""
+    return await reparse_archive(
+        page_type=page_type,
+        category_url=category_url,
+        asin=asin,
+        since=since,
+        until=until,
+        latest_only=latest_only,
+        limit=limit,
+        workers=workers,
+    )
@@ -5,8 +5,87 @@ class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite+aiosqlite:///./amazon.sqlite3"
 
     PROXY_URL: str | None = None
+    # Additional proxies: comma-separated URLs and/or a file with one URL per line
+    PROXY_URLS: str | None = None
+    PROXY_FILE: str | None = None
+    PROXY_MIN_SAMPLES: int = 5
+    PROXY_QUARANTINE_CAPTCHA_RATE: float = 0.3
+    PROXY_QUARANTINE_BLOCK_RATE: float = 0.6
+    PROXY_QUARANTINE_FAILURE_RATE: float = 0.6
+    PROXY_QUARANTINE_SECONDS: int = 600
 
     BROWSER_HEADLESS: bool = True
+    BROWSER_POOL_SIZE: int = 2
+    BROWSER_CONTEXTS_PER_BROWSER: int = 4
+    BROWSER_MAX_PAGES_PER_BROWSER: int = 200
+
+    PRODUCT_CONCURRENCY_PER_CATEGORY: int = 3
+    PRODUCT_CONCURRENCY_GLOBAL: int = 8
+
+    # Best-seller entries to scrape per category (Amazon lists at most 100 over 2 pages)
+    TOP_N_PRODUCTS: int = 5
+    BESTSELLER_MAX_SCROLLS: int = 10
+
+    # "full": detail page per product, "listing": best-seller grid only,
+    # "tiered": grid plus detail pages for ASINs whose listing data changed
+    SCRAPE_MODE: str = "full"
+
+    # "bulk": one page.evaluate per product, "handles": per-selector calls,
+    # "html": page.content() parsed with lxml (app.services.html_extractor)
+    EXTRACTION_MODE: str = "bulk"
+    # Processes parsing HTML in "html" mode; 0 parses on the event loop
+    HTML_PARSE_WORKERS: int = 2
+
+    # Keep every fetched product/best-seller page as zstd-compressed HTML
+    # (app.services.html_archive) so extraction can be re-run offline
+    HTML_ARCHIVE_ENABLED: bool = False
+    HTML_ARCHIVE_DIR: str = ".html_archive"
+    HTML_ARCHIVE_ZSTD_LEVEL: int = 3
+
+    # "record": save fetched Amazon documents to FIXTURE_DIR, "replay": serve
+    # Amazon from the local stand-in (benchmarks/fixture_server.py) instead
+    FIXTURE_MODE: str = "off"
+    FIXTURE_DIR: str = "fixtures"
+    FIXTURE_SERVER_URL: str = "http://127.0.0.1:8765"
+
+    # Category data older than this is served stale and refreshed in the background
+    CATEGORY_FRESHNESS_TTL_SECONDS: int = 6 * 60 * 60
+
+    # "none": in-process coalescing only, "lease": also dedupe across workers via the DB
+    SCRAPE_LOCK_MODE: str = "none"
+    SCRAPE_LEASE_TTL_SECONDS: int = 300
+
+    # Cached cookies/storage_state with the US delivery location already set
+    STORAGE_STATE_DIR: str = ".storage_state"
+    STORAGE_STATE_TTL_SECONDS: int = 24 * 60 * 60
+
+    # Request interception profiles from app.utils.resource_blocking.PROFILES
+    RESOURCE_BLOCKING_PROFILE: str = "scraping"
+    LOCATION_RESOURCE_PROFILE: str = "none"
+
+    # Adaptive per (proxy, host) navigation rate limit, in requests per second
+    RATE_LIMIT_INITIAL_RPS: float = 0.5
+    RATE_LIMIT_MIN_RPS: float = 0.05
+    RATE_LIMIT_MAX_RPS: float = 4.0
+    RATE_LIMIT_INCREASE_RPS: float = 0.05
+    RATE_LIMIT_DECREASE_FACTOR: float = 0.5
+    RATE_LIMIT_BURST: float = 2.0
+
+    CIRCUIT_BREAKER_WINDOW: int = 20
+    CIRCUIT_BREAKER_MIN_SAMPLES: int = 10
+    CIRCUIT_BREAKER_BLOCK_RATE: float = 0.5
+    CIRCUIT_BREAKER_COOLDOWN_SECONDS: int = 300
+
+    CRAWL_MAX_DEPTH: int = 3
+    CRAWL_CONCURRENCY: int = 3
+
+    # "inline": the API process runs jobs, "worker": only worker.py processes do
+    JOB_EXECUTION_MODE: str = "inline"
+    JOB_WORKERS: int = 2
+    JOB_VISIBILITY_TIMEOUT_SECONDS: int = 120
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    JOB_EVENTS_POLL_INTERVAL_SECONDS: float = 1.0
 
     LOG_LEVEL: str = "INFO"
 
@@ -0,0 +1,16 @@
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def dialect_insert(db: AsyncSession):
+    """
+    Return the dialect-specific insert() that supports ON CONFLICT.
+    Raises ValueError for databases other than PostgreSQL and SQLite.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return pg_insert
+    if dialect == "sqlite":
+        return sqlite_insert
+    raise ValueError(f"Upsert is not supported for database dialect '{dialect}'")
@@ -1,15 +1,26 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from prometheus_client import CONTENT_TYPE_LATEST
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import engine
+from app.config import settings
+from app.db.session import engine, get_db
 from app.db.base import Base
 
 from app.api.routes_categories import router as categories_router
+from app.api.routes_history import router as history_router
+from app.api.routes_jobs import router as jobs_router
 from app.api.routes_product import router as product_router
-from app.utils.scheduler import sync_amazon_categories
+from app.api.routes_system import router as system_router
+from app.services.browser_pool import browser_pool
+from app.services.html_extractor import shutdown_pool
+from app.services.job_runner import job_runner
+from app.services.job_service import get_queue_depths
+from app.utils.metrics import queue_depth, render_metrics
+from app.utils.scheduler import enqueue_category_sync, sync_amazon_categories
 
 scheduler = AsyncIOScheduler()
 
@@ -17,9 +28,15 @@ scheduler = AsyncIOScheduler()
 async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
-    
+
+    # In worker mode the API only enqueues; worker.py processes own the browsers
+    inline = settings.JOB_EXECUTION_MODE == "inline"
+    if inline:
+        await browser_pool.start()
+        await job_runner.start()
+
     scheduler.add_job(
-        sync_amazon_categories, 
+        sync_amazon_categories if inline else enqueue_category_sync, 
         CronTrigger(hour=13, minute=20), 
         id="sync_categories_daily",
         replace_existing=True
@@ -28,6 +45,9 @@ async def lifespan(app: FastAPI):
     yield
 
     scheduler.shutdown()
+    await job_runner.stop()
+    await browser_pool.stop()
+    shutdown_pool()
 
 
 app = FastAPI(
@@ -43,7 +63,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(categories_router)
 app.include_router(product_router)
+app.include_router(jobs_router)
+app.include_router(history_router)
+app.include_router(system_router)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(db: AsyncSession = Depends(get_db)):
+    queue_depth.by_status = await get_queue_depths(db)
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
@@ -1,2 +1,7 @@
 from .category import Category
 from .product import Product
+from .scrape_lease import ScrapeLease
+from .parse_job import ParseJob
+from .crawl_frontier import CrawlFrontierEntry
+from .product_snapshot import ProductSnapshot
+from .archived_page import ArchivedPage
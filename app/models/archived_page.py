@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import BigInteger, DateTime, Index, Integer, SmallInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+class ArchivedPage(Base):
+    """
+    One fetch of a product or best-seller page. The HTML itself lives in the
+    content-addressed archive on disk (app.services.html_archive) under
+    `content_hash`, so identical fetches share one blob.
+    """
+
+    __tablename__ = "archived_pages"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
+    )
+    url: Mapped[str] = mapped_column(String, nullable=False)
+    # "product" or "category"
+    page_type: Mapped[str] = mapped_column(String(16), nullable=False)
+    asin: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Category the page was scraped for; rank is the product's rank in it,
+    # or the first rank shown on a best-seller page
+    category_url: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    rank: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_archived_pages_url_fetched", "url", "fetched_at"),
+        Index("ix_archived_pages_asin_fetched", "asin", "fetched_at"),
+        Index("ix_archived_pages_type_fetched", "page_type", "fetched_at"),
+    )
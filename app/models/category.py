@@ -1,5 +1,6 @@
-from typing import TYPE_CHECKING
-from sqlalchemy import String
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+from sqlalchemy import DateTime, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 
@@ -13,6 +14,13 @@ class Category(Base):
     id: Mapped[int] = mapped_column(primary_key=True, index=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
     url: Mapped[str] = mapped_column(String, unique=True, index=True)
+    parent_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("categories.id"), nullable=True, index=True
+    )
+    depth: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_scraped_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
     products: Mapped[list["Product"]] = relationship(
         back_populates="category", cascade="all, delete-orphan"
     )
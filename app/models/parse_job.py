@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Any, Optional
+from sqlalchemy import DateTime, Integer, JSON, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+class ParseJob(Base):
+    __tablename__ = "parse_jobs"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    # "scrape" (NULL on rows from before job kinds), "sync_categories" or "crawl_tree"
+    kind: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    category_url: Mapped[str] = mapped_column(String, nullable=False)
+    # Scrape mode of a scrape job; "reset" restarts a crawl_tree job's frontier
+    mode: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+    # Set while queued or running: one active job per kind, URL and mode
+    dedupe_key: Mapped[Optional[str]] = mapped_column(String, nullable=True, unique=True, index=True)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, index=True)
+    total: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    completed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    progress: Mapped[list[dict[str, Any]]] = mapped_column(JSON, nullable=False, default=list)
+    result: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    locked_by: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True
+    )
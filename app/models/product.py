@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import String, Float, Integer, Boolean, ForeignKey, JSON
+from sqlalchemy import String, Float, Integer, Boolean, ForeignKey, Index, JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 from typing import Optional
@@ -27,7 +27,17 @@ class Product(Base):
     best_sellers_rank: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     bullet_points: Mapped[Optional[list[str]]] = mapped_column(JSON, nullable=True)
     main_image_url: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    listing_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     category_id: Mapped[int] = mapped_column(
-        ForeignKey("categories.id"), nullable=False
+        ForeignKey("categories.id"), nullable=False, index=True
     )
     category: Mapped["Category"] = relationship(back_populates="products")
+
+    # Keyset pagination: (sort column, id), alone and within a category
+    __table_args__ = (
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_rating_id", "rating", "id"),
+        Index("ix_products_category_price_id", "category_id", "price", "id"),
+        Index("ix_products_category_rating_id", "category_id", "rating", "id"),
+    )
@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+class ProductSnapshot(Base):
+    """
+    Append-only price/rank history. A row is written only when a tracked
+    value changed; `change_mask` tells which columns carry a new value
+    (the others are NULL). Prices are stored in cents, ratings in tenths.
+    """
+
+    __tablename__ = "product_snapshots"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
+    )
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), nullable=False)
+    category_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    captured_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    change_mask: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    price_cents: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    price_delta_cents: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    rank: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
+    rank_delta: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
+    rating_tenths: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
+    reviews_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    __table_args__ = (
+        # Per-ASIN history
+        Index("ix_product_snapshots_product_captured", "product_id", "captured_at"),
+        # Rank movers within a category
+        Index(
+            "ix_product_snapshots_category_rank_changes",
+            "category_id",
+            "captured_at",
+            "product_id",
+            "rank_delta",
+            postgresql_where=rank_delta.is_not(None),
+            sqlite_where=rank_delta.is_not(None),
+        ),
+        # Price drops across all categories
+        Index(
+            "ix_product_snapshots_price_changes",
+            "captured_at",
+            "product_id",
+            "price_delta_cents",
+            postgresql_where=price_delta_cents.is_not(None),
+            sqlite_where=price_delta_cents.is_not(None),
+        ),
+    )
@@ -1,2 +1,4 @@
 from .category import CategoryCreate, CategoryResponse
-from .product import ProductCreate, ProductResponse
+from .product import ProductCreate, ProductListItem, ProductResponse
+from .job import JobCreate, JobResponse, ScrapeMode
+from .history import HistoryPointResponse, PriceDropResponse, RankMoverResponse
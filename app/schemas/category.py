@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import BaseModel, ConfigDict
 
 
@@ -12,5 +13,7 @@ class CategoryCreate(CategoryBase):
 
 class CategoryResponse(CategoryBase):
     id: int
+    parent_id: Optional[int] = None
+    depth: Optional[int] = None
 
     model_config = ConfigDict(from_attributes=True)
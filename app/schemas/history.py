@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+
+class PriceDropResponse(BaseModel):
+    asin: str
+    title: str
+    category_id: int
+    price: Optional[float] = None
+    previous_price: Optional[float] = None
+    price_change: float
+    price_change_pct: Optional[float] = None
+
+
+class RankMoverResponse(BaseModel):
+    asin: str
+    title: str
+    rank: int
+    previous_rank: int
+    rank_change: int
+
+
+class HistoryPointResponse(BaseModel):
+    captured_at: datetime
+    category_id: int
+    price: Optional[float] = None
+    rank: Optional[int] = None
+    rating: Optional[float] = None
+    reviews_count: Optional[int] = None
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Any, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+ScrapeMode = Literal["full", "listing", "tiered"]
+
+
+class JobCreate(BaseModel):
+    category_url: str
+    mode: Optional[ScrapeMode] = None
+
+
+class JobResponse(BaseModel):
+    id: str
+    kind: Optional[str] = None
+    category_url: str
+    mode: Optional[str] = None
+    status: str
+    total: Optional[int] = None
+    completed: int = 0
+    progress: list[dict[str, Any]] = Field(default_factory=list)
+    result: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
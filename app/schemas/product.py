@@ -27,3 +27,23 @@ class ProductResponse(ProductBase):
     currency: str
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ProductListItem(BaseModel):
+    """GET / row; only the requested fields= are serialized."""
+
+    id: Optional[int] = None
+    asin: Optional[str] = None
+    title: Optional[str] = None
+    rank: Optional[int] = None
+    price: Optional[float] = None
+    currency: Optional[str] = None
+    list_price: Optional[float] = None
+    discount_percentage: Optional[float] = None
+    rating: Optional[float] = None
+    reviews_count: Optional[int] = None
+    is_prime: Optional[bool] = None
+    best_sellers_rank: Optional[int] = None
+    bullet_points: Optional[list[str]] = None
+    main_image_url: Optional[str] = None
+    category_id: Optional[int] = None
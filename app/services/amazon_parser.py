@@ -1,40 +1,82 @@
+import asyncio
 import re
-from typing import Any
-from urllib.parse import urlparse
+import time
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 from playwright.async_api import async_playwright, Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator
-from playwright.async_api import async_playwright, BrowserContext
+from typing import Any, AsyncGenerator, Awaitable, Callable
+from playwright.async_api import BrowserContext
 
 from app.utils.anti_block import (
     get_random_user_agent,
+    is_us_location,
     random_delay,
-    retry_on_exception,
+    retry_classified,
     set_us_location,
 )
 from app.config import settings
+from app.services.browser_pool import browser_pool
+from app.services.html_extractor import (
+    extract_bestseller_items,
+    extract_category_links,
+    extract_product_fields,
+    extract_product_links,
+    run_in_pool,
+)
+from app.services.html_archive import archive_page
+from app.services.proxy_pool import proxy_identity, proxy_pool
+from app.utils.errors import BlockedError, ParseMissError
+from app.utils.fixtures import apply_fixture_mode
 from app.utils.logger import setup_logger
+from app.utils.metrics import (
+    PAGES_FETCHED,
+    SOFT_BLOCKS,
+    observe,
+    record_selector_misses,
+    span,
+)
+from app.utils.rate_limiter import rate_limiter
+from app.utils.resource_blocking import apply_blocking_profile, resource_blocking_stats
 from app.utils.selectors import AmazonSelectors
+from app.utils.storage_state import (
+    invalidate_storage_state,
+    load_storage_state,
+    save_storage_state,
+    storage_state_key,
+)
 
 logger = setup_logger(__name__)
 
+ProgressCallback = Callable[[dict[str, Any]], Awaitable[None]]
+
+# Process-wide cap on product pages being parsed at the same time
+_global_product_limit = asyncio.Semaphore(settings.PRODUCT_CONCURRENCY_GLOBAL)
+
 
 # ==================== UTILITY FUNCTIONS ====================
+# Per-context scraping metadata (storage_state cache key, ...), keyed by context
+_context_meta: dict[BrowserContext, dict[str, Any]] = {}
+
+
+def get_context_meta(context: BrowserContext) -> dict[str, Any]:
+    return _context_meta.get(context, {})
+
+
 @asynccontextmanager
-async def get_browser_context() -> AsyncGenerator[BrowserContext, None]:
-    async with async_playwright() as p:
-        browser_kwargs: dict[str, Any] = {"headless": settings.BROWSER_HEADLESS}
-        proxy_config = get_proxy_config()
-        if proxy_config:
-            browser_kwargs["proxy"] = proxy_config
+async def _open_context(**context_kwargs: Any) -> AsyncGenerator[BrowserContext, None]:
+    """Open a context from the shared pool, or a one-off browser outside the API."""
+    if browser_pool.started:
+        async with browser_pool.context(**context_kwargs) as context:
+            yield context
+        return
 
-        browser = await p.chromium.launch(**browser_kwargs)
+    async with async_playwright() as p:
+        with span("browser_launch"):
+            browser = await p.chromium.launch(headless=settings.BROWSER_HEADLESS)
 
         try:
-            context = await browser.new_context(
-                user_agent=get_random_user_agent(),
-                viewport={"width": 1920, "height": 1080},
-            )
+            context = await browser.new_context(**context_kwargs)
             yield context
         finally:
             if "context" in locals():
@@ -42,19 +84,58 @@ async def get_browser_context() -> AsyncGenerator[BrowserContext, None]:
             await browser.close()
 
 
-def get_proxy_config() -> dict | None:
-    """Parse proxy URL from settings into Playwright-compatible format."""
-    if not settings.PROXY_URL:
-        return None
-
-    parsed = urlparse(settings.PROXY_URL)
-    if parsed.username and parsed.password:
-        return {
-            "server": f"{parsed.scheme}://{parsed.hostname}:{parsed.port}",
-            "username": parsed.username,
-            "password": parsed.password,
-        }
-    return {"server": settings.PROXY_URL}
+@asynccontextmanager
+async def get_browser_context(
+    use_storage_state: bool = True,
+    resource_profile: str | None = None,
+    session_key: str | None = None,
+) -> AsyncGenerator[BrowserContext, None]:
+    """
+    Yield an isolated browser context.
+    Uses the shared browser pool when it is running (API process lifespan),
+    otherwise launches a one-off browser for standalone scripts.
+    With `use_storage_state`, cookies cached for this proxy and user agent
+    (US delivery location already set) are preloaded into the context.
+    `resource_profile` selects which requests are aborted
+    (defaults to settings.RESOURCE_BLOCKING_PROFILE).
+    Contexts sharing a `session_key` get the same proxy from the pool.
+    In FIXTURE_MODE=replay no proxy is used and Amazon is served locally.
+    """
+    user_agent = get_random_user_agent()
+    context_kwargs: dict[str, Any] = {
+        "user_agent": user_agent,
+        "viewport": {"width": 1920, "height": 1080},
+    }
+    replay = settings.FIXTURE_MODE == "replay"
+    proxy_config = None if replay else proxy_pool.select(session_key)
+    if proxy_config:
+        context_kwargs["proxy"] = proxy_config
+
+    # Proxy identity (server plus username): keys health, rate limits and cookies
+    proxy = proxy_identity(proxy_config) if proxy_config else None
+    meta: dict[str, Any] = {
+        "proxy": proxy,
+        # Replayed sessions must not overwrite cookies cached for live Amazon
+        "state_key": storage_state_key("replay" if replay else proxy, user_agent),
+        "state_loaded": False,
+    }
+    if use_storage_state:
+        cached_state = load_storage_state(meta["state_key"])
+        if cached_state:
+            context_kwargs["storage_state"] = cached_state
+            meta["state_loaded"] = True
+
+    async with _open_context(**context_kwargs) as context:
+        _context_meta[context] = meta
+        try:
+            context.on("response", resource_blocking_stats.record_response)
+            await apply_fixture_mode(context)
+            await apply_blocking_profile(
+                context, resource_profile or settings.RESOURCE_BLOCKING_PROFILE
+            )
+            yield context
+        finally:
+            _context_meta.pop(context, None)
 
 
 def parse_price(price_str: str | None) -> float | None:
@@ -103,6 +184,33 @@ def parse_discount(discount_str: str | None) -> int | None:
     return int(match.group(1)) if match else None
 
 
+def parse_rating(rating_str: str | None) -> float | None:
+    """Extract rating from string like '4.5 out of 5 stars'."""
+    if not rating_str:
+        return None
+
+    match = re.search(r"([\d.]+)", rating_str)
+    return float(match.group(1)) if match else None
+
+
+def parse_reviews_count(reviews_str: str | None) -> int | None:
+    """Extract review count from string like '12,345 ratings'."""
+    if not reviews_str:
+        return None
+
+    clean_reviews = re.sub(r"[^\d]", "", reviews_str)
+    return int(clean_reviews) if clean_reviews else None
+
+
+def parse_best_sellers_rank(rank_str: str | None) -> int | None:
+    """Extract the main rank from text like 'Best Sellers Rank: #1,234 in Books (See Top 100...)'."""
+    if not rank_str:
+        return None
+
+    match = re.search(r"#\s*([\d,]+)", rank_str)
+    return int(match.group(1).replace(",", "")) if match else None
+
+
 # ==================== PAGE HELPERS ====================
 
 
@@ -137,6 +245,109 @@ async def bypass_soft_block(page: Page) -> bool:
         return False
 
 
+def rate_limit_key(page: Page, url: str) -> tuple[str, str]:
+    proxy = get_context_meta(page.context).get("proxy") or "direct"
+    return proxy, urlparse(url).hostname or ""
+
+
+async def is_captcha_page(page: Page) -> bool:
+    return await page.evaluate(
+        "(selector) => document.querySelector(selector) !== null",
+        AmazonSelectors.CAPTCHA,
+    )
+
+
+async def navigate(page: Page, url: str, timeout: int = 60000) -> None:
+    """
+    Rate-limited page.goto with soft-block handling.
+    Feeds the outcome back to the adaptive limiter for this proxy and host
+    and to the proxy's health score, and raises BlockedError if a CAPTCHA
+    is served.
+    """
+    key = rate_limit_key(page, url)
+    proxy = get_context_meta(page.context).get("proxy")
+    # Replayed pages come from a local server, there is no one to protect
+    if settings.FIXTURE_MODE != "replay":
+        with span("rate_limit_wait"):
+            await rate_limiter.acquire(key)
+
+    started = time.monotonic()
+    try:
+        await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+    except Exception:
+        PAGES_FETCHED.labels("error").inc()
+        proxy_pool.report(proxy, failed=True)
+        raise
+    latency = time.monotonic() - started
+    observe("goto", latency)
+
+    with span("soft_block_check"):
+        soft_block = await bypass_soft_block(page)
+        captcha = await is_captcha_page(page)
+    if soft_block:
+        SOFT_BLOCKS.inc()
+        rate_limiter.on_throttle(key, "soft_block")
+
+    proxy_pool.report(proxy, latency=latency, soft_block=soft_block, captcha=captcha)
+    if captcha:
+        PAGES_FETCHED.labels("captcha").inc()
+        rate_limiter.on_throttle(key, "captcha")
+        raise BlockedError(f"CAPTCHA served for {url}")
+
+    PAGES_FETCHED.labels("ok").inc()
+    rate_limiter.on_success(key)
+
+
+async def ensure_us_location(context: BrowserContext) -> None:
+    """
+    Make sure the context delivers to the US.
+    Skipped when cached storage_state was loaded; otherwise runs
+    set_us_location once and caches the resulting cookies.
+    """
+    meta = get_context_meta(context)
+    if meta.get("state_loaded"):
+        logger.debug("Reusing cached US location storage state")
+        return
+
+    init_page = await context.new_page()
+    try:
+        # The location popover may need full rendering
+        await apply_blocking_profile(init_page, settings.LOCATION_RESOURCE_PROFILE)
+        await inject_stealth(init_page)
+        await navigate(init_page, "https://www.amazon.com")
+        await set_us_location(init_page)
+
+        location = await read_delivery_location(init_page)
+        if "state_key" in meta and is_us_location(location):
+            save_storage_state(meta["state_key"], await context.storage_state())
+            meta["state_loaded"] = True
+    finally:
+        await init_page.close()
+
+
+async def read_delivery_location(page: Page) -> str | None:
+    return await page.evaluate(
+        "(selector) => document.querySelector(selector)?.innerText ?? null",
+        AmazonSelectors.DELIVERY_LOCATION,
+    )
+
+
+async def revalidate_us_location(page: Page) -> None:
+    """Re-set the location if the page shows the wrong delivery address."""
+    location = await read_delivery_location(page)
+    if location is None or is_us_location(location):
+        return
+
+    logger.warning(f"Wrong delivery location '{location.strip()}', resetting to US")
+    meta = get_context_meta(page.context)
+    if "state_key" in meta:
+        invalidate_storage_state(meta["state_key"])
+
+    await set_us_location(page)
+    if "state_key" in meta and is_us_location(await read_delivery_location(page)):
+        save_storage_state(meta["state_key"], await page.context.storage_state())
+
+
 async def safe_extract_text(page: Page, selectors: list[str] | str) -> str | None:
     """
     Try multiple selectors until one returns non-empty text.
@@ -161,85 +372,310 @@ async def safe_extract_text(page: Page, selectors: list[str] | str) -> str | Non
 # ==================== MAIN SCRAPING FUNCTIONS ====================
 
 
-@retry_on_exception(retries=3)
-async def get_top_5_product_url(category_url: str) -> list[str]:
+# Amazon shows 50 best sellers per page, two pages per category
+BESTSELLER_PAGE_SIZE = 50
+BESTSELLER_MAX_TOP_N = 100
+
+# Reads rank badge, product link and the listing fields shown on the grid
+# for every list entry in one round trip
+BESTSELLER_ITEMS_JS = """
+(items, selectors) => items.map((item) => {
+    const textOf = (el) => el ? (el.textContent || '').trim() : null;
+    const firstText = (list) => {
+        for (const selector of list) {
+            const text = textOf(item.querySelector(selector));
+            if (text) return text;
+        }
+        return null;
+    };
+    const link = item.querySelector(selectors.link);
+    const asinHolder = item.matches(selectors.asin) ? item : item.querySelector(selectors.asin);
+    const image = item.querySelector(selectors.image);
+    return {
+        rank: textOf(item.querySelector(selectors.rank)),
+        href: link ? link.getAttribute('href') : null,
+        listing: {
+            asin: asinHolder ? asinHolder.getAttribute('data-asin') : null,
+            title: firstText(selectors.title) || (image ? image.getAttribute('alt') : null),
+            price: firstText(selectors.price),
+            rating: firstText(selectors.rating),
+            reviews_count: firstText(selectors.reviews),
+            main_image_url: image ? image.getAttribute('src') : null,
+        },
+    };
+})
+"""
+
+
+def normalize_product_url(href: str) -> str:
+    """Absolute product URL without query string and ref= tracking suffix."""
+    full_url = f"https://www.amazon.com{href}" if href.startswith("/") else href
+    return full_url.split("?")[0].split("ref=")[0]
+
+
+def bestseller_page_url(category_url: str, page_number: int) -> str:
+    """URL of the n-th best-seller page (`pg` query parameter)."""
+    if page_number == 1:
+        return category_url
+    parsed = urlparse(category_url)
+    query = dict(parse_qsl(parsed.query))
+    query["pg"] = str(page_number)
+    return urlunparse(parsed._replace(query=urlencode(query)))
+
+
+def parse_rank_badge(text: str | None) -> int | None:
+    """Parse a rank badge like '#12' into 12."""
+    if not text:
+        return None
+    match = re.search(r"\d+", text.replace(",", ""))
+    return int(match.group()) if match else None
+
+
+async def scroll_until_loaded(page: Page, wanted: int) -> int:
     """
-    Extract top 5 product URLs from Amazon category page.
-    Returns list of clean product URLs without query parameters.
+    Scroll to the bottom until at least `wanted` list entries are rendered
+    or no more show up. Returns the number of entries in the DOM.
     """
-    urls: list[str] = []
-    logger.info(f"Scraping category: {category_url}")
+    items = page.locator(AmazonSelectors.BESTSELLER_ITEM)
+    count = await items.count()
 
-    async with get_browser_context() as context:
-        page = await context.new_page()
-        await inject_stealth(page)
+    for _ in range(settings.BESTSELLER_MAX_SCROLLS):
+        if count >= wanted:
+            break
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        try:
+            await page.wait_for_function(
+                "([selector, count]) => document.querySelectorAll(selector).length > count",
+                arg=[AmazonSelectors.BESTSELLER_ITEM, count],
+                timeout=3000,
+            )
+        except PlaywrightTimeoutError:
+            break
+        count = await items.count()
 
-        await page.goto(category_url, wait_until="domcontentloaded", timeout=60000)
-        await random_delay(2, 4)
-        await bypass_soft_block(page)
+    return count
 
-        # Find all product links
-        link_elements = await page.query_selector_all("a[href*='/dp/']")
 
-        for elem in link_elements:
-            href = await elem.get_attribute("href")
-            if href and "/dp/" in href:
-                # Normalize URL
-                full_url = (
-                    f"https://www.amazon.com{href}" if href.startswith("/") else href
-                )
-                clean_url = full_url.split("?")[0].split("ref=")[0]
+async def extract_bestseller_entries(
+    page: Page, rank_offset: int, category_url: str | None = None
+) -> list[dict]:
+    """
+    Extract {"rank", "url", "listing"} for every list entry on a loaded
+    best-seller page, where "listing" holds the raw grid fields.
+    Ranks come from the on-page badge; position is only a fallback for
+    entries without one, or for layouts without list entries at all.
+    The page is archived for `category_url` when the HTML archive is on.
+    """
+    selectors = {
+        "rank": AmazonSelectors.BESTSELLER_RANK,
+        "link": AmazonSelectors.BESTSELLER_LINK,
+        "asin": AmazonSelectors.BESTSELLER_ASIN,
+        "title": AmazonSelectors.BESTSELLER_TITLE,
+        "price": AmazonSelectors.BESTSELLER_PRICE,
+        "rating": AmazonSelectors.BESTSELLER_RATING,
+        "reviews": AmazonSelectors.BESTSELLER_REVIEWS,
+        "image": AmazonSelectors.BESTSELLER_IMAGE,
+    }
+    html = await page_html(page)
+    if html is not None:
+        await archive_page(
+            html, page.url, "category", category_url=category_url, rank=rank_offset + 1
+        )
+    with span("extract_listing"):
+        if settings.EXTRACTION_MODE == "html":
+            raw_items = await run_in_pool(extract_bestseller_items, html)
+        else:
+            raw_items = await page.locator(AmazonSelectors.BESTSELLER_ITEM).evaluate_all(
+                BESTSELLER_ITEMS_JS, selectors
+            )
+    for item in raw_items:
+        record_selector_misses("listing", item.get("listing") or {})
+
+    if not raw_items:
+        logger.warning(f"No best-seller entries on {page.url}, falling back to product links")
+        if settings.EXTRACTION_MODE == "html":
+            hrefs = await run_in_pool(extract_product_links, html)
+        else:
+            hrefs = await page.locator(AmazonSelectors.BESTSELLER_LINK).evaluate_all(
+                "(links) => links.map((link) => link.getAttribute('href'))"
+            )
+        raw_items = [{"rank": None, "href": href, "listing": {}} for href in hrefs]
 
-                if clean_url not in urls:
-                    urls.append(clean_url)
+    return build_bestseller_entries(raw_items, rank_offset)
 
-            if len(urls) >= 5:
-                break
 
-    logger.info(f"Extracted {len(urls)} product URLs")
-    return urls
+def build_bestseller_entries(raw_items: list[dict], rank_offset: int = 0) -> list[dict]:
+    """Normalize raw list entries into {"rank", "url", "listing"}, deduplicated by URL."""
+    entries: list[dict] = []
+    seen: set[str] = set()
+    for item in raw_items:
+        href = item.get("href")
+        if not href or "/dp/" not in href:
+            continue
+        url = normalize_product_url(href)
+        if url in seen:
+            continue
+        seen.add(url)
+
+        rank = parse_rank_badge(item.get("rank"))
+        if rank is None:
+            rank = rank_offset + len(entries) + 1
+        entries.append({"rank": rank, "url": url, "listing": item.get("listing") or {}})
+
+    return entries
 
 
-async def parse_product_page(page: Page, url: str, rank: int) -> dict | None:
+async def get_top_product_urls(category_url: str, top_n: int | None = None) -> list[dict]:
     """
-    Parse detailed product information from Amazon product page.
-    Returns dict with product data or None if parsing fails.
+    Extract the top N best sellers of an Amazon category page.
+    Returns [{"rank", "url", "listing"}] sorted by rank, with clean product
+    URLs and the raw listing fields read from the grid.
+    Lazily loaded entries are scrolled into view and page 2 is followed
+    when top_n is above one page. Failed loads are retried on the same
+    page inside one live context.
     """
-    logger.info(f"Parsing product page: {url} (Rank #{rank})")
+    top_n = max(1, min(top_n or settings.TOP_N_PRODUCTS, BESTSELLER_MAX_TOP_N))
+    logger.info(f"Scraping top {top_n} of category: {category_url}")
 
-    # Extract ASIN from URL
-    asin = None
-    if "/dp/" in url:
-        asin = url.split("/dp/")[1].split("/")[0].split("?")[0]
+    entries: dict[str, dict] = {}
+    async with get_browser_context(session_key=category_url) as context:
+        page = await context.new_page()
+        await inject_stealth(page)
 
-    try:
-        await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-        await random_delay(1.5, 3)
-        await bypass_soft_block(page)
-    except Exception as e:
-        logger.error(f"Error loading page {url} (ASIN: {asin}): {e}")
-        raise
+        for page_number in range(1, BESTSELLER_MAX_TOP_N // BESTSELLER_PAGE_SIZE + 1):
+            rank_offset = (page_number - 1) * BESTSELLER_PAGE_SIZE
+            if rank_offset >= top_n:
+                break
+            page_url = bestseller_page_url(category_url, page_number)
+            wanted = min(top_n - rank_offset, BESTSELLER_PAGE_SIZE)
+
+            async def load_and_extract() -> list[dict]:
+                await navigate(page, page_url)
+                with span("listing_scroll"):
+                    await scroll_until_loaded(page, wanted)
+                found = await extract_bestseller_entries(page, rank_offset, category_url)
+                if not found:
+                    raise ParseMissError(f"No product links on {page_url}")
+                return found
 
-    # Extract title (required field)
-    title = await safe_extract_text(page, AmazonSelectors.TITLE)
-    if not title:
-        logger.warning(f"Title not found for ASIN {asin} at {url}")
-        return None
+            try:
+                found = await retry_classified(load_and_extract, f"Category {page_url}")
+            except ParseMissError:
+                if page_number == 1:
+                    raise
+                # Categories with fewer than 50 entries have no second page
+                logger.info(f"No best sellers on page {page_number} of {category_url}")
+                break
 
-    # Extract price information
-    price_str = await safe_extract_text(page, AmazonSelectors.PRICE)
-    price = parse_price(price_str)
-    currency = parse_currency(price_str)
+            for entry in found:
+                entries.setdefault(entry["url"], entry)
+            if len(found) < wanted:
+                break
 
-    list_price_str = await safe_extract_text(page, AmazonSelectors.LIST_PRICE)
-    list_price = parse_price(list_price_str)
+    top = sorted(entries.values(), key=lambda entry: entry["rank"])[:top_n]
+    logger.info(f"Extracted {len(top)} product URLs")
+    return top
+
+
+# Runs the whole AmazonSelectors table in one page.evaluate round trip.
+# Mirrors safe_extract_text semantics: first element per selector, first
+# non-empty text wins. Playwright's :has-text() is emulated since it is not CSS.
+BULK_EXTRACT_JS = """
+(selectors) => {
+    const HAS_TEXT = /^(.*?):has-text\\((['"])(.*?)\\2\\)(.*)$/;
+    const MARKER = 'data-amz-has-text';
+
+    const queryAll = (root, selector) => {
+        try {
+            const match = selector.match(HAS_TEXT);
+            if (!match) return Array.from(root.querySelectorAll(selector));
+
+            const [, base, , text, rest] = match;
+            const needle = text.toLowerCase();
+            const matched = Array.from(root.querySelectorAll(base || '*'))
+                .filter(el => (el.textContent || '').toLowerCase().includes(needle));
+            if (!rest.trim()) return matched;
+
+            matched.forEach(el => el.setAttribute(MARKER, ''));
+            try {
+                return Array.from(root.querySelectorAll(`[${MARKER}]${rest}`));
+            } finally {
+                matched.forEach(el => el.removeAttribute(MARKER));
+            }
+        } catch (e) {
+            return [];
+        }
+    };
+    const first = (root, selector) => queryAll(root, selector)[0] || null;
+    const textOf = (el) => el ? (el.innerText || '').trim() : '';
+    const firstText = (list) => {
+        for (const selector of list) {
+            const text = textOf(first(document, selector));
+            if (text) return text;
+        }
+        return null;
+    };
+
+    const priceBlock = first(document, selectors.PRICE_CONTAINERS);
+    const discountElem = priceBlock ? first(priceBlock, selectors.DISCOUNT_PERCENTAGE) : null;
+
+    let mainImageUrl = null;
+    for (const selector of selectors.MAIN_IMAGE) {
+        const img = first(document, selector);
+        if (img) {
+            mainImageUrl = img.getAttribute('src');
+            break;
+        }
+    }
+
+    return {
+        title: firstText(selectors.TITLE),
+        price: firstText(selectors.PRICE),
+        list_price: firstText(selectors.LIST_PRICE),
+        discount: discountElem ? textOf(discountElem) : null,
+        rating: firstText(selectors.RATING),
+        reviews_count: firstText(selectors.REVIEWS_COUNT),
+        is_prime: selectors.PRIME_LOGO.some(selector => first(document, selector) !== null),
+        best_sellers_rank: firstText(selectors.BEST_SELLERS_RANK),
+        bullet_points: queryAll(document, selectors.BULLET_POINTS[0]).map(textOf).filter(Boolean),
+        main_image_url: mainImageUrl,
+    };
+}
+"""
+
+
+def get_selector_table() -> dict[str, Any]:
+    """Serializable snapshot of AmazonSelectors for in-page extraction."""
+    return {
+        name: getattr(AmazonSelectors, name)
+        for name in dir(AmazonSelectors)
+        if name.isupper()
+    }
+
+
+async def extract_raw_fields_bulk(page: Page) -> dict[str, Any]:
+    """Extract all raw product fields in a single CDP round trip."""
+    return await page.evaluate(BULK_EXTRACT_JS, get_selector_table())
+
+
+async def page_html(page: Page) -> str | None:
+    """
+    Rendered HTML when extraction or the archive needs it, else None
+    (page.content() serializes the whole DOM, so it is skipped otherwise).
+    """
+    if settings.EXTRACTION_MODE == "html" or settings.HTML_ARCHIVE_ENABLED:
+        return await page.content()
+    return None
+
+
+async def extract_raw_fields_html(page: Page, html: str | None = None) -> dict[str, Any]:
+    """Fetch the rendered HTML once and extract raw fields off the event loop."""
+    return await run_in_pool(extract_product_fields, html or await page.content())
 
-    # Validate list price is actually higher than current price
-    if list_price and price and list_price <= price:
-        list_price = None
 
-    # Extract discount percentage
-    discount_percentage = None
+async def extract_raw_fields_handles(page: Page) -> dict[str, Any]:
+    """Extract raw product fields with one element-handle call per selector."""
+    discount_str = None
     main_price_block = await page.query_selector(AmazonSelectors.PRICE_CONTAINERS)
     if main_price_block:
         discount_elem = await main_price_block.query_selector(
@@ -247,45 +683,20 @@ async def parse_product_page(page: Page, url: str, rank: int) -> dict | None:
         )
         if discount_elem:
             discount_str = (await discount_elem.inner_text()).strip()
-            discount_percentage = parse_discount(discount_str)
-
-    # Extract rating
-    rating = None
-    rating_str = await safe_extract_text(page, AmazonSelectors.RATING)
-    if rating_str:
-        match = re.search(r"([\d.]+)", rating_str)
-        if match:
-            rating = float(match.group(1))
-
-    # Extract review count
-    reviews_count = None
-    reviews_str = await safe_extract_text(page, AmazonSelectors.REVIEWS_COUNT)
-    if reviews_str:
-        clean_reviews = re.sub(r"[^\d]", "", reviews_str)
-        if clean_reviews:
-            reviews_count = int(clean_reviews)
-
-    # Check Prime eligibility
+
     is_prime = False
     for sel in AmazonSelectors.PRIME_LOGO:
         if await page.query_selector(sel):
             is_prime = True
             break
 
-    # Extract best sellers rank
-    best_sellers_rank = await safe_extract_text(page, AmazonSelectors.BEST_SELLERS_RANK)
-    if best_sellers_rank:
-        best_sellers_rank = " ".join(best_sellers_rank.split())
-
-    # Extract bullet points (product features)
     bullet_points: list[str] = []
     bullet_elements = await page.query_selector_all(AmazonSelectors.BULLET_POINTS[0])
     for elem in bullet_elements:
         text = (await elem.inner_text()).strip()
-        if text and len(bullet_points) < 5:
+        if text:
             bullet_points.append(text)
 
-    # Extract main product image
     main_image_url = None
     for sel in AmazonSelectors.MAIN_IMAGE:
         img_element = await page.query_selector(sel)
@@ -293,6 +704,58 @@ async def parse_product_page(page: Page, url: str, rank: int) -> dict | None:
             main_image_url = await img_element.get_attribute("src")
             break
 
+    return {
+        "title": await safe_extract_text(page, AmazonSelectors.TITLE),
+        "price": await safe_extract_text(page, AmazonSelectors.PRICE),
+        "list_price": await safe_extract_text(page, AmazonSelectors.LIST_PRICE),
+        "discount": discount_str,
+        "rating": await safe_extract_text(page, AmazonSelectors.RATING),
+        "reviews_count": await safe_extract_text(page, AmazonSelectors.REVIEWS_COUNT),
+        "is_prime": is_prime,
+        "best_sellers_rank": await safe_extract_text(
+            page, AmazonSelectors.BEST_SELLERS_RANK
+        ),
+        "bullet_points": bullet_points,
+        "main_image_url": main_image_url,
+    }
+
+
+def extract_asin(url: str) -> str | None:
+    if "/dp/" in url:
+        return url.split("/dp/")[1].split("/")[0].split("?")[0]
+    return None
+
+
+def build_product_data(raw: dict[str, Any], url: str, rank: int) -> dict | None:
+    """
+    Turn a raw-field dict into the product data dict.
+    Returns None if the required title is missing.
+    """
+    asin = extract_asin(url)
+
+    # Title is a required field
+    title = raw.get("title")
+    if not title:
+        logger.warning(f"Title not found for ASIN {asin} at {url}")
+        return None
+
+    # Price information
+    price_str = raw.get("price")
+    price = parse_price(price_str)
+    currency = parse_currency(price_str)
+    list_price = parse_price(raw.get("list_price"))
+
+    # Validate list price is actually higher than current price
+    if list_price and price and list_price <= price:
+        list_price = None
+
+    discount_percentage = parse_discount(raw.get("discount"))
+
+    rating = parse_rating(raw.get("rating"))
+    reviews_count = parse_reviews_count(raw.get("reviews_count"))
+
+    best_sellers_rank = parse_best_sellers_rank(raw.get("best_sellers_rank"))
+
     return {
         "asin": asin,
         "title": title,
@@ -303,55 +766,219 @@ async def parse_product_page(page: Page, url: str, rank: int) -> dict | None:
         "discount_percentage": discount_percentage,
         "rating": rating,
         "reviews_count": reviews_count,
-        "is_prime": is_prime,
+        "is_prime": bool(raw.get("is_prime")),
         "best_sellers_rank": best_sellers_rank,
-        "bullet_points": bullet_points,
-        "main_image_url": main_image_url,
+        "bullet_points": list(raw.get("bullet_points") or [])[:5],
+        "main_image_url": raw.get("main_image_url"),
     }
 
 
-async def parse_category_full(category_url: str) -> list[dict]:
+def parse_product_html(html: str, url: str, rank: int) -> dict | None:
+    """Browser-free parse_product_page over stored HTML."""
+    return build_product_data(extract_product_fields(html), url, rank)
+
+
+def build_listing_data(entry: dict[str, Any]) -> dict | None:
     """
-    Complete workflow: scrape category page, then parse all product pages.
-    Returns list of product data dictionaries.
+    Turn a best-seller list entry into a partial product data dict with the
+    fields shown on the grid. Returns None if the title is missing.
     """
-    # Step 1: Get product URLs from category
-    urls = await get_top_5_product_url(category_url)
-    parsed_products: list[dict[str, Any]] = []
+    raw = entry.get("listing") or {}
+    url = entry["url"]
+    asin = raw.get("asin") or extract_asin(url)
 
-    if not urls:
-        logger.warning("No product URLs found")
-        return parsed_products
+    title = raw.get("title")
+    if not asin or not title:
+        logger.warning(f"Incomplete listing entry #{entry['rank']} at {url}")
+        return None
 
-    logger.info(f"Starting to parse {len(urls)} products...")
+    price_str = raw.get("price")
+    data = {
+        "asin": asin,
+        "title": " ".join(title.split()),
+        "rank": entry["rank"],
+        "price": parse_price(price_str),
+        "currency": parse_currency(price_str),
+        "rating": parse_rating(raw.get("rating")),
+        "reviews_count": parse_reviews_count(raw.get("reviews_count")),
+        "main_image_url": raw.get("main_image_url"),
+        "url": url,
+    }
+    return data
 
-    # Step 2: Parse each product page
-    async with get_browser_context() as context:
-        # Initialize session with US location
-        init_page = await context.new_page()
-        await inject_stealth(init_page)
-        await init_page.goto("https://www.amazon.com", wait_until="domcontentloaded")
-        await set_us_location(init_page)
-        await init_page.close()
 
-        # Parse each product in separate page
-        for rank, url in enumerate(urls, start=1):
-            page = await context.new_page()
-            await inject_stealth(page)
+async def parse_product_page(
+    page: Page, url: str, rank: int, category_url: str | None = None
+) -> dict | None:
+    """
+    Parse detailed product information from Amazon product page.
+    Returns dict with product data or None if parsing fails.
+    """
+    logger.info(f"Parsing product page: {url} (Rank #{rank})")
+    asin = extract_asin(url)
 
-            try:
-                data = await parse_product_page(page, url, rank)
-                if data and data["asin"]:
-                    parsed_products.append(data)
-            except Exception as e:
-                logger.error(f"Failed to parse {url}: {e}")
-            finally:
-                await page.close()
+    async def load_and_extract() -> dict:
+        await navigate(page, url)
+        await revalidate_us_location(page)
+
+        html = await page_html(page)
+        if html is not None:
+            await archive_page(
+                html, url, "product", asin=asin, category_url=category_url, rank=rank
+            )
+
+        with span("extract_product"):
+            if settings.EXTRACTION_MODE == "handles":
+                raw = await extract_raw_fields_handles(page)
+            elif settings.EXTRACTION_MODE == "html":
+                raw = await extract_raw_fields_html(page, html)
+            else:
+                raw = await extract_raw_fields_bulk(page)
+        record_selector_misses("product", raw)
+
+        if not raw.get("title"):
+            raise ParseMissError(f"Title not found for ASIN {asin} at {url}")
+        return raw
+
+    try:
+        raw = await retry_classified(load_and_extract, f"Product {asin}")
+    except ParseMissError as e:
+        logger.warning(str(e))
+        return None
+    except Exception as e:
+        logger.error(f"Error loading page {url} (ASIN: {asin}): {e}")
+        raise
+
+    return build_product_data(raw, url, rank)
+
+
+async def parse_category_listing(
+    category_url: str,
+    progress: ProgressCallback | None = None,
+    top_n: int | None = None,
+) -> list[dict]:
+    """
+    Listing mode: build product data from the best-seller grid alone, without
+    opening any detail page. Rows carry asin, title, rank, price, currency,
+    rating, reviews_count, main_image_url and the product url.
+    """
+    entries = await get_top_product_urls(category_url, top_n)
+
+    if progress:
+        await progress({"type": "urls", "total": len(entries)})
+
+    products: list[dict] = []
+    for entry in entries:
+        data = build_listing_data(entry)
+        if progress:
+            await progress(
+                {
+                    "type": "product",
+                    "rank": entry["rank"],
+                    "url": entry["url"],
+                    "asin": data["asin"] if data else extract_asin(entry["url"]),
+                    "title": data["title"] if data else None,
+                    "ok": data is not None,
+                }
+            )
+        if data:
+            products.append(data)
+
+    logger.info(f"Built {len(products)} products from the listing of {category_url}")
+    return products
+
+
+async def parse_product_pages(
+    category_url: str,
+    entries: list[dict],
+    progress: ProgressCallback | None = None,
+) -> list[dict]:
+    """
+    Parse the detail page of every {"rank", "url"} entry concurrently,
+    in one context sharing the category's proxy.
+    Returns product data dictionaries sorted by rank.
+    """
+    logger.info(f"Starting to parse {len(entries)} products...")
+
+    async with get_browser_context(session_key=category_url) as context:
+        # Initialize session with US location (cached across scrapes)
+        with span("ensure_us_location"):
+            await ensure_us_location(context)
+
+        # Parse product pages concurrently, each in its own page
+        category_limit = asyncio.Semaphore(settings.PRODUCT_CONCURRENCY_PER_CATEGORY)
+
+        async def parse_one(rank: int, url: str) -> dict | None:
+            async with category_limit, _global_product_limit:
+                page: Page | None = None
+                data = None
+                try:
+                    page = await context.new_page()
+                    await inject_stealth(page)
+                    with span("product_page"):
+                        data = await parse_product_page(page, url, rank, category_url)
+                except Exception as e:
+                    logger.error(f"Failed to parse {url}: {e}")
+                finally:
+                    if page is not None:
+                        await page.close()
+
+            if progress:
+                await progress(
+                    {
+                        "type": "product",
+                        "rank": rank,
+                        "url": url,
+                        "asin": data["asin"] if data else extract_asin(url),
+                        "title": data["title"] if data else None,
+                        "ok": bool(data and data["asin"]),
+                    }
+                )
+            return data
+
+        results = await asyncio.gather(
+            *(parse_one(entry["rank"], entry["url"]) for entry in entries)
+        )
+
+    # gather preserves input order, so results are already sorted by rank
+    parsed_products = [data for data in results if data and data["asin"]]
 
     logger.info(f"Successfully parsed {len(parsed_products)} products")
     return parsed_products
 
 
+async def parse_category_full(
+    category_url: str,
+    progress: ProgressCallback | None = None,
+    top_n: int | None = None,
+    mode: str | None = None,
+) -> list[dict]:
+    """
+    Complete workflow: scrape category page, then parse all product pages.
+    Returns list of product data dictionaries for the top `top_n` best
+    sellers (defaults to settings.TOP_N_PRODUCTS).
+    With mode="listing" only the category grid is loaded (see
+    parse_category_listing); any other mode parses every detail page.
+    If given, `progress` is awaited with an event once the URL list is known
+    and again as each product finishes.
+    """
+    if (mode or settings.SCRAPE_MODE) == "listing":
+        return await parse_category_listing(category_url, progress, top_n)
+
+    # Step 1: Get ranked product URLs from category
+    entries = await get_top_product_urls(category_url, top_n)
+
+    if progress:
+        await progress({"type": "urls", "total": len(entries)})
+
+    if not entries:
+        logger.warning("No product URLs found")
+        return []
+
+    # Step 2: Parse each product page (same proxy as the category page)
+    return await parse_product_pages(category_url, entries, progress)
+
+
 async def parse_categories_page(page: Page, url: str) -> list[dict] | None:
     """
     Parse category links from an Amazon Best Sellers page or subcategory page.
@@ -359,30 +986,47 @@ async def parse_categories_page(page: Page, url: str) -> list[dict] | None:
     """
     logger.info(f"Parsing categories from page: {url}")
 
-    try:
-        await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+    sidebar_locator = page.locator(AmazonSelectors.CATEGORY_SIDEBAR).first
+
+    async def load_sidebar() -> None:
+        await navigate(page, url)
+        if await sidebar_locator.count() == 0:
+            rate_limiter.on_throttle(rate_limit_key(page, url), "missing_sidebar")
+            raise ParseMissError(
+                f"Sidebar not found on {url}. Possible CAPTCHA or layout change."
+            )
 
-        await random_delay(1.5, 3)
-        await bypass_soft_block(page)
+    try:
+        await retry_classified(load_sidebar, f"Category page {url}")
+    except ParseMissError as e:
+        logger.warning(str(e))
+        return None
     except Exception as e:
         logger.error(f"Error loading category page {url}: {e}")
         return None
 
-    sidebar_selector = '#zg_left_col1, #zg_left_col2, #zg-left-col'
-    sidebar_locator = page.locator(sidebar_selector).first
-    
-    if await sidebar_locator.count() == 0:
-        logger.warning(f"Sidebar not found on {url}. Possible CAPTCHA or layout change.")
-        return None
+    html = await page_html(page)
+    if html is not None:
+        await archive_page(html, url, "category", category_url=url, rank=1)
+    with span("extract_categories"):
+        if settings.EXTRACTION_MODE == "html":
+            links_data = await run_in_pool(extract_category_links, html) or []
+        else:
+            links_data = await sidebar_locator.locator("a").evaluate_all("""
+                (elements) => elements.map(el => ({
+                    name: el.innerText.trim(),
+                    href: el.getAttribute('href')
+                }))
+            """)
+
+    unique_categories = build_category_links(links_data)
+    logger.info(f"Successfully extracted {len(unique_categories)} categories from {url}")
+    return unique_categories
 
-    categories_data = []
 
-    links_data = await sidebar_locator.locator("a").evaluate_all("""
-        (elements) => elements.map(el => ({
-            name: el.innerText.trim(),
-            href: el.getAttribute('href')
-        }))
-    """)
+def build_category_links(links_data: list[dict]) -> list[dict]:
+    """Turn raw sidebar {name, href} links into unique {name, url} category dicts."""
+    categories_data = []
 
     for item in links_data:
         href = item.get("href")
@@ -405,7 +1049,12 @@ async def parse_categories_page(page: Page, url: str) -> list[dict] | None:
                 "url": full_url
             })
 
-    unique_categories = list({v['url']: v for v in categories_data}.values())
-    
-    logger.info(f"Successfully extracted {len(unique_categories)} categories from {url}")
-    return unique_categories
+    return list({v['url']: v for v in categories_data}.values())
+
+
+def parse_categories_html(html: str) -> list[dict] | None:
+    """Browser-free parse_categories_page over stored HTML."""
+    links_data = extract_category_links(html)
+    if links_data is None:
+        return None
+    return build_category_links(links_data)
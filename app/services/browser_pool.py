@@ -0,0 +1,189 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator
+
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
+
+from app.config import settings
+from app.utils.logger import setup_logger
+from app.utils.metrics import observe, span
+
+logger = setup_logger(__name__)
+
+
+class PooledBrowser:
+    """A warm Chromium instance tracked by the pool."""
+
+    def __init__(self, slot: int, browser: Browser):
+        self.slot = slot
+        self.browser = browser
+        self.active_contexts = 0
+        self.pages_served = 0
+        self.started_at = time.monotonic()
+
+    @property
+    def exhausted(self) -> bool:
+        return self.pages_served >= settings.BROWSER_MAX_PAGES_PER_BROWSER
+
+
+class BrowserPool:
+    """
+    Long-lived pool of Chromium browsers shared by all scraping call sites.
+    Hands out isolated contexts and recycles a browser once it has served
+    BROWSER_MAX_PAGES_PER_BROWSER pages, to keep Chromium memory bounded.
+    """
+
+    def __init__(self) -> None:
+        self._playwright: Playwright | None = None
+        self._browsers: list[PooledBrowser | None] = []
+        self._slots: asyncio.Semaphore | None = None
+        self._lock = asyncio.Lock()
+        self._stats: dict[str, float] = {
+            "contexts_served": 0,
+            "browsers_launched": 0,
+            "browsers_recycled": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+        }
+
+    @property
+    def started(self) -> bool:
+        return self._playwright is not None
+
+    async def start(self) -> None:
+        if self.started:
+            return
+
+        self._playwright = await async_playwright().start()
+        self._browsers = [None] * settings.BROWSER_POOL_SIZE
+        self._slots = asyncio.Semaphore(
+            settings.BROWSER_POOL_SIZE * settings.BROWSER_CONTEXTS_PER_BROWSER
+        )
+
+        for slot in range(settings.BROWSER_POOL_SIZE):
+            self._browsers[slot] = await self._launch(slot)
+
+        logger.info(f"Browser pool started with {settings.BROWSER_POOL_SIZE} browsers")
+
+    async def stop(self) -> None:
+        if not self.started:
+            return
+
+        for pooled in self._browsers:
+            if pooled:
+                await self._close_browser(pooled)
+        self._browsers = []
+
+        assert self._playwright is not None
+        await self._playwright.stop()
+        self._playwright = None
+        logger.info("Browser pool stopped")
+
+    async def _launch(self, slot: int) -> PooledBrowser:
+        assert self._playwright is not None
+        browser_kwargs: dict[str, Any] = {"headless": settings.BROWSER_HEADLESS}
+
+        with span("browser_launch"):
+            browser = await self._playwright.chromium.launch(**browser_kwargs)
+        self._stats["browsers_launched"] += 1
+        logger.info(f"Launched browser in pool slot {slot}")
+        return PooledBrowser(slot, browser)
+
+    async def _close_browser(self, pooled: PooledBrowser) -> None:
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.warning(f"Error closing browser in slot {pooled.slot}: {e}")
+
+    async def _checkout(self) -> PooledBrowser:
+        """Pick the least busy browser, relaunching exhausted or dead ones."""
+        async with self._lock:
+            for slot, pooled in enumerate(self._browsers):
+                if pooled is None or not pooled.browser.is_connected():
+                    self._browsers[slot] = await self._launch(slot)
+                elif pooled.exhausted and pooled.active_contexts == 0:
+                    logger.info(
+                        f"Recycling browser in slot {slot} after "
+                        f"{pooled.pages_served} pages"
+                    )
+                    await self._close_browser(pooled)
+                    self._browsers[slot] = await self._launch(slot)
+                    self._stats["browsers_recycled"] += 1
+
+            candidates = [b for b in self._browsers if b and not b.exhausted]
+            if not candidates:
+                # Every browser is draining; fall back to the least loaded one
+                candidates = [b for b in self._browsers if b]
+
+            pooled = min(candidates, key=lambda b: b.active_contexts)
+            pooled.active_contexts += 1
+            return pooled
+
+    def _on_page(self, pooled: PooledBrowser) -> None:
+        pooled.pages_served += 1
+
+    @asynccontextmanager
+    async def context(self, **context_kwargs: Any) -> AsyncGenerator[BrowserContext, None]:
+        if not self.started or self._slots is None:
+            raise RuntimeError("Browser pool is not started")
+
+        wait_started = time.monotonic()
+        await self._slots.acquire()
+        waited = time.monotonic() - wait_started
+        observe("context_wait", waited)
+        self._stats["wait_time_total"] += waited
+        self._stats["wait_time_max"] = max(self._stats["wait_time_max"], waited)
+
+        pooled: PooledBrowser | None = None
+        context: BrowserContext | None = None
+        try:
+            pooled = checked_out = await self._checkout()
+            context = await pooled.browser.new_context(**context_kwargs)
+
+            def on_page(_page: Page) -> None:
+                self._on_page(checked_out)
+
+            context.on("page", on_page)
+            self._stats["contexts_served"] += 1
+            yield context
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.debug(f"Error closing pooled context: {e}")
+            if pooled is not None:
+                pooled.active_contexts -= 1
+            self._slots.release()
+
+    def stats(self) -> dict[str, Any]:
+        contexts_served = int(self._stats["contexts_served"])
+        return {
+            "started": self.started,
+            "pool_size": settings.BROWSER_POOL_SIZE,
+            "contexts_per_browser": settings.BROWSER_CONTEXTS_PER_BROWSER,
+            "max_pages_per_browser": settings.BROWSER_MAX_PAGES_PER_BROWSER,
+            "browsers": [
+                {
+                    "slot": b.slot,
+                    "active_contexts": b.active_contexts,
+                    "pages_served": b.pages_served,
+                    "uptime_seconds": round(time.monotonic() - b.started_at, 1),
+                }
+                for b in self._browsers
+                if b
+            ],
+            "contexts_served": contexts_served,
+            "browsers_launched": int(self._stats["browsers_launched"]),
+            "browsers_recycled": int(self._stats["browsers_recycled"]),
+            "wait_time_avg_seconds": round(
+                self._stats["wait_time_total"] / contexts_served, 4
+            )
+            if contexts_served
+            else 0.0,
+            "wait_time_max_seconds": round(self._stats["wait_time_max"], 4),
+        }
+
+
+browser_pool = BrowserPool()
@@ -0,0 +1,231 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import delete, func, select, update
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.db.upsert import dialect_insert
+from app.models import Category, CrawlFrontierEntry
+from app.services.amazon_parser import get_browser_context, inject_stealth, parse_categories_page
+from app.services.category_service import normalize_category_url, upsert_categories
+from app.services.lease_service import (
+    LeaseLostError,
+    acquire_lease,
+    release_lease,
+    run_holding_lease,
+)
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+BESTSELLERS_URL = "https://www.amazon.com/gp/bestsellers"
+CRAWL_LEASE_KEY = "crawl:category-tree"
+
+FRONTIER_PENDING = "pending"
+FRONTIER_IN_PROGRESS = "in_progress"
+FRONTIER_DONE = "done"
+FRONTIER_FAILED = "failed"
+MAX_NODE_ATTEMPTS = 3
+
+
+async def _seed_frontier(root_url: str, reset: bool) -> None:
+    """Start a new crawl, or resume the persisted one after a crash."""
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as db:
+        if reset:
+            await db.execute(delete(CrawlFrontierEntry))
+
+        # We hold the crawl lease, so anything in progress was orphaned by a crash
+        await db.execute(
+            update(CrawlFrontierEntry)
+            .where(CrawlFrontierEntry.status == FRONTIER_IN_PROGRESS)
+            .values(status=FRONTIER_PENDING, updated_at=now)
+        )
+
+        insert = dialect_insert(db)
+        await db.execute(
+            insert(CrawlFrontierEntry)
+            .values(url=root_url, depth=0, status=FRONTIER_PENDING, attempts=0, updated_at=now)
+            .on_conflict_do_nothing(index_elements=[CrawlFrontierEntry.url])
+        )
+        await db.commit()
+
+
+async def _claim_batch(limit: int) -> list[CrawlFrontierEntry]:
+    """Take the shallowest pending nodes first, so the crawl stays breadth-first."""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(CrawlFrontierEntry)
+            .where(CrawlFrontierEntry.status == FRONTIER_PENDING)
+            .order_by(CrawlFrontierEntry.depth, CrawlFrontierEntry.url)
+            .limit(limit)
+        )
+        batch = list(result.scalars().all())
+        if batch:
+            await db.execute(
+                update(CrawlFrontierEntry)
+                .where(CrawlFrontierEntry.url.in_([entry.url for entry in batch]))
+                .values(status=FRONTIER_IN_PROGRESS, updated_at=datetime.now(timezone.utc))
+            )
+            await db.commit()
+        return batch
+
+
+async def _record_children(
+    entry: CrawlFrontierEntry, children: list[dict], max_depth: int
+) -> int:
+    """Add newly discovered subcategories to the tree and the frontier."""
+    now = datetime.now(timezone.utc)
+    child_depth = entry.depth + 1
+    # Frontier and categories share the normalized URL as key
+    entry_url = normalize_category_url(entry.url)
+    by_url = {normalize_category_url(child["url"]): child for child in children}
+    children = [{**child, "url": url} for url, child in by_url.items() if url != entry_url]
+
+    async with AsyncSessionLocal() as db:
+        parent_id = None
+        if entry.depth > 0:
+            result = await db.execute(select(Category.id).where(Category.url == entry_url))
+            parent_id = result.scalar()
+
+        # URL dedupe: only links never seen before come back from RETURNING
+        insert = dialect_insert(db)
+        stmt = (
+            insert(CrawlFrontierEntry)
+            .on_conflict_do_nothing(index_elements=[CrawlFrontierEntry.url])
+            .returning(CrawlFrontierEntry.url)
+        )
+        new_urls: set[str] = set()
+        if children:
+            result = await db.execute(
+                stmt,
+                [
+                    {
+                        "url": child["url"],
+                        "name": child["name"],
+                        "parent_url": entry.url,
+                        "depth": child_depth,
+                        # Nodes past max depth are stored but not expanded
+                        "status": FRONTIER_PENDING if child_depth < max_depth else FRONTIER_DONE,
+                        "attempts": 0,
+                        "updated_at": now,
+                    }
+                    for child in children
+                ],
+            )
+            new_urls = set(result.scalars().all())
+
+        # Commits the frontier rows together with their categories: committing
+        # them alone would leave orphans the RETURNING dedupe never yields again
+        await upsert_categories(
+            db,
+            [
+                {**child, "parent_id": parent_id, "depth": child_depth}
+                for child in children
+                if child["url"] in new_urls
+            ],
+        )
+
+    return len(new_urls)
+
+
+async def _finish_node(entry: CrawlFrontierEntry, ok: bool) -> None:
+    attempts = entry.attempts + 1
+    if ok:
+        status = FRONTIER_DONE
+    else:
+        status = FRONTIER_FAILED if attempts >= MAX_NODE_ATTEMPTS else FRONTIER_PENDING
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(CrawlFrontierEntry)
+            .where(CrawlFrontierEntry.url == entry.url)
+            .values(status=status, attempts=attempts, updated_at=datetime.now(timezone.utc))
+        )
+        await db.commit()
+
+
+async def _crawl_worker(queue: asyncio.Queue, max_depth: int, stats: dict[str, int]) -> None:
+    async with get_browser_context() as context:
+        page = await context.new_page()
+        await inject_stealth(page)
+
+        while not queue.empty():
+            entry: CrawlFrontierEntry = queue.get_nowait()
+            try:
+                children = await parse_categories_page(page, entry.url)
+                if children is None:
+                    await _finish_node(entry, ok=False)
+                    stats["failed"] += 1
+                    continue
+                discovered = await _record_children(entry, children, max_depth)
+                stats["discovered"] += discovered
+                await _finish_node(entry, ok=True)
+                stats["visited"] += 1
+            except Exception as e:
+                logger.error(f"Error crawling {entry.url}: {e}")
+                await _finish_node(entry, ok=False)
+                stats["failed"] += 1
+
+
+async def _crawl(
+    root_url: str, reset: bool, max_depth: int, concurrency: int, stats: dict[str, int]
+) -> None:
+    await _seed_frontier(root_url, reset)
+    logger.info(f"Crawling category tree from {root_url} (max depth {max_depth})")
+
+    while True:
+        batch = await _claim_batch(concurrency * 4)
+        if not batch:
+            break
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for entry in batch:
+            queue.put_nowait(entry)
+        await asyncio.gather(
+            *(_crawl_worker(queue, max_depth, stats) for _ in range(min(concurrency, len(batch))))
+        )
+        logger.info(f"Crawl progress: {stats}")
+
+
+async def crawl_category_tree(
+    root_url: str = BESTSELLERS_URL,
+    max_depth: int | None = None,
+    concurrency: int | None = None,
+    reset: bool = False,
+) -> dict[str, Any]:
+    """
+    Breadth-first crawl of the Best Sellers category tree.
+    The frontier is persisted in category_crawl_frontier, so an interrupted
+    crawl resumes where it stopped and never re-walks visited nodes;
+    `reset` starts over from `root_url`. The crawl lease is renewed while
+    it runs; if it is lost anyway, the crawl stops so two never run at once.
+    """
+    max_depth = max_depth or settings.CRAWL_MAX_DEPTH
+    concurrency = concurrency or settings.CRAWL_CONCURRENCY
+    stats = {"visited": 0, "discovered": 0, "failed": 0}
+
+    if not await acquire_lease(CRAWL_LEASE_KEY):
+        logger.warning("Category tree crawl already running elsewhere, skipping")
+        return {**stats, "skipped": 1}
+
+    try:
+        await run_holding_lease(
+            CRAWL_LEASE_KEY, lambda: _crawl(root_url, reset, max_depth, concurrency, stats)
+        )
+    except LeaseLostError:
+        logger.error("Category tree crawl lost its lease, stopping")
+        return {**stats, "lease_lost": 1}
+    finally:
+        await release_lease(CRAWL_LEASE_KEY)
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(CrawlFrontierEntry.status, func.count()).group_by(CrawlFrontierEntry.status)
+        )
+        frontier = {status: count for status, count in result.all()}
+
+    logger.info(f"Category tree crawl finished: {stats}, frontier: {frontier}")
+    return {**stats, "frontier": frontier}
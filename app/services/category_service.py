@@ -1,12 +1,23 @@
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import and_, func, or_, select, update
+from app.config import settings
+from app.db.upsert import dialect_insert
 from app.models import Category
 from app.utils.logger import setup_logger
+from app.utils.metrics import record_upsert
 
 logger = setup_logger(__name__)
 
+# Categories per existence query; keeps bound parameters under SQLite's limit
+CATEGORY_BATCH_SIZE = 500
+
 
 async def get_or_create_category(db: AsyncSession, category_url: str, category_name: str | None = None) -> Category:
+    # URL variants (ref=, query string, trailing slash) map to one row
+    category_url = normalize_category_url(category_url)
     try:
         result = await db.execute(select(Category).where(Category.url == category_url))
         category = result.scalars().first()
@@ -24,12 +35,16 @@ async def get_or_create_category(db: AsyncSession, category_url: str, category_n
         if not final_name:
             final_name = category_url.strip("/").split("/")[-1].replace("-", " ").title()
             
-        new_category = Category(name=category_name, url=category_url)
-        db.add(new_category)
+        # DO NOTHING: a concurrent request may create the same category first
+        insert = dialect_insert(db)
+        await db.execute(
+            insert(Category)
+            .values(name=final_name, url=category_url)
+            .on_conflict_do_nothing(index_elements=[Category.url])
+        )
         await db.commit()
-        await db.refresh(new_category)
-
-        return new_category
+        result = await db.execute(select(Category).where(Category.url == category_url))
+        return result.scalars().one()
 
     except Exception as e:
         logger.error(f"Error in get/create category: {e}")
@@ -37,6 +52,102 @@ async def get_or_create_category(db: AsyncSession, category_url: str, category_n
         raise
 
 
+async def upsert_categories(db: AsyncSession, items: list[dict]) -> dict[str, int]:
+    """
+    Insert or rename categories keyed on the unique normalized URL in one
+    transaction. Names are only written when they actually changed;
+    parent_id/depth are filled in for categories not yet placed in the tree.
+    Returns created/renamed/unchanged counts.
+    """
+    rows: dict[str, dict] = {}
+    for item in items:
+        url = normalize_category_url(item["url"])
+        rows[url] = {
+            "url": url,
+            "name": item["name"],
+            "parent_id": item.get("parent_id"),
+            "depth": item.get("depth"),
+        }
+    counts = {"created": 0, "renamed": 0, "unchanged": 0}
+    if not rows:
+        return counts
+
+    started = time.perf_counter()
+    try:
+        insert = dialect_insert(db)
+        stmt = insert(Category)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Category.url],
+            set_={
+                "name": stmt.excluded.name,
+                "parent_id": func.coalesce(Category.parent_id, stmt.excluded.parent_id),
+                "depth": func.coalesce(Category.depth, stmt.excluded.depth),
+            },
+            where=or_(
+                Category.name.is_distinct_from(stmt.excluded.name),
+                and_(Category.depth.is_(None), stmt.excluded.depth.is_not(None)),
+            ),
+        )
+
+        batch_rows = list(rows.values())
+        for start in range(0, len(batch_rows), CATEGORY_BATCH_SIZE):
+            batch = batch_rows[start : start + CATEGORY_BATCH_SIZE]
+            result = await db.execute(
+                select(Category.url, Category.name).where(
+                    Category.url.in_([row["url"] for row in batch])
+                )
+            )
+            existing: dict[str, str] = {url: name for url, name in result.all()}
+            for row in batch:
+                if row["url"] not in existing:
+                    counts["created"] += 1
+                elif existing[row["url"]] != row["name"]:
+                    counts["renamed"] += 1
+                else:
+                    counts["unchanged"] += 1
+
+            await db.execute(stmt, batch)
+
+        await db.commit()
+        record_upsert("categories", time.perf_counter() - started, counts)
+        logger.info(f"Upserted {len(rows)} categories: {counts}")
+        return counts
+
+    except Exception as e:
+        logger.error(f"Error in bulk category upsert: {e}")
+        await db.rollback()
+        raise
+
+
 async def get_all_categories(db: AsyncSession):
     result = await db.execute(select(Category))
-    return result.scalars().all()
\ No newline at end of file
+    return result.scalars().all()
+
+
+def normalize_category_url(category_url: str) -> str:
+    """Canonical form of a category URL: no query, fragment, ref segment or trailing slash."""
+    parsed = urlparse(category_url.strip())
+    path = parsed.path.split("/ref=")[0].rstrip("/")
+    return f"{parsed.scheme.lower() or 'https'}://{parsed.netloc.lower()}{path}"
+
+
+def is_category_fresh(category: Category) -> bool:
+    if category.last_scraped_at is None:
+        return False
+
+    last_scraped_at = category.last_scraped_at
+    if last_scraped_at.tzinfo is None:
+        # SQLite drops tzinfo; values are always written in UTC
+        last_scraped_at = last_scraped_at.replace(tzinfo=timezone.utc)
+
+    ttl = timedelta(seconds=settings.CATEGORY_FRESHNESS_TTL_SECONDS)
+    return datetime.now(timezone.utc) - last_scraped_at < ttl
+
+
+async def mark_category_scraped(db: AsyncSession, category_id: int) -> None:
+    await db.execute(
+        update(Category)
+        .where(Category.id == category_id)
+        .values(last_scraped_at=datetime.now(timezone.utc))
+    )
+    await db.commit()
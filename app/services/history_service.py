@@ -0,0 +1,246 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from sqlalchemy import Row, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Category, Product, ProductSnapshot
+from app.services.category_service import normalize_category_url
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# change_mask bits
+PRICE_CHANGED = 1
+RANK_CHANGED = 2
+RATING_CHANGED = 4
+REVIEWS_CHANGED = 8
+
+
+def to_cents(price: float | None) -> int | None:
+    return round(price * 100) if price is not None else None
+
+
+def to_tenths(rating: float | None) -> int | None:
+    return round(rating * 10) if rating is not None else None
+
+
+# Product field -> (snapshot column, change_mask bit, compact encoder)
+TRACKED_FIELDS: dict[str, tuple[str, int, Callable[[Any], Any]]] = {
+    "price": ("price_cents", PRICE_CHANGED, to_cents),
+    "rank": ("rank", RANK_CHANGED, lambda value: value),
+    "rating": ("rating_tenths", RATING_CHANGED, to_tenths),
+    "reviews_count": ("reviews_count", REVIEWS_CHANGED, lambda value: value),
+}
+
+# Product columns read before an upsert to diff against
+TRACKED_COLUMNS = [getattr(Product, field) for field in TRACKED_FIELDS]
+
+
+def build_snapshots(
+    rows: list[dict[str, Any]],
+    product_ids: dict[str, int],
+    previous: dict[str, Row],
+    captured_at: datetime,
+) -> list[dict[str, Any]]:
+    """
+    Diff upserted rows against their previous values and build snapshot rows
+    holding only the tracked values that changed. New products get a full
+    baseline snapshot. `product_ids` maps the ASINs actually written to their id.
+    """
+    snapshots = []
+    for row in rows:
+        product_id = product_ids.get(row["asin"])
+        if product_id is None:
+            continue
+        old = previous.get(row["asin"])
+
+        snapshot: dict[str, Any] = {
+            "product_id": product_id,
+            "category_id": row["category_id"],
+            "captured_at": captured_at,
+            "change_mask": 0,
+            "price_cents": None,
+            "price_delta_cents": None,
+            "rank": None,
+            "rank_delta": None,
+            "rating_tenths": None,
+            "reviews_count": None,
+        }
+        old_values: dict[str, Any] = {}
+        for field, (column, flag, encode) in TRACKED_FIELDS.items():
+            if field not in row:
+                continue
+            new_value = encode(row[field])
+            old_value = encode(getattr(old, field)) if old is not None else None
+            if old is not None and new_value == old_value:
+                continue
+            snapshot["change_mask"] |= flag
+            snapshot[column] = new_value
+            old_values[column] = old_value
+
+        if not snapshot["change_mask"]:
+            continue
+
+        for column, delta_column in (("price_cents", "price_delta_cents"), ("rank", "rank_delta")):
+            if snapshot[column] is not None and old_values.get(column) is not None:
+                snapshot[delta_column] = snapshot[column] - old_values[column]
+        snapshots.append(snapshot)
+
+    return snapshots
+
+
+async def record_snapshots(db: AsyncSession, snapshots: list[dict[str, Any]]) -> None:
+    """Append snapshot rows; the caller commits."""
+    if snapshots:
+        await db.execute(insert(ProductSnapshot), snapshots)
+
+
+async def get_category_id(db: AsyncSession, category_url: str) -> int | None:
+    result = await db.execute(
+        select(Category.id).where(Category.url == normalize_category_url(category_url))
+    )
+    return result.scalar()
+
+
+async def get_price_drops(
+    db: AsyncSession, days: int, category_id: int | None = None, limit: int = 50
+) -> list[dict[str, Any]]:
+    """
+    Products whose price went down over the last `days` days, biggest drop
+    first. The net change is the sum of the price deltas in the window.
+    """
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    change = func.sum(ProductSnapshot.price_delta_cents).label("price_change_cents")
+    # "+ 0" stops SQLite from walking the whole per-product index to avoid a
+    # GROUP BY sort; range-scanning the covering price index is much cheaper
+    product_id = (ProductSnapshot.product_id + 0).label("product_id")
+
+    drops_query = (
+        select(product_id, change)
+        .where(
+            ProductSnapshot.captured_at >= since,
+            ProductSnapshot.price_delta_cents.is_not(None),
+        )
+        .group_by(product_id)
+        .having(change < 0)
+    )
+    if category_id is not None:
+        drops_query = drops_query.where(ProductSnapshot.category_id == category_id)
+    changes = drops_query.subquery()
+
+    result = await db.execute(
+        select(
+            Product.asin,
+            Product.title,
+            Product.price,
+            Product.category_id,
+            changes.c.price_change_cents,
+        )
+        .join(changes, changes.c.product_id == Product.id)
+        .order_by(changes.c.price_change_cents.asc())
+        .limit(limit)
+    )
+
+    drops = []
+    for asin, title, price, product_category_id, change_cents in result.all():
+        price_change = change_cents / 100
+        previous_price = price - price_change if price is not None else None
+        drops.append(
+            {
+                "asin": asin,
+                "title": title,
+                "category_id": product_category_id,
+                "price": price,
+                "previous_price": round(previous_price, 2) if previous_price is not None else None,
+                "price_change": price_change,
+                "price_change_pct": round(price_change / previous_price * 100, 1)
+                if previous_price
+                else None,
+            }
+        )
+    return drops
+
+
+async def get_rank_movers(
+    db: AsyncSession, category_id: int, days: int, limit: int = 50
+) -> list[dict[str, Any]]:
+    """
+    Products with the largest net rank change in a category over the last
+    `days` days. A negative change means the product moved up the list.
+    """
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    change = func.sum(ProductSnapshot.rank_delta).label("rank_change")
+
+    changes = (
+        select(ProductSnapshot.product_id, change)
+        .where(
+            ProductSnapshot.category_id == category_id,
+            ProductSnapshot.captured_at >= since,
+            ProductSnapshot.rank_delta.is_not(None),
+        )
+        .group_by(ProductSnapshot.product_id)
+        .having(change != 0)
+        .subquery()
+    )
+
+    result = await db.execute(
+        select(Product.asin, Product.title, Product.rank, changes.c.rank_change)
+        .join(changes, changes.c.product_id == Product.id)
+        .order_by(func.abs(changes.c.rank_change).desc(), Product.rank.asc())
+        .limit(limit)
+    )
+    return [
+        {
+            "asin": asin,
+            "title": title,
+            "rank": rank,
+            "previous_rank": rank - rank_change,
+            "rank_change": rank_change,
+        }
+        for asin, title, rank, rank_change in result.all()
+    ]
+
+
+async def get_product_history(
+    db: AsyncSession, asin: str, days: int | None = None
+) -> list[dict[str, Any]] | None:
+    """
+    Full price/rank/rating/reviews timeline of one ASIN, oldest first.
+    Unchanged values are carried forward from earlier snapshots.
+    Returns None for an unknown ASIN.
+    """
+    product_id = (await db.execute(select(Product.id).where(Product.asin == asin))).scalar()
+    if product_id is None:
+        return None
+
+    result = await db.execute(
+        select(ProductSnapshot)
+        .where(ProductSnapshot.product_id == product_id)
+        .order_by(ProductSnapshot.captured_at.asc(), ProductSnapshot.id.asc())
+    )
+
+    since = datetime.now(timezone.utc) - timedelta(days=days) if days is not None else None
+    state: dict[str, Any] = {"price": None, "rank": None, "rating": None, "reviews_count": None}
+    history = []
+    for snapshot in result.scalars():
+        mask = snapshot.change_mask
+        if mask & PRICE_CHANGED:
+            state["price"] = snapshot.price_cents / 100 if snapshot.price_cents is not None else None
+        if mask & RANK_CHANGED:
+            state["rank"] = snapshot.rank
+        if mask & RATING_CHANGED:
+            state["rating"] = (
+                snapshot.rating_tenths / 10 if snapshot.rating_tenths is not None else None
+            )
+        if mask & REVIEWS_CHANGED:
+            state["reviews_count"] = snapshot.reviews_count
+
+        captured_at = snapshot.captured_at
+        if captured_at.tzinfo is None:
+            # SQLite returns naive datetimes; they are stored as UTC
+            captured_at = captured_at.replace(tzinfo=timezone.utc)
+        if since is None or captured_at >= since:
+            history.append({"captured_at": captured_at, "category_id": snapshot.category_id, **state})
+
+    return history
@@ -0,0 +1,158 @@
+"""
+Content-addressed archive of fetched HTML.
+
+Each page is stored once per distinct content as
+<HTML_ARCHIVE_DIR>/ab/cd/<sha256>.html.zst and every fetch gets an
+ArchivedPage index row (URL, ASIN, type, fetch time, content hash), so pages
+can be found again and re-extracted without a browser (see reparse_service).
+"""
+import asyncio
+import hashlib
+import os
+import uuid
+from datetime import datetime, timezone
+from typing import Any
+
+import zstandard
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models import ArchivedPage
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+PAGE_TYPES = ("product", "category")
+
+
+def blob_path(content_hash: str, archive_dir: str | None = None) -> str:
+    # Two directory levels keep any one directory small
+    return os.path.join(
+        archive_dir or settings.HTML_ARCHIVE_DIR,
+        content_hash[:2],
+        content_hash[2:4],
+        f"{content_hash}.html.zst",
+    )
+
+
+def store_html(html: str, archive_dir: str | None = None) -> tuple[str, int]:
+    """
+    Write `html` to the archive unless identical content is already there.
+    Returns (sha256 hex digest, uncompressed size in bytes).
+    """
+    raw = html.encode("utf-8")
+    content_hash = hashlib.sha256(raw).hexdigest()
+    path = blob_path(content_hash, archive_dir)
+    if os.path.exists(path):
+        return content_hash, len(raw)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Compressor objects are not thread-safe, so each call gets its own
+    compressed = zstandard.ZstdCompressor(level=settings.HTML_ARCHIVE_ZSTD_LEVEL).compress(raw)
+    # Unique temp name: two workers may store the same content at once
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(compressed)
+    os.replace(tmp_path, path)
+    return content_hash, len(raw)
+
+
+def load_html(content_hash: str, archive_dir: str | None = None) -> str:
+    """Decompressed HTML of an archived blob. Raises FileNotFoundError if missing."""
+    with open(blob_path(content_hash, archive_dir), "rb") as f:
+        return zstandard.ZstdDecompressor().decompress(f.read()).decode("utf-8")
+
+
+async def archive_page(
+    html: str,
+    url: str,
+    page_type: str,
+    asin: str | None = None,
+    category_url: str | None = None,
+    rank: int | None = None,
+) -> None:
+    """
+    Store a fetched page and index it. No-op unless HTML_ARCHIVE_ENABLED;
+    failures are logged and never interrupt the scrape.
+    """
+    if not settings.HTML_ARCHIVE_ENABLED:
+        return
+    try:
+        content_hash, size = await asyncio.to_thread(store_html, html)
+        async with AsyncSessionLocal() as db:
+            db.add(
+                ArchivedPage(
+                    url=url,
+                    page_type=page_type,
+                    asin=asin,
+                    category_url=category_url,
+                    rank=rank,
+                    content_hash=content_hash,
+                    size_bytes=size,
+                    fetched_at=datetime.now(timezone.utc),
+                )
+            )
+            await db.commit()
+    except Exception as e:
+        logger.warning(f"Could not archive {page_type} page {url}: {e}")
+
+
+async def find_pages(
+    db: AsyncSession,
+    url: str | None = None,
+    asin: str | None = None,
+    page_type: str | None = None,
+    category_url: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    latest_only: bool = False,
+    limit: int | None = None,
+) -> list[ArchivedPage]:
+    """
+    Archived fetches matching every given filter, oldest first.
+    With latest_only, only the most recent fetch of each URL is returned.
+    """
+    query = select(ArchivedPage)
+    if url is not None:
+        query = query.where(ArchivedPage.url == url)
+    if asin is not None:
+        query = query.where(ArchivedPage.asin == asin)
+    if page_type is not None:
+        query = query.where(ArchivedPage.page_type == page_type)
+    if category_url is not None:
+        query = query.where(ArchivedPage.category_url == category_url)
+    if since is not None:
+        query = query.where(ArchivedPage.fetched_at >= since)
+    if until is not None:
+        query = query.where(ArchivedPage.fetched_at < until)
+
+    if latest_only:
+        # Ids grow with fetch time, so the highest id per URL is its latest fetch
+        latest = (
+            query.with_only_columns(func.max(ArchivedPage.id).label("id"))
+            .group_by(ArchivedPage.url)
+            .subquery()
+        )
+        query = select(ArchivedPage).join(latest, latest.c.id == ArchivedPage.id)
+
+    query = query.order_by(ArchivedPage.fetched_at.asc(), ArchivedPage.id.asc())
+    if limit is not None:
+        query = query.limit(limit)
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+
+def page_to_dict(page: ArchivedPage) -> dict[str, Any]:
+    return {
+        "id": page.id,
+        "url": page.url,
+        "page_type": page.page_type,
+        "asin": page.asin,
+        "category_url": page.category_url,
+        "rank": page.rank,
+        "content_hash": page.content_hash,
+        "size_bytes": page.size_bytes,
+        "fetched_at": page.fetched_at,
+    }
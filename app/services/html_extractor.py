@@ -0,0 +1,290 @@
+"""
+Browser-free extraction over raw HTML with lxml.
+
+Runs the AmazonSelectors table with the same semantics as the in-page
+extraction scripts in amazon_parser (first element per selector, first
+non-empty text wins, :has-text() emulated) and returns the same raw dicts,
+so stored pages can be parsed without Playwright. Functions here are pure
+and picklable, so they can run in a process pool via run_in_pool.
+"""
+import asyncio
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, TypeVar
+
+import lxml.html
+from cssselect import HTMLTranslator, SelectorError
+from lxml import etree
+
+from app.config import settings
+from app.utils.selectors import AmazonSelectors
+
+T = TypeVar("T")
+
+HAS_TEXT = re.compile(r"^(.*?):has-text\((['\"])(.*?)\2\)(.*)$")
+MARKER = "data-amz-has-text"
+# "#id" optionally followed by descendant selectors
+ID_SELECTOR = re.compile(r"^#(-?[_a-zA-Z][\w-]*)(?:\s+([^+>~].*))?$")
+
+# innerText skips the content of these
+_HIDDEN_TAGS = frozenset({"script", "style", "noscript", "template"})
+# innerText puts these on their own line
+_BLOCK_TAGS = frozenset(
+    {
+        "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt",
+        "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3",
+        "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre",
+        "section", "table", "tr", "ul",
+    }
+)
+_translator = HTMLTranslator()
+
+
+@lru_cache(maxsize=256)
+def _compile(selector: str) -> etree.XPath | None:
+    try:
+        return etree.XPath(_translator.css_to_xpath(selector))
+    except (SelectorError, etree.XPathSyntaxError):
+        return None
+
+
+@lru_cache(maxsize=256)
+def _compile_by_id(selector: str) -> etree.XPath | None:
+    """
+    XPath starting from id() lookups for "#id ..." selector lists, or None.
+    libxml2 keeps an ID index, so this avoids walking the whole document;
+    id() only knows the first element per ID, so it serves first-match lookups.
+    """
+    parts = []
+    for part in selector.split(","):
+        match = ID_SELECTOR.match(part.strip())
+        if not match:
+            return None
+        ident, rest = match.groups()
+        xpath = f"id('{ident}')"
+        if rest:
+            try:
+                xpath += "/" + _translator.css_to_xpath(rest, prefix="descendant::")
+            except SelectorError:
+                return None
+        parts.append(xpath)
+    return etree.XPath(" | ".join(parts))
+
+
+@lru_cache(maxsize=256)
+def _split_has_text(selector: str) -> tuple[str, str, str] | None:
+    match = HAS_TEXT.match(selector)
+    if not match:
+        return None
+    base, _, text, rest = match.groups()
+    return base, text, rest
+
+
+def query_all(root: Any, selector: str) -> list[Any]:
+    """querySelectorAll with :has-text() support; invalid selectors match nothing."""
+    has_text = _split_has_text(selector)
+    if has_text is None:
+        xpath = _compile(selector)
+        return xpath(root) if xpath is not None else []
+
+    base, text, rest = has_text
+    needle = text.lower()
+    matched = [el for el in query_all(root, base or "*") if needle in el.text_content().lower()]
+    if not rest.strip():
+        return matched
+
+    for el in matched:
+        el.set(MARKER, "")
+    try:
+        return query_all(root, f"[{MARKER}]{rest}")
+    finally:
+        for el in matched:
+            el.attrib.pop(MARKER, None)
+
+
+def query_first(root: Any, selector: str) -> Any | None:
+    if root.getparent() is None and ":has-text" not in selector:
+        by_id = _compile_by_id(selector)
+        if by_id is not None:
+            found = by_id(root)
+            return found[0] if found else None
+    found = query_all(root, selector)
+    return found[0] if found else None
+
+
+def _collect_text(el: Any, chunks: list[str | None]) -> None:
+    """Append the text of `el` to `chunks`, with None where innerText breaks the line."""
+    tag = el.tag if isinstance(el.tag, str) else None
+    if tag is None or tag in _HIDDEN_TAGS:
+        # Comments and hidden elements; their tail is added by the parent
+        return
+    if tag == "br":
+        chunks.append(None)
+    block = tag in _BLOCK_TAGS
+    if block:
+        chunks.append(None)
+    if el.text:
+        chunks.append(el.text)
+    for child in el:
+        _collect_text(child, chunks)
+        if child.tail:
+            chunks.append(child.tail)
+    if block:
+        chunks.append(None)
+
+
+def text_of(el: Any | None) -> str:
+    """
+    Visible text like a trimmed innerText: block elements and <br> start a
+    new line, other whitespace (source newlines included) collapses to one
+    space, and empty lines are dropped.
+    """
+    if el is None:
+        return ""
+    if len(el) == 0 and isinstance(el.tag, str) and el.tag not in _HIDDEN_TAGS:
+        # Leaf element, the common case: no line breaks possible
+        return " ".join((el.text or "").split())
+    chunks: list[str | None] = []
+    _collect_text(el, chunks)
+    lines: list[str] = []
+    current: list[str] = []
+    for chunk in [*chunks, None]:
+        if chunk is not None:
+            current.append(chunk)
+            continue
+        line = " ".join("".join(current).split())
+        if line:
+            lines.append(line)
+        current = []
+    return "\n".join(lines)
+
+
+def first_text(root: Any, selectors: list[str]) -> str | None:
+    for selector in selectors:
+        text = text_of(query_first(root, selector))
+        if text:
+            return text
+    return None
+
+
+def _parse(html: str) -> Any:
+    return lxml.html.fromstring(html)
+
+
+def extract_product_fields(html: str) -> dict[str, Any]:
+    """Raw product fields of a detail page; same keys as BULK_EXTRACT_JS."""
+    root = _parse(html)
+
+    price_block = query_first(root, AmazonSelectors.PRICE_CONTAINERS)
+    discount_elem = (
+        query_first(price_block, AmazonSelectors.DISCOUNT_PERCENTAGE)
+        if price_block is not None
+        else None
+    )
+
+    main_image_url = None
+    for selector in AmazonSelectors.MAIN_IMAGE:
+        img = query_first(root, selector)
+        if img is not None:
+            main_image_url = img.get("src")
+            break
+
+    return {
+        "title": first_text(root, AmazonSelectors.TITLE),
+        "price": first_text(root, AmazonSelectors.PRICE),
+        "list_price": first_text(root, AmazonSelectors.LIST_PRICE),
+        "discount": text_of(discount_elem) if discount_elem is not None else None,
+        "rating": first_text(root, AmazonSelectors.RATING),
+        "reviews_count": first_text(root, AmazonSelectors.REVIEWS_COUNT),
+        "is_prime": any(
+            query_first(root, selector) is not None for selector in AmazonSelectors.PRIME_LOGO
+        ),
+        "best_sellers_rank": first_text(root, AmazonSelectors.BEST_SELLERS_RANK),
+        "bullet_points": [
+            text
+            for text in map(text_of, query_all(root, AmazonSelectors.BULLET_POINTS[0]))
+            if text
+        ],
+        "main_image_url": main_image_url,
+    }
+
+
+def extract_bestseller_items(html: str) -> list[dict[str, Any]]:
+    """Raw best-seller list entries; same shape as BESTSELLER_ITEMS_JS."""
+    root = _parse(html)
+    items = []
+    for item in query_all(root, AmazonSelectors.BESTSELLER_ITEM):
+        link = query_first(item, AmazonSelectors.BESTSELLER_LINK)
+        asin_holder = item
+        if item.get("data-asin") is None:
+            asin_holder = query_first(item, AmazonSelectors.BESTSELLER_ASIN)
+        image = query_first(item, AmazonSelectors.BESTSELLER_IMAGE)
+        rank = query_first(item, AmazonSelectors.BESTSELLER_RANK)
+        items.append(
+            {
+                "rank": text_of(rank) if rank is not None else None,
+                "href": link.get("href") if link is not None else None,
+                "listing": {
+                    "asin": asin_holder.get("data-asin") if asin_holder is not None else None,
+                    "title": first_text(item, AmazonSelectors.BESTSELLER_TITLE)
+                    or (image.get("alt") if image is not None else None),
+                    "price": first_text(item, AmazonSelectors.BESTSELLER_PRICE),
+                    "rating": first_text(item, AmazonSelectors.BESTSELLER_RATING),
+                    "reviews_count": first_text(item, AmazonSelectors.BESTSELLER_REVIEWS),
+                    "main_image_url": image.get("src") if image is not None else None,
+                },
+            }
+        )
+    return items
+
+
+def extract_product_links(html: str) -> list[str | None]:
+    """href of every product link on the page, in document order."""
+    return [link.get("href") for link in query_all(_parse(html), AmazonSelectors.BESTSELLER_LINK)]
+
+
+def extract_category_links(html: str) -> list[dict[str, Any]] | None:
+    """
+    Raw {name, href} of every sidebar link on a best-seller page,
+    or None if the page has no category sidebar.
+    """
+    sidebar = query_first(_parse(html), AmazonSelectors.CATEGORY_SIDEBAR)
+    if sidebar is None:
+        return None
+    return [{"name": text_of(link), "href": link.get("href")} for link in query_all(sidebar, "a")]
+
+
+# ==================== PROCESS POOL ====================
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def get_pool() -> ProcessPoolExecutor | None:
+    """Lazily started parse pool; None when HTML_PARSE_WORKERS is 0."""
+    global _pool
+    if settings.HTML_PARSE_WORKERS <= 0:
+        return None
+    if _pool is None:
+        # spawn: forking a process with a running event loop and threads is unsafe
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.HTML_PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+async def run_in_pool(fn: Callable[..., T], *args: Any) -> T:
+    """Run a pure extraction function off the event loop (inline without a pool)."""
+    pool = get_pool()
+    if pool is None:
+        return fn(*args)
+    return await asyncio.get_running_loop().run_in_executor(pool, partial(fn, *args))
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
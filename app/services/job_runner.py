@@ -0,0 +1,148 @@
+import asyncio
+from typing import Any
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models import ParseJob
+from app.services.amazon_parser import ProgressCallback
+from app.services.category_crawler import crawl_category_tree
+from app.services.category_service import get_or_create_category
+from app.services.job_service import (
+    JOB_KIND_CRAWL_TREE,
+    JOB_KIND_SYNC_CATEGORIES,
+    claim_next_job,
+    finish_job,
+    renew_job_lease,
+    update_job_progress,
+)
+from app.services.lease_service import LEASE_OWNER
+from app.services.scrape_service import scrape_category
+from app.utils.logger import setup_logger
+from app.utils.scheduler import sync_amazon_categories
+
+logger = setup_logger(__name__)
+
+
+class JobRunner:
+    """
+    Background workers that lease queued parse jobs and execute them.
+    Runs inside the API process (JOB_EXECUTION_MODE=inline) or in the
+    standalone worker processes started by worker.py.
+    """
+
+    def __init__(self, owner: str = LEASE_OWNER) -> None:
+        self.owner = owner
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    async def start(self, concurrency: int | None = None) -> None:
+        concurrency = concurrency or settings.JOB_WORKERS
+        self._tasks = [
+            asyncio.create_task(self._worker(index)) for index in range(concurrency)
+        ]
+        logger.info(f"Job runner {self.owner} started with {concurrency} workers")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake idle workers right away after a job is enqueued."""
+        self._wakeup.set()
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    job = await claim_next_job(db, self.owner)
+                if job is None:
+                    await self._wait_for_work()
+                    continue
+                await self.run_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker {index} error: {e}", exc_info=True)
+                await asyncio.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+
+    async def _wait_for_work(self) -> None:
+        try:
+            await asyncio.wait_for(
+                self._wakeup.wait(), timeout=settings.JOB_POLL_INTERVAL_SECONDS
+            )
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """Keep the job's lease alive while it runs; return once it is lost."""
+        interval = settings.JOB_VISIBILITY_TIMEOUT_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with AsyncSessionLocal() as db:
+                    if not await renew_job_lease(db, job_id, self.owner):
+                        logger.warning(f"Lost lease on job {job_id}")
+                        return
+            except Exception as e:
+                # Retried next interval; the lease only lapses after the full timeout
+                logger.warning(f"Could not renew lease on job {job_id}: {e}")
+
+    async def _execute(self, job: ParseJob, progress: ProgressCallback) -> dict[str, Any] | None:
+        if job.kind == JOB_KIND_SYNC_CATEGORIES:
+            return await sync_amazon_categories()
+        if job.kind == JOB_KIND_CRAWL_TREE:
+            return await crawl_category_tree(reset=job.mode == "reset")
+
+        async with AsyncSessionLocal() as db:
+            category = await get_or_create_category(db, job.category_url)
+        return await scrape_category(category, progress=progress, mode=job.mode)
+
+    async def run_job(self, job: ParseJob) -> None:
+        logger.info(
+            f"Running {job.kind or 'scrape'} job {job.id} for {job.category_url} "
+            f"(attempt {job.attempts})"
+        )
+        progress: list[dict[str, Any]] = []
+        total: int | None = None
+
+        async def on_progress(event: dict[str, Any]) -> None:
+            nonlocal total
+            if event["type"] == "urls":
+                total = event["total"]
+            else:
+                progress.append({k: v for k, v in event.items() if k != "type"})
+            async with AsyncSessionLocal() as db:
+                await update_job_progress(db, job.id, self.owner, progress, total)
+
+        work = asyncio.ensure_future(self._execute(job, on_progress))
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        try:
+            await asyncio.wait({work, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+            if not work.done():
+                # Another worker may re-claim the job now; stop instead of running it twice
+                logger.error(f"Job {job.id} lost its lease, cancelling it")
+                return
+            result = work.result()
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            async with AsyncSessionLocal() as db:
+                await finish_job(db, job.id, self.owner, error=str(e) or type(e).__name__)
+            return
+        finally:
+            # Wait for both so a cancelled DB call releases its connection first
+            work.cancel()
+            heartbeat.cancel()
+            await asyncio.gather(work, heartbeat, return_exceptions=True)
+
+        async with AsyncSessionLocal() as db:
+            if result is None:
+                await finish_job(db, job.id, self.owner, error="Amazon returned no data")
+            else:
+                await finish_job(db, job.id, self.owner, result=result)
+        logger.info(f"Job {job.id} finished")
+
+
+job_runner = JobRunner()
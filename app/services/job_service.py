@@ -0,0 +1,253 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.upsert import dialect_insert
+from app.models import ParseJob
+from app.services.category_service import normalize_category_url
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+TERMINAL_STATUSES = {JOB_SUCCEEDED, JOB_FAILED}
+
+JOB_KIND_SCRAPE = "scrape"
+# Browser work the API must not run itself in JOB_EXECUTION_MODE=worker
+JOB_KIND_SYNC_CATEGORIES = "sync_categories"
+JOB_KIND_CRAWL_TREE = "crawl_tree"
+
+
+def _dedupe_key(kind: str, category_url: str, mode: str | None) -> str:
+    if kind == JOB_KIND_SCRAPE:
+        mode = mode or settings.SCRAPE_MODE
+    return f"{kind}|{category_url}|{mode or ''}"
+
+
+async def create_job(
+    db: AsyncSession,
+    category_url: str,
+    mode: str | None = None,
+    kind: str = JOB_KIND_SCRAPE,
+) -> ParseJob:
+    """
+    Enqueue a job, or return the queued or running job of the same kind
+    for the same normalized URL and mode. The unique dedupe_key makes the
+    check atomic, so concurrent requests enqueue a single job.
+    """
+    category_url = normalize_category_url(category_url)
+    dedupe_key = _dedupe_key(kind, category_url, mode)
+    insert = dialect_insert(db)
+
+    while True:
+        await db.execute(
+            insert(ParseJob)
+            .values(
+                id=uuid.uuid4().hex,
+                kind=kind,
+                category_url=category_url,
+                mode=mode,
+                dedupe_key=dedupe_key,
+                status=JOB_QUEUED,
+                completed=0,
+                progress=[],
+                attempts=0,
+                created_at=datetime.now(timezone.utc),
+            )
+            .on_conflict_do_nothing(index_elements=[ParseJob.dedupe_key])
+        )
+        await db.commit()
+
+        result = await db.execute(
+            select(ParseJob)
+            .where(ParseJob.dedupe_key == dedupe_key)
+            .execution_options(populate_existing=True)
+        )
+        job = result.scalar()
+        # None: the active job finished in between, so enqueue a new one
+        if job is not None:
+            return job
+
+
+async def get_job(db: AsyncSession, job_id: str) -> ParseJob | None:
+    return await db.get(ParseJob, job_id, populate_existing=True)
+
+
+def _claimable(now: datetime):
+    """Queued jobs, or running jobs whose worker stopped renewing the lease."""
+    return or_(
+        ParseJob.status == JOB_QUEUED,
+        and_(ParseJob.status == JOB_RUNNING, ParseJob.lease_expires_at < now),
+    )
+
+
+async def _fail_exhausted_jobs(db: AsyncSession, now: datetime) -> None:
+    result = cast(
+        CursorResult,
+        await db.execute(
+            update(ParseJob)
+            .where(
+                ParseJob.status == JOB_RUNNING,
+                ParseJob.lease_expires_at < now,
+                ParseJob.attempts >= settings.JOB_MAX_ATTEMPTS,
+            )
+            .values(
+                status=JOB_FAILED,
+                error="Lease expired too many times (worker crashed?)",
+                finished_at=now,
+                locked_by=None,
+                lease_expires_at=None,
+                dedupe_key=None,
+            )
+            .execution_options(synchronize_session=False)
+        ),
+    )
+    await db.commit()
+    if result.rowcount:
+        logger.warning(f"Failed {result.rowcount} jobs that exhausted their attempts")
+
+
+async def claim_next_job(db: AsyncSession, owner: str) -> ParseJob | None:
+    """
+    Lease the oldest claimable job to `owner` for JOB_VISIBILITY_TIMEOUT_SECONDS.
+    A job whose lease expires (crashed worker) becomes claimable again.
+    """
+    now = datetime.now(timezone.utc)
+    await _fail_exhausted_jobs(db, now)
+
+    while True:
+        result = await db.execute(
+            select(ParseJob.id)
+            .where(_claimable(now))
+            .order_by(ParseJob.created_at)
+            .limit(1)
+        )
+        job_id = result.scalar()
+        if job_id is None:
+            return None
+
+        claimed = cast(
+            CursorResult,
+            await db.execute(
+                update(ParseJob)
+                .where(ParseJob.id == job_id, _claimable(now))
+                .values(
+                    status=JOB_RUNNING,
+                    locked_by=owner,
+                    lease_expires_at=now
+                    + timedelta(seconds=settings.JOB_VISIBILITY_TIMEOUT_SECONDS),
+                    attempts=ParseJob.attempts + 1,
+                    started_at=now,
+                    completed=0,
+                    progress=[],
+                )
+                # SQLite returns naive datetimes, so skip the in-session evaluation
+                .execution_options(synchronize_session=False)
+            ),
+        )
+        await db.commit()
+        # Another worker may have claimed it first; try the next one
+        if claimed.rowcount == 1:
+            return await get_job(db, job_id)
+
+
+async def renew_job_lease(db: AsyncSession, job_id: str, owner: str) -> bool:
+    """Extend the lease; False means another worker has taken the job over."""
+    result = cast(
+        CursorResult,
+        await db.execute(
+            update(ParseJob)
+            .where(
+                ParseJob.id == job_id,
+                ParseJob.locked_by == owner,
+                ParseJob.status == JOB_RUNNING,
+            )
+            .values(
+                lease_expires_at=datetime.now(timezone.utc)
+                + timedelta(seconds=settings.JOB_VISIBILITY_TIMEOUT_SECONDS)
+            )
+        ),
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
+async def update_job_progress(
+    db: AsyncSession,
+    job_id: str,
+    owner: str,
+    progress: list[dict[str, Any]],
+    total: int | None,
+) -> None:
+    await db.execute(
+        update(ParseJob)
+        .where(ParseJob.id == job_id, ParseJob.locked_by == owner)
+        .values(progress=list(progress), completed=len(progress), total=total)
+    )
+    await db.commit()
+
+
+async def finish_job(
+    db: AsyncSession,
+    job_id: str,
+    owner: str,
+    result: dict[str, Any] | None = None,
+    error: str | None = None,
+) -> None:
+    await db.execute(
+        update(ParseJob)
+        .where(ParseJob.id == job_id, ParseJob.locked_by == owner)
+        .values(
+            status=JOB_FAILED if error else JOB_SUCCEEDED,
+            result=result,
+            error=error,
+            finished_at=datetime.now(timezone.utc),
+            locked_by=None,
+            lease_expires_at=None,
+            dedupe_key=None,
+        )
+    )
+    await db.commit()
+
+
+async def get_queue_depths(db: AsyncSession) -> dict[str, int]:
+    """Number of jobs per status."""
+    result = await db.execute(
+        select(ParseJob.status, func.count()).group_by(ParseJob.status)
+    )
+    return {status: count for status, count in result.all()}
+
+
+async def get_job_stats(db: AsyncSession, window_minutes: int = 60) -> dict[str, Any]:
+    """Queue depth per status and throughput over the last `window_minutes`."""
+    by_status = await get_queue_depths(db)
+
+    since = datetime.now(timezone.utc) - timedelta(minutes=window_minutes)
+    result = await db.execute(
+        select(ParseJob.started_at, ParseJob.finished_at).where(
+            ParseJob.finished_at >= since
+        )
+    )
+    finished = result.all()
+    durations = [
+        (finished_at - started_at).total_seconds()
+        for started_at, finished_at in finished
+        if started_at and finished_at
+    ]
+
+    return {
+        "queue_depth": by_status.get(JOB_QUEUED, 0),
+        "running": by_status.get(JOB_RUNNING, 0),
+        "by_status": by_status,
+        "window_minutes": window_minutes,
+        "finished_in_window": len(finished),
+        "jobs_per_minute": round(len(finished) / window_minutes, 3),
+        "avg_duration_seconds": round(sum(durations) / len(durations), 2) if durations else None,
+    }
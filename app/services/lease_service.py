@@ -0,0 +1,127 @@
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Coroutine, TypeVar, cast
+
+from sqlalchemy import CursorResult, delete, exists, or_, select, update
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.db.upsert import dialect_insert
+from app.models import ScrapeLease
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+T = TypeVar("T")
+
+# Identifies this process as a lease owner across uvicorn workers
+LEASE_OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaseLostError(Exception):
+    """The lease expired or was taken over while its holder was still working."""
+
+
+async def acquire_lease(key: str, ttl_seconds: int | None = None) -> bool:
+    """
+    Take the lease for `key` unless another live owner holds it.
+    Calling it again as the current owner renews the lease.
+    """
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(seconds=ttl_seconds or settings.SCRAPE_LEASE_TTL_SECONDS)
+
+    async with AsyncSessionLocal() as db:
+        insert = dialect_insert(db)
+        stmt = insert(ScrapeLease).values(key=key, owner=LEASE_OWNER, expires_at=expires_at)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ScrapeLease.key],
+            set_={"owner": stmt.excluded.owner, "expires_at": stmt.excluded.expires_at},
+            where=or_(ScrapeLease.expires_at < now, ScrapeLease.owner == LEASE_OWNER),
+        )
+        result = cast(CursorResult, await db.execute(stmt))
+        await db.commit()
+
+    acquired = result.rowcount == 1
+    logger.debug(f"Lease {key}: {'acquired' if acquired else 'held elsewhere'}")
+    return acquired
+
+
+async def renew_lease(key: str, ttl_seconds: int | None = None) -> bool:
+    """Extend a lease this process holds. False if it expired and was taken over or released."""
+    expires_at = datetime.now(timezone.utc) + timedelta(
+        seconds=ttl_seconds or settings.SCRAPE_LEASE_TTL_SECONDS
+    )
+    async with AsyncSessionLocal() as db:
+        result = cast(
+            CursorResult,
+            await db.execute(
+                update(ScrapeLease)
+                .where(ScrapeLease.key == key, ScrapeLease.owner == LEASE_OWNER)
+                .values(expires_at=expires_at)
+            ),
+        )
+        await db.commit()
+    return result.rowcount == 1
+
+
+async def _renew_until_lost(key: str) -> None:
+    """Renew every third of the TTL; return once a renewal finds the lease gone."""
+    while True:
+        await asyncio.sleep(settings.SCRAPE_LEASE_TTL_SECONDS / 3)
+        try:
+            if not await renew_lease(key):
+                logger.warning(f"Lease {key} was lost before the work finished")
+                return
+        except Exception as e:
+            # A failed renewal is retried; the lease only lapses after the full TTL
+            logger.warning(f"Could not renew lease {key}: {e}")
+
+
+async def run_holding_lease(key: str, fn: Callable[[], Coroutine[Any, Any, T]]) -> T:
+    """
+    Run fn() under the already acquired lease for `key`, renewing it while
+    fn runs. If the lease is lost, fn is cancelled and LeaseLostError raised,
+    so two holders never keep working on the same key.
+    """
+    work = asyncio.ensure_future(fn())
+    renewer = asyncio.create_task(_renew_until_lost(key))
+    try:
+        await asyncio.wait({work, renewer}, return_when=asyncio.FIRST_COMPLETED)
+        if not work.done():
+            raise LeaseLostError(f"Lease {key} was lost")
+        return work.result()
+    finally:
+        # Wait for both so a cancelled DB call releases its connection first
+        work.cancel()
+        renewer.cancel()
+        await asyncio.gather(work, renewer, return_exceptions=True)
+
+
+async def release_lease(key: str) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            delete(ScrapeLease).where(
+                ScrapeLease.key == key, ScrapeLease.owner == LEASE_OWNER
+            )
+        )
+        await db.commit()
+
+
+async def wait_for_lease_release(key: str, poll_interval: float = 2.0) -> None:
+    """Block until no live lease exists for `key`."""
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(
+                    exists().where(
+                        ScrapeLease.key == key,
+                        ScrapeLease.expires_at >= datetime.now(timezone.utc),
+                    )
+                )
+            )
+        if not result.scalar():
+            return
+        await asyncio.sleep(poll_interval)
@@ -1,24 +1,131 @@
-from typing import Any, Sequence
+import base64
+import hashlib
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import exists, select, tuple_
+from app.db.upsert import dialect_insert
 from app.models import Product, Category
+from app.services.category_service import normalize_category_url
+from app.services.history_service import TRACKED_COLUMNS, build_snapshots, record_snapshots
 from app.utils.logger import setup_logger
+from app.utils.metrics import record_upsert
 
 logger = setup_logger(__name__)
 
+# Rows per upsert batch; keeps the ASIN existence query under SQLite's parameter limit
+UPSERT_BATCH_SIZE = 500
+
+
+def compute_content_hash(row: dict[str, Any]) -> str:
+    """Stable SHA-256 over the scraped fields of a product row."""
+    payload = {key: value for key, value in row.items() if key != "content_hash"}
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+DEFAULT_PAGE_SIZE = 100
+
+# Columns clients may request with fields=
+PRODUCT_FIELDS = (
+    "id",
+    "asin",
+    "title",
+    "rank",
+    "price",
+    "currency",
+    "list_price",
+    "discount_percentage",
+    "rating",
+    "reviews_count",
+    "is_prime",
+    "best_sellers_rank",
+    "bullet_points",
+    "main_image_url",
+    "category_id",
+)
+
+# sort_by -> (column, descending); each backed by a (column, id) index
+PRODUCT_SORTS: dict[str | None, tuple[Any, bool]] = {
+    None: (None, False),
+    "price": (Product.price, False),
+    "-price": (Product.price, True),
+    "rating": (Product.rating, True),
+}
+
+
+def encode_cursor(sort_by: str | None, value: Any, last_id: int) -> str:
+    """Opaque keyset cursor: sort order, last sort value and last id."""
+    payload = {"s": sort_by, "v": value, "id": last_id, "null": value is None}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str | None) -> dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        position = {"value": payload["v"], "id": int(payload["id"]), "null": bool(payload["null"])}
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if payload.get("s") != sort_by:
+        raise ValueError("Cursor was issued for a different sort_by")
+    return position
+
+
+# Grid fields compared to decide whether a product needs a detail page load
+LISTING_HASH_FIELDS = ("asin", "title", "rank", "price", "currency", "rating", "reviews_count")
+
+
+def compute_listing_hash(row: dict[str, Any]) -> str:
+    """Content hash over the best-seller grid fields of a product."""
+    return compute_content_hash({key: row.get(key) for key in LISTING_HASH_FIELDS})
+
+
 class ProductService:
-    @staticmethod
-    async def get_filtered_products(
+    @classmethod
+    async def get_products_page(
+        cls,
         db: AsyncSession,
         category_url: str | None = None,
         min_rating: float | None = None,
         max_price: float | None = None,
-        sort_by: str | None = None
-    ) -> Sequence[Product]:
-        query = select(Product)
+        sort_by: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        One keyset-paginated page of products as dicts holding `fields`
+        (default: all public columns), plus the cursor of the next page.
+        Rows with a NULL sort value come after all others, ordered by id.
+        Raises ValueError for an unknown sort, field or a foreign cursor.
+        """
+        if sort_by not in PRODUCT_SORTS:
+            raise ValueError(f"Unsupported sort_by: {sort_by}")
+        fields = fields or list(PRODUCT_FIELDS)
+        unknown = [field for field in fields if field not in PRODUCT_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+        sort_column, descending = PRODUCT_SORTS[sort_by]
+        position = decode_cursor(cursor, sort_by) if cursor else None
+
+        selected = list(dict.fromkeys(["id", *fields]))
+        if sort_column is not None and sort_column.key not in selected:
+            selected.append(sort_column.key)
+        query = select(*(getattr(Product, name) for name in selected))
 
         if category_url:
-            query = query.join(Category).where(Category.url == category_url)
+            category_id = (
+                await db.execute(
+                    select(Category.id).where(Category.url == normalize_category_url(category_url))
+                )
+            ).scalar()
+            if category_id is None:
+                return [], None
+            query = query.where(Product.category_id == category_id)
 
         if min_rating is not None:
             query = query.where(Product.rating >= min_rating)
@@ -26,54 +133,146 @@ class ProductService:
         if max_price is not None:
             query = query.where(Product.price <= max_price)
 
-        if sort_by == "price":
-            query = query.order_by(Product.price.asc())
-        elif sort_by == "-price":
-            query = query.order_by(Product.price.desc())
-        elif sort_by == "rating":
-            query = query.order_by(Product.rating.desc())
+        rows: list[Any] = []
+        if sort_column is None:
+            if position:
+                query = query.where(Product.id > position["id"])
+            result = await db.execute(query.order_by(Product.id.asc()).limit(limit + 1))
+            rows = list(result.all())
+        else:
+            # Non-NULL values first, each phase a plain range scan of (column, id)
+            if not position or not position["null"]:
+                ranged = query.where(sort_column.is_not(None))
+                if position:
+                    key = tuple_(sort_column, Product.id)
+                    after = (position["value"], position["id"])
+                    ranged = ranged.where(key < after if descending else key > after)
+                if descending:
+                    ranged = ranged.order_by(sort_column.desc(), Product.id.desc())
+                else:
+                    ranged = ranged.order_by(sort_column.asc(), Product.id.asc())
+                rows = list((await db.execute(ranged.limit(limit + 1))).all())
 
-        result = await db.execute(query)
-        return result.scalars().all()
+            if len(rows) <= limit:
+                nulls = query.where(sort_column.is_(None))
+                if position and position["null"]:
+                    nulls = nulls.where(Product.id > position["id"])
+                nulls = nulls.order_by(Product.id.asc()).limit(limit + 1 - len(rows))
+                rows.extend((await db.execute(nulls)).all())
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]._mapping
+            value = last[sort_column.key] if sort_column is not None else None
+            next_cursor = encode_cursor(sort_by, value, last["id"])
+
+        return [{name: row._mapping[name] for name in fields} for row in rows], next_cursor
 
     @staticmethod
     async def check_products_exist(db: AsyncSession, category_id: int) -> bool:
-        query = select(func.count(Product.id)).where(Product.category_id == category_id)
+        query = select(exists().where(Product.category_id == category_id))
         result = await db.execute(query)
-        count = result.scalar() or 0
-        return count > 0
+        return bool(result.scalar())
+
+    @staticmethod
+    async def get_listing_hashes(db: AsyncSession, asins: list[str]) -> dict[str, str | None]:
+        """Stored listing hash per known ASIN."""
+        if not asins:
+            return {}
+        result = await db.execute(
+            select(Product.asin, Product.listing_hash).where(Product.asin.in_(asins))
+        )
+        return {asin: listing_hash for asin, listing_hash in result.all()}
+
+    @classmethod
+    def _prepare_rows(
+        cls, product_data: list[dict[str, Any]], category_id: int
+    ) -> list[dict[str, Any]]:
+        """Keep known columns only and collapse duplicate ASINs (last one wins)."""
+        columns = set(Product.__table__.columns.keys()) - {"id"}
+        rows: dict[str, dict[str, Any]] = {}
+        for item in product_data:
+            asin = item.get("asin")
+            if not asin:
+                continue
+            row = {key: value for key, value in item.items() if key in columns}
+            row["category_id"] = category_id
+            row["content_hash"] = compute_content_hash(row)
+            rows[asin] = row
+        return list(rows.values())
 
     @classmethod
     async def save_parsed_products(
         cls, db: AsyncSession, product_data: list[dict[str, Any]], category_id: int
-    ) -> int:
+    ) -> dict[str, int]:
+        """
+        Upsert parsed products keyed on the unique ASIN with
+        INSERT ... ON CONFLICT DO UPDATE, one statement per batch.
+        Rows whose content hash is unchanged are not rewritten.
+        Price/rank/rating/review changes of written rows are appended to
+        product_snapshots in the same transaction.
+        Returns inserted/updated/unchanged counts.
+        """
+        started = time.perf_counter()
         try:
-            processed_count = 0
-            for item in product_data:
-                asin = item.get("asin")
-                if not asin:
-                    continue
-
-                result = await db.execute(select(Product).where(Product.asin == asin))
-                existing_product = result.scalars().first()
-
-                if existing_product:
-                    logger.info(f"Updating data for ASIN: {asin}")
-                    for key, value in item.items():
-                        setattr(existing_product, key, value)
-                    existing_product.category_id = category_id
-                else:
-                    logger.info(f"✨ Creating new data for ASIN: {asin}")
-                    new_product = Product(**item, category_id=category_id)
-                    db.add(new_product)
-                
-                processed_count += 1
+            rows = cls._prepare_rows(product_data, category_id)
+            insert = dialect_insert(db)
+            inserted = 0
+            modified = 0
+            captured_at = datetime.now(timezone.utc)
+            snapshots: list[dict[str, Any]] = []
+
+            # Rows with different key sets can't share one VALUES clause
+            groups: dict[frozenset[str], list[dict[str, Any]]] = {}
+            for row in rows:
+                groups.setdefault(frozenset(row), []).append(row)
+
+            for keys, group in groups.items():
+                # Built once per key set so its compiled form is cached;
+                # executemany is sent as multi-row VALUES batches
+                stmt = insert(Product)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Product.asin],
+                    set_={key: stmt.excluded[key] for key in keys if key != "asin"},
+                    where=Product.content_hash.is_distinct_from(stmt.excluded.content_hash),
+                ).returning(Product.asin, Product.id)
+
+                for start in range(0, len(group), UPSERT_BATCH_SIZE):
+                    batch = group[start : start + UPSERT_BATCH_SIZE]
+                    asins = [row["asin"] for row in batch]
+
+                    # Previous tracked values, diffed into history snapshots
+                    existing = await db.execute(
+                        select(Product.asin, *TRACKED_COLUMNS).where(Product.asin.in_(asins))
+                    )
+                    previous = {row.asin: row for row in existing.all()}
+                    inserted += len(batch) - len(previous)
+
+                    # Skipped conflicts return no row
+                    result = await db.execute(stmt, batch)
+                    written: dict[str, int] = {
+                        asin: product_id for asin, product_id in result.all()
+                    }
+                    modified += len(written)
+                    snapshots.extend(build_snapshots(batch, written, previous, captured_at))
 
+            await record_snapshots(db, snapshots)
             await db.commit()
-            logger.info(f"Successfully processed {processed_count} products")
-            return processed_count
+            counts = {
+                "inserted": inserted,
+                "updated": modified - inserted,
+                "unchanged": len(rows) - modified,
+            }
+            record_upsert("products", time.perf_counter() - started, counts)
+            logger.info(
+                f"Successfully processed {len(rows)} products "
+                f"({counts['inserted']} inserted, {counts['updated']} updated, "
+                f"{counts['unchanged']} unchanged)"
+            )
+            return counts
 
         except Exception as e:
             logger.error(f"Error in processing products in db: {e}")
             await db.rollback()
-            raise
\ No newline at end of file
+            raise
@@ -0,0 +1,186 @@
+import random
+import time
+from collections import OrderedDict
+from typing import Any
+from urllib.parse import urlparse
+
+from app.config import settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Weight of the newest observation in the rolling (EWMA) health metrics
+HEALTH_ALPHA = 0.2
+MAX_STICKY_SESSIONS = 1000
+
+
+def parse_proxy_url(proxy_url: str) -> dict:
+    """Parse a proxy URL into Playwright-compatible format."""
+    parsed = urlparse(proxy_url)
+    if parsed.username and parsed.password:
+        return {
+            "server": f"{parsed.scheme}://{parsed.hostname}:{parsed.port}",
+            "username": parsed.username,
+            "password": parsed.password,
+        }
+    return {"server": proxy_url}
+
+
+def proxy_identity(config: dict) -> str:
+    """
+    Key of a proxy config: rotating or residential gateways often share one
+    host:port and differ only by username (session or country), so the
+    username is part of the identity. The password never is.
+    """
+    username = config.get("username")
+    return f"{username}@{config['server']}" if username else config["server"]
+
+
+class ProxyHealth:
+    """Rolling health metrics of a single proxy."""
+
+    def __init__(self, proxy_url: str):
+        self.config = parse_proxy_url(proxy_url)
+        self.server: str = self.config["server"]
+        self.identity = proxy_identity(self.config)
+        self.latency = 1.0
+        self.soft_block_rate = 0.0
+        self.captcha_rate = 0.0
+        self.failure_rate = 0.0
+        self.requests = 0
+        self.quarantined_until = 0.0
+        self.times_quarantined = 0
+
+    @property
+    def quarantined(self) -> bool:
+        return time.monotonic() < self.quarantined_until
+
+    @property
+    def score(self) -> float:
+        """Higher is better; used as the selection weight."""
+        penalty = (
+            (1 - self.soft_block_rate)
+            * (1 - self.captcha_rate) ** 2
+            * (1 - self.failure_rate)
+        )
+        return max(0.01, penalty / (1 + self.latency))
+
+    def observe(self, latency: float | None, soft_block: bool, captcha: bool, failed: bool) -> None:
+        self.requests += 1
+        if latency is not None:
+            self.latency += HEALTH_ALPHA * (latency - self.latency)
+        self.soft_block_rate += HEALTH_ALPHA * (float(soft_block) - self.soft_block_rate)
+        self.captcha_rate += HEALTH_ALPHA * (float(captcha) - self.captcha_rate)
+        self.failure_rate += HEALTH_ALPHA * (float(failed) - self.failure_rate)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "proxy": self.identity,
+            "server": self.server,
+            "score": round(self.score, 4),
+            "latency_seconds": round(self.latency, 3),
+            "soft_block_rate": round(self.soft_block_rate, 3),
+            "captcha_rate": round(self.captcha_rate, 3),
+            "failure_rate": round(self.failure_rate, 3),
+            "requests": self.requests,
+            "quarantined": self.quarantined,
+            "times_quarantined": self.times_quarantined,
+        }
+
+
+class ProxyPool:
+    """
+    Health-scored proxy pool with weighted selection, sticky sessions
+    and automatic quarantine of proxies that keep getting blocked.
+    """
+
+    def __init__(self, proxy_urls: list[str]):
+        self._proxies: dict[str, ProxyHealth] = {}
+        for proxy_url in proxy_urls:
+            proxy = ProxyHealth(proxy_url)
+            self._proxies[proxy.identity] = proxy
+        self._sticky: OrderedDict[str, str] = OrderedDict()
+
+    def __bool__(self) -> bool:
+        return bool(self._proxies)
+
+    def select(self, session_key: str | None = None) -> dict | None:
+        """
+        Pick a proxy config for a new browser context.
+        Contexts sharing `session_key` keep the same proxy while it is healthy,
+        so cookies and delivery location stay consistent.
+        """
+        if not self._proxies:
+            return None
+
+        if session_key is not None:
+            identity = self._sticky.get(session_key)
+            if identity and not self._proxies[identity].quarantined:
+                self._sticky.move_to_end(session_key)
+                return self._proxies[identity].config
+
+        healthy = [p for p in self._proxies.values() if not p.quarantined]
+        if healthy:
+            proxy = random.choices(healthy, weights=[p.score for p in healthy])[0]
+        else:
+            # Everything is quarantined: use the one released soonest
+            proxy = min(self._proxies.values(), key=lambda p: p.quarantined_until)
+
+        if session_key is not None:
+            self._sticky[session_key] = proxy.identity
+            if len(self._sticky) > MAX_STICKY_SESSIONS:
+                self._sticky.popitem(last=False)
+        return proxy.config
+
+    def report(
+        self,
+        identity: str | None,
+        latency: float | None = None,
+        soft_block: bool = False,
+        captcha: bool = False,
+        failed: bool = False,
+    ) -> None:
+        """Feed a page load outcome of the proxy with `identity` into its health."""
+        proxy = self._proxies.get(identity or "")
+        if proxy is None:
+            return
+
+        proxy.observe(latency, soft_block, captcha, failed)
+        if proxy.quarantined or proxy.requests < settings.PROXY_MIN_SAMPLES:
+            return
+
+        if (
+            proxy.captcha_rate >= settings.PROXY_QUARANTINE_CAPTCHA_RATE
+            or proxy.soft_block_rate >= settings.PROXY_QUARANTINE_BLOCK_RATE
+            or proxy.failure_rate >= settings.PROXY_QUARANTINE_FAILURE_RATE
+        ):
+            self._quarantine(proxy)
+
+    def _quarantine(self, proxy: ProxyHealth) -> None:
+        proxy.quarantined_until = time.monotonic() + settings.PROXY_QUARANTINE_SECONDS
+        proxy.times_quarantined += 1
+        # Start from a clean slate when the quarantine ends
+        proxy.soft_block_rate = proxy.captcha_rate = proxy.failure_rate = 0.0
+        proxy.requests = 0
+        logger.warning(
+            f"Proxy {proxy.identity} quarantined for {settings.PROXY_QUARANTINE_SECONDS}s"
+        )
+
+    def stats(self) -> list[dict[str, Any]]:
+        return [proxy.snapshot() for proxy in self._proxies.values()]
+
+
+def load_proxy_urls() -> list[str]:
+    """Proxies from PROXY_URL, comma-separated PROXY_URLS and PROXY_FILE (one per line)."""
+    urls: list[str] = []
+    if settings.PROXY_URL:
+        urls.append(settings.PROXY_URL)
+    if settings.PROXY_URLS:
+        urls.extend(url.strip() for url in settings.PROXY_URLS.split(","))
+    if settings.PROXY_FILE:
+        with open(settings.PROXY_FILE, encoding="utf-8") as f:
+            urls.extend(line.strip() for line in f if not line.startswith("#"))
+    return list(dict.fromkeys(url for url in urls if url))
+
+
+proxy_pool = ProxyPool(load_proxy_urls())
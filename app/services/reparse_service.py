@@ -0,0 +1,154 @@
+"""
+Re-run extraction over archived pages and re-ingest the results.
+
+Pages are decompressed and parsed in a spawned process pool (one process
+per core by default); only the small product dicts come back to the event
+loop, where they are saved through ProductService per category.
+"""
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from functools import partial
+from typing import Any
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.services.amazon_parser import (
+    build_bestseller_entries,
+    build_listing_data,
+    parse_product_html,
+)
+from app.services.history_service import get_category_id
+from app.services.html_archive import find_pages, load_html
+from app.services.html_extractor import extract_bestseller_items
+from app.services.product_service import ProductService
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Pages parsed before their products are written
+REPARSE_BATCH_SIZE = 500
+
+
+def reparse_page(
+    archive_dir: str, content_hash: str, page_type: str, url: str, rank: int | None
+) -> list[dict]:
+    """
+    Product data dicts extracted from one archived page: the detail page's
+    product, or the listing rows of a best-seller page. Runs in the pool.
+    """
+    html = load_html(content_hash, archive_dir)
+    if page_type == "product":
+        data = parse_product_html(html, url, rank or 0)
+        return [data] if data and data["asin"] else []
+
+    entries = build_bestseller_entries(extract_bestseller_items(html), (rank or 1) - 1)
+    return [data for data in map(build_listing_data, entries) if data]
+
+
+async def reparse_archive(
+    page_type: str | None = None,
+    category_url: str | None = None,
+    asin: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    latest_only: bool = True,
+    limit: int | None = None,
+    workers: int | None = None,
+) -> dict[str, Any]:
+    """
+    Re-extract archived pages matching the filters and upsert the products.
+    Best-seller pages are applied before detail pages, so detail data wins
+    for ASINs present in both. Changes are recorded in product history as
+    of now, like any other scrape.
+    Returns page, product and upsert counts.
+    """
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        pages = await find_pages(
+            db,
+            asin=asin,
+            page_type=page_type,
+            category_url=category_url,
+            since=since,
+            until=until,
+            latest_only=latest_only,
+            limit=limit,
+        )
+    # Stable sort keeps fetch order within each type
+    pages.sort(key=lambda page: page.page_type == "product")
+
+    stats = {
+        "pages": len(pages),
+        "failed_pages": 0,
+        "products": 0,
+        "skipped_products": 0,
+        "inserted": 0,
+        "updated": 0,
+        "unchanged": 0,
+    }
+    if not pages:
+        return {**stats, "seconds": 0.0}
+
+    workers = workers or os.cpu_count() or 1
+    logger.info(f"Re-parsing {len(pages)} archived pages on {workers} processes")
+    loop = asyncio.get_running_loop()
+    category_ids: dict[str, int | None] = {}
+
+    # spawn: forking a process with a running event loop and threads is unsafe
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for start in range(0, len(pages), REPARSE_BATCH_SIZE):
+            batch = pages[start : start + REPARSE_BATCH_SIZE]
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        pool,
+                        partial(
+                            reparse_page,
+                            settings.HTML_ARCHIVE_DIR,
+                            page.content_hash,
+                            page.page_type,
+                            page.url,
+                            page.rank,
+                        ),
+                    )
+                    for page in batch
+                ),
+                return_exceptions=True,
+            )
+
+            by_category: dict[str, list[dict]] = {}
+            for page, result in zip(batch, results):
+                if isinstance(result, BrokenProcessPool):
+                    # Every later page would fail the same way
+                    raise result
+                if isinstance(result, BaseException):
+                    logger.warning(f"Could not re-parse archived page {page.id} ({page.url}): {result}")
+                    stats["failed_pages"] += 1
+                    continue
+                if not page.category_url:
+                    stats["skipped_products"] += len(result)
+                    continue
+                by_category.setdefault(page.category_url, []).extend(result)
+
+            async with AsyncSessionLocal() as db:
+                for url, products in by_category.items():
+                    if url not in category_ids:
+                        category_ids[url] = await get_category_id(db, url)
+                    category_id = category_ids[url]
+                    if category_id is None:
+                        logger.warning(f"Category {url} no longer exists, skipping its products")
+                        stats["skipped_products"] += len(products)
+                        continue
+                    counts = await ProductService.save_parsed_products(db, products, category_id)
+                    stats["products"] += len(products)
+                    for key in ("inserted", "updated", "unchanged"):
+                        stats[key] += counts[key]
+
+    seconds = round(time.perf_counter() - started, 2)
+    logger.info(f"Re-parse finished in {seconds}s: {stats}")
+    return {**stats, "seconds": seconds}
@@ -0,0 +1,161 @@
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models import Category
+from app.services.amazon_parser import (
+    ProgressCallback,
+    parse_category_full,
+    parse_category_listing,
+    parse_product_pages,
+)
+from app.services.category_service import (
+    get_or_create_category,
+    mark_category_scraped,
+    normalize_category_url,
+)
+from app.services.lease_service import (
+    acquire_lease,
+    release_lease,
+    run_holding_lease,
+    wait_for_lease_release,
+)
+from app.services.product_service import ProductService, compute_listing_hash
+from app.utils.logger import setup_logger
+from app.utils.metrics import timed
+from app.utils.single_flight import SingleFlight
+
+logger = setup_logger(__name__)
+
+# Concurrent scrapes of the same category within this process share one run
+scrape_flights = SingleFlight()
+
+
+@timed("scrape_category")
+async def _scrape_and_store(
+    category_id: int,
+    category_url: str,
+    progress: ProgressCallback | None = None,
+    mode: str = "full",
+) -> dict | None:
+    if mode == "tiered":
+        return await _scrape_tiered(category_id, category_url, progress)
+
+    products_data = await parse_category_full(category_url, progress=progress, mode=mode)
+    if not products_data:
+        return None
+
+    async with AsyncSessionLocal() as db:
+        counts = await ProductService.save_parsed_products(db, products_data, category_id)
+        await mark_category_scraped(db, category_id)
+    return {"parsed": len(products_data), **counts}
+
+
+async def _scrape_tiered(
+    category_id: int, category_url: str, progress: ProgressCallback | None = None
+) -> dict | None:
+    """
+    Read the best-seller grid, then load detail pages only for ASINs whose
+    listing data differs from the stored listing hash. Unchanged products
+    are not rewritten. The hash is only stored once the detail page was
+    loaded, so rows written by listing mode or a re-parse still get their
+    details on the next tiered run.
+    """
+    listing = await parse_category_listing(category_url, progress=progress)
+    if not listing:
+        return None
+
+    hashes = {row["asin"]: compute_listing_hash(row) for row in listing}
+    async with AsyncSessionLocal() as db:
+        stored = await ProductService.get_listing_hashes(db, list(hashes))
+    changed = [row for row in listing if stored.get(row["asin"]) != hashes[row["asin"]]]
+
+    details: dict[str, dict] = {}
+    if changed:
+        logger.info(f"{len(changed)} of {len(listing)} listings changed in {category_url}")
+        entries = [{"rank": row["rank"], "url": row["url"]} for row in changed]
+        for data in await parse_product_pages(category_url, entries):
+            details[data["asin"]] = data
+
+    rows = []
+    for row in changed:
+        if row["asin"] in details:
+            rows.append({**details[row["asin"]], "listing_hash": hashes[row["asin"]]})
+        else:
+            # Detail page failed: keep the grid data, retry the details next time
+            rows.append(row)
+
+    async with AsyncSessionLocal() as db:
+        counts = await ProductService.save_parsed_products(db, rows, category_id)
+        await mark_category_scraped(db, category_id)
+    counts["unchanged"] += len(listing) - len(changed)
+    return {"parsed": len(listing), "detailed": len(details), **counts}
+
+
+async def _scrape_with_lease(
+    key: str,
+    category_id: int,
+    category_url: str,
+    progress: ProgressCallback | None = None,
+    mode: str = "full",
+) -> dict | None:
+    """
+    Cross-worker deduplication: only the lease holder scrapes, renewing the
+    lease until it is done.
+    """
+    if not await acquire_lease(key):
+        logger.info(f"Category {key} is being scraped by another worker, waiting...")
+        await wait_for_lease_release(key)
+
+        async with AsyncSessionLocal() as db:
+            if not await ProductService.check_products_exist(db, category_id):
+                return None
+        return {"parsed": 0, "inserted": 0, "updated": 0, "unchanged": 0, "shared": True}
+
+    try:
+        return await run_holding_lease(
+            key, lambda: _scrape_and_store(category_id, category_url, progress, mode)
+        )
+    finally:
+        await release_lease(key)
+
+
+async def scrape_category(
+    category: Category,
+    progress: ProgressCallback | None = None,
+    mode: str | None = None,
+) -> dict | None:
+    """
+    Scrape a category and store its products.
+    `mode` is "full", "listing" or "tiered" (defaults to settings.SCRAPE_MODE).
+    Concurrent calls for the same normalized URL and mode are coalesced, and
+    with SCRAPE_LOCK_MODE=lease also across worker processes. Only the caller
+    that starts the scrape receives `progress` events.
+    Returns the upsert counts plus the number of parsed products,
+    or None if Amazon returned nothing.
+    """
+    mode = mode or settings.SCRAPE_MODE
+    # Categories are stored under the normalized URL (get_or_create_category);
+    # normalizing again keeps rows created before that on the same key
+    category_url = normalize_category_url(category.url)
+    key = f"{category_url}|{mode}"
+    category_id = category.id
+
+    if settings.SCRAPE_LOCK_MODE == "lease":
+        return await scrape_flights.do(
+            key, lambda: _scrape_with_lease(key, category_id, category_url, progress, mode)
+        )
+    return await scrape_flights.do(
+        key, lambda: _scrape_and_store(category_id, category_url, progress, mode)
+    )
+
+
+async def refresh_category(category_url: str, mode: str | None = None) -> None:
+    """Background refresh of a stale category."""
+    logger.info(f"Refreshing stale category: {category_url}")
+    try:
+        async with AsyncSessionLocal() as db:
+            category = await get_or_create_category(db, category_url)
+        result = await scrape_category(category, mode=mode)
+        if result is None:
+            logger.warning(f"Background refresh returned no products: {category_url}")
+    except Exception as e:
+        logger.error(f"Background refresh failed for {category_url}: {e}")
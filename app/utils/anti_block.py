@@ -1,11 +1,18 @@
 import asyncio
 import random
 import logging
-from functools import wraps
-from playwright.async_api import Page
+from collections import defaultdict
+from typing import Awaitable, Callable, TypeVar
+from playwright.async_api import Error as PlaywrightError, Page
+
+from app.utils.circuit_breaker import circuit_breaker
+from app.utils.errors import BlockedError, CircuitOpenError, ParseMissError
+from app.utils.metrics import span, timed
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
@@ -14,6 +21,10 @@ USER_AGENTS = [
 ]
 
 
+# Delivery ZIP code used for US pricing and availability
+US_ZIP_CODE = "10001"
+
+
 def get_random_user_agent() -> str:
     return random.choice(USER_AGENTS)
 
@@ -21,31 +32,80 @@ def get_random_user_agent() -> str:
 async def random_delay(min_sec: float = 1.0, max_sec: float = 3.0) -> None:
     delay = random.uniform(min_sec, max_sec)
     logger.debug(f"Sleeping for {delay:.2f} seconds to mimic human behavior.")
-    await asyncio.sleep(delay)
-
-
-def retry_on_exception(retries: int = 3, base_delay: float = 2.0):
-    def decorator(func):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            for attempt in range(1, retries + 1):
-                try:
-                    return await func(*args, **kwargs)
-                except Exception as e:
-                    logger.warning(f"Attempt {attempt} failed with error: {e}")
-                    if attempt == retries:
-                        logger.error("Max retries reached. Raising exception.")
-                        raise
-
-                    jitter = random.uniform(-0.5, 0.5)
-                    sleep_time = max(0.0, base_delay * attempt + jitter)
-                    await asyncio.sleep(sleep_time)
-
-        return wrapper
-
-    return decorator
-
-
+    with span("random_delay"):
+        await asyncio.sleep(delay)
+
+
+def is_us_location(location_text: str | None) -> bool:
+    """Check the header's "Deliver to" text against the configured ZIP code."""
+    if not location_text:
+        return False
+    return US_ZIP_CODE in location_text or "New York" in location_text
+
+
+# Per error class: (retries, base backoff seconds). Blocks back off hardest.
+RETRY_POLICIES: dict[str, tuple[int, float]] = {
+    "timeout": (2, 1.0),
+    "block": (2, 10.0),
+    "parse_miss": (1, 2.0),
+}
+
+
+def classify_error(error: Exception) -> str | None:
+    """Map an exception to a retry class, or None if it should not be retried."""
+    if isinstance(error, BlockedError):
+        return "block"
+    if isinstance(error, ParseMissError):
+        return "parse_miss"
+    if isinstance(error, CircuitOpenError):
+        return None
+    # Playwright timeouts and net::ERR_* navigation failures
+    if isinstance(error, PlaywrightError):
+        return "timeout"
+    return None
+
+
+async def retry_classified(operation: Callable[[], Awaitable[T]], description: str) -> T:
+    """
+    Run a page-level operation inside a live context, retrying by error class
+    with that class's backoff. Every outcome feeds the circuit breaker, which
+    stops further attempts while the block rate is too high.
+    """
+    attempts: dict[str, int] = defaultdict(int)
+    while True:
+        trial = circuit_breaker.check()
+        try:
+            result = await operation()
+        except Exception as e:
+            circuit_breaker.record(blocked=isinstance(e, BlockedError))
+            error_class = classify_error(e)
+            if error_class is None:
+                raise
+
+            retries, base_delay = RETRY_POLICIES[error_class]
+            attempts[error_class] += 1
+            if attempts[error_class] > retries:
+                logger.error(f"{description}: giving up after {error_class} ({e})")
+                raise
+
+            backoff = base_delay * 2 ** (attempts[error_class] - 1)
+            sleep_time = backoff + random.uniform(0, base_delay / 2)
+            logger.warning(
+                f"{description}: {error_class} on attempt {attempts[error_class]}, "
+                f"retrying in {sleep_time:.1f}s ({e})"
+            )
+            await asyncio.sleep(sleep_time)
+        except BaseException:
+            # Cancelled: no outcome to record, but don't leave the breaker half-open
+            if trial:
+                circuit_breaker.release_trial()
+            raise
+        else:
+            circuit_breaker.record(blocked=False)
+            return result
+
+
+@timed("set_us_location")
 async def set_us_location(page: Page):
     try:
         logger.info("Change location to US...")
@@ -56,7 +116,7 @@ async def set_us_location(page: Page):
         if loc_btn:
             await loc_btn.click()
         await page.wait_for_selector("#GLUXZipUpdateInput", timeout=10000)
-        await page.fill("#GLUXZipUpdateInput", "10001")
+        await page.fill("#GLUXZipUpdateInput", US_ZIP_CODE)
         await page.wait_for_timeout(500)
 
         await page.keyboard.press("Enter")
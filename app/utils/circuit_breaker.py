@@ -0,0 +1,101 @@
+import time
+from collections import deque
+from typing import Any
+
+from app.config import settings
+from app.utils.errors import CircuitOpenError
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Opens when the block rate over the last CIRCUIT_BREAKER_WINDOW page loads
+    reaches CIRCUIT_BREAKER_BLOCK_RATE. After CIRCUIT_BREAKER_COOLDOWN_SECONDS
+    one trial request is let through: success closes it, a block reopens it.
+    """
+
+    def __init__(self) -> None:
+        self._outcomes: deque[bool] = deque(maxlen=settings.CIRCUIT_BREAKER_WINDOW)
+        self._opened_at: float | None = None
+        self._half_open = False
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._half_open or self._cooldown_left() <= 0:
+            return "half_open"
+        return "open"
+
+    def _cooldown_left(self) -> float:
+        if self._opened_at is None:
+            return 0.0
+        return settings.CIRCUIT_BREAKER_COOLDOWN_SECONDS - (time.monotonic() - self._opened_at)
+
+    def check(self) -> bool:
+        """
+        Raise CircuitOpenError unless a request may be sent now.
+        Returns True if the request is the half-open trial; its caller must
+        then record() the outcome or release_trial().
+        """
+        if self._opened_at is None:
+            return False
+        if self._half_open:
+            raise CircuitOpenError("Circuit half-open, trial request in flight")
+        cooldown_left = self._cooldown_left()
+        if cooldown_left > 0:
+            raise CircuitOpenError(f"Circuit open, retry in {cooldown_left:.0f}s")
+        self._half_open = True
+        return True
+
+    def release_trial(self) -> None:
+        """Free the trial slot of a request that ended without an outcome, e.g. cancelled."""
+        self._half_open = False
+
+    def record(self, blocked: bool) -> None:
+        if self._half_open:
+            self._half_open = False
+            if blocked:
+                self._open()
+            else:
+                logger.info("Circuit breaker closed after successful trial request")
+                self._opened_at = None
+                self._outcomes.clear()
+            return
+
+        self._outcomes.append(blocked)
+        if (
+            self._opened_at is None
+            and len(self._outcomes) >= settings.CIRCUIT_BREAKER_MIN_SAMPLES
+            and self.block_rate >= settings.CIRCUIT_BREAKER_BLOCK_RATE
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+        logger.error(
+            f"Circuit breaker opened (block rate {self.block_rate:.0%}), "
+            f"pausing for {settings.CIRCUIT_BREAKER_COOLDOWN_SECONDS}s"
+        )
+
+    @property
+    def block_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "block_rate": round(self.block_rate, 3),
+            "samples": len(self._outcomes),
+            "times_opened": self.times_opened,
+            "cooldown_left_seconds": max(0.0, round(self._cooldown_left(), 1)),
+        }
+
+
+circuit_breaker = CircuitBreaker()
@@ -0,0 +1,14 @@
+class ScrapeError(Exception):
+    """Base class for classified scraping failures."""
+
+
+class BlockedError(ScrapeError):
+    """Amazon served a CAPTCHA or another block page instead of content."""
+
+
+class ParseMissError(ScrapeError):
+    """The page loaded but an expected element was not found."""
+
+
+class CircuitOpenError(ScrapeError):
+    """Scraping is paused because the recent block rate is too high."""
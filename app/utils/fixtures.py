@@ -0,0 +1,161 @@
+"""
+Record and replay of Amazon documents for offline runs.
+
+FIXTURE_MODE=record saves every HTML document Amazon returns to a scraping
+context under FIXTURE_DIR, keyed by URL. FIXTURE_MODE=replay answers
+document requests to Amazon from the local stand-in server at
+FIXTURE_SERVER_URL (benchmarks/fixture_server.py), which serves recorded
+fixtures and synthesizes the rest; every other request is aborted, so a
+replayed scrape never leaves the machine.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+import uuid
+from urllib.parse import urldefrag, urlparse
+
+from playwright.async_api import BrowserContext, Response, Route
+
+from app.config import settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+FIXTURE_HOST = "amazon.com"
+# Sent to the stand-in server so it can look up the recorded page
+ORIGINAL_URL_HEADER = "X-Fixture-Url"
+
+# Pending record writes, referenced so they aren't garbage collected mid-flight
+_pending_writes: set[asyncio.Task] = set()
+
+
+def is_amazon_url(url: str) -> bool:
+    host = urlparse(url).hostname or ""
+    return host == FIXTURE_HOST or host.endswith(f".{FIXTURE_HOST}")
+
+
+def fixture_key(url: str) -> str:
+    return hashlib.sha1(urldefrag(url)[0].encode("utf-8")).hexdigest()
+
+
+def _fixture_path(url: str, fixture_dir: str | None = None) -> str:
+    return os.path.join(fixture_dir or settings.FIXTURE_DIR, f"{fixture_key(url)}.html")
+
+
+def save_fixture(url: str, html: str, fixture_dir: str | None = None) -> None:
+    path = _fixture_path(url, fixture_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    meta = {"url": url, "recorded_at": time.time(), "bytes": len(html)}
+    for target, content in ((path, html), (path[: -len(".html")] + ".json", json.dumps(meta))):
+        tmp_path = f"{target}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        # Atomic replace so the stand-in server never serves a partial page
+        os.replace(tmp_path, target)
+
+
+def load_fixture(url: str, fixture_dir: str | None = None) -> str | None:
+    try:
+        with open(_fixture_path(url, fixture_dir), encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+# ==================== RECORD ====================
+
+
+def _is_blocked_page(html: str) -> bool:
+    """CAPTCHA and soft-block interstitials are not worth replaying."""
+    return "validateCaptcha" in html or ">Continue shopping<" in html
+
+
+async def _record_response(response: Response) -> None:
+    request = response.request
+    if request.resource_type != "document" or response.status != 200:
+        return
+    if not is_amazon_url(response.url):
+        return
+    try:
+        html = await response.text()
+    except Exception as e:
+        # The body is gone once the page navigated away
+        logger.debug(f"Could not record {response.url}: {e}")
+        return
+    if _is_blocked_page(html):
+        return
+    await asyncio.to_thread(save_fixture, response.url, html)
+    logger.debug(f"Recorded fixture for {response.url}")
+
+
+def record_responses(context: BrowserContext) -> None:
+    """Save every Amazon document the context receives as a fixture."""
+
+    def on_response(response: Response) -> None:
+        task = asyncio.ensure_future(_record_response(response))
+        _pending_writes.add(task)
+        task.add_done_callback(_pending_writes.discard)
+
+    context.on("response", on_response)
+
+
+# ==================== REPLAY ====================
+
+
+def _fetch(url: str, headers: dict[str, str]) -> tuple[int, dict[str, str], bytes]:
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as e:
+        # 404s and 503 CAPTCHA pages are still pages to render
+        return e.code, dict(e.headers), e.read()
+
+
+async def install_replay_routes(context: BrowserContext) -> None:
+    """
+    Answer Amazon documents from the stand-in server and abort everything
+    else. Install before the blocking profile: routes registered later run
+    first, so blocked resources are still counted and the rest falls back here.
+    """
+    server = settings.FIXTURE_SERVER_URL.rstrip("/")
+
+    async def handle_route(route: Route) -> None:
+        request = route.request
+        if request.resource_type != "document" or not is_amazon_url(request.url):
+            await route.abort()
+            return
+
+        parsed = urlparse(request.url)
+        local_url = f"{server}{parsed.path or '/'}"
+        if parsed.query:
+            local_url += f"?{parsed.query}"
+        headers = {ORIGINAL_URL_HEADER: request.url}
+        cookie = await request.header_value("cookie")
+        if cookie:
+            headers["Cookie"] = cookie
+
+        try:
+            status, response_headers, body = await asyncio.to_thread(_fetch, local_url, headers)
+        except OSError as e:
+            logger.error(f"Fixture server unreachable at {server}: {e}")
+            await route.abort("connectionrefused")
+            return
+        await route.fulfill(
+            status=status,
+            content_type=response_headers.get("Content-Type", "text/html; charset=utf-8"),
+            body=body,
+        )
+
+    await context.route("**/*", handle_route)
+
+
+async def apply_fixture_mode(context: BrowserContext) -> None:
+    if settings.FIXTURE_MODE == "replay":
+        await install_replay_routes(context)
+    elif settings.FIXTURE_MODE == "record":
+        record_responses(context)
@@ -0,0 +1,125 @@
+"""
+Prometheus metrics and per-stage timing spans, served on GET /metrics.
+
+`span(stage)` times a block into scraper_stage_seconds{stage}. Label
+children are cached, so a span costs two perf_counter calls and one
+histogram observe and can stay on in production. With DEBUG logging each
+span is also logged. Under PROMETHEUS_MULTIPROC_DIR (worker.py processes)
+metrics are aggregated across processes.
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Coroutine, Iterator, ParamSpec, TypeVar
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import multiprocess
+from prometheus_client.core import GaugeMetricFamily
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+STAGE_SECONDS = Histogram(
+    "scraper_stage_seconds", "Wall time of scraping stages", ["stage"], buckets=STAGE_BUCKETS
+)
+PAGES_FETCHED = Counter(
+    "scraper_pages_fetched_total", "Page navigations by outcome (ok, captcha, error)", ["outcome"]
+)
+SOFT_BLOCKS = Counter("scraper_soft_blocks_total", "Soft blocks detected and bypassed")
+SELECTOR_MISSES = Counter(
+    "scraper_selector_misses_total", "Extracted fields that came back empty", ["page", "field"]
+)
+DB_UPSERT_SECONDS = Histogram(
+    "scraper_db_upsert_seconds", "Duration of upsert transactions", ["table"], buckets=STAGE_BUCKETS
+)
+DB_UPSERT_ROWS = Counter(
+    "scraper_db_upsert_rows_total", "Upserted rows by outcome", ["table", "result"]
+)
+
+_stage_children: dict[str, Any] = {}
+
+
+def observe(stage: str, seconds: float) -> None:
+    child = _stage_children.get(stage)
+    if child is None:
+        child = _stage_children[stage] = STAGE_SECONDS.labels(stage)
+    child.observe(seconds)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"span stage={stage} seconds={seconds:.4f}")
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - started)
+
+
+def timed(
+    stage: str,
+) -> Callable[[Callable[P, Coroutine[Any, Any, T]]], Callable[P, Coroutine[Any, Any, T]]]:
+    """Decorator form of span() for coroutine functions."""
+
+    def decorator(func: Callable[P, Coroutine[Any, Any, T]]) -> Callable[P, Coroutine[Any, Any, T]]:
+        @wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            with span(stage):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record_selector_misses(page: str, raw: dict[str, Any]) -> None:
+    """Count fields of a raw extraction dict that no selector filled."""
+    for field, value in raw.items():
+        if value is None or value == "" or value == []:
+            SELECTOR_MISSES.labels(page, field).inc()
+
+
+def record_upsert(table: str, seconds: float, counts: dict[str, int]) -> None:
+    """Duration and per-outcome row counts of a committed upsert."""
+    DB_UPSERT_SECONDS.labels(table).observe(seconds)
+    for result, count in counts.items():
+        if count:
+            DB_UPSERT_ROWS.labels(table, result).inc(count)
+
+
+class QueueDepthCollector:
+    """Parse jobs per status, refreshed from the database on each scrape."""
+
+    def __init__(self) -> None:
+        self.by_status: dict[str, int] = {}
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        gauge = GaugeMetricFamily(
+            "scraper_job_queue_depth", "Parse jobs per status", labels=["status"]
+        )
+        for status, count in sorted(self.by_status.items()):
+            gauge.add_metric([status], count)
+        yield gauge
+
+
+queue_depth = QueueDepthCollector()
+REGISTRY.register(queue_depth)
+
+
+def render_metrics() -> bytes:
+    """Text exposition of every metric, across processes in multiprocess mode."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(queue_depth)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
@@ -0,0 +1,88 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any
+
+from app.config import settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+        self.throttle_events: dict[str, int] = defaultdict(int)
+        self.requests = 0
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+
+class AdaptiveRateLimiter:
+    """
+    Token-bucket limiter per (proxy, host) with AIMD adaptation:
+    the rate grows additively while pages load cleanly and is cut
+    multiplicatively when Amazon pushes back (soft block, CAPTCHA, ...).
+    """
+
+    def __init__(self) -> None:
+        self._buckets: dict[tuple[str, str], TokenBucket] = {}
+
+    def _bucket(self, key: tuple[str, str]) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(settings.RATE_LIMIT_INITIAL_RPS, settings.RATE_LIMIT_BURST)
+            self._buckets[key] = bucket
+        return bucket
+
+    async def acquire(self, key: tuple[str, str]) -> None:
+        """Wait until a request to `key` is allowed."""
+        bucket = self._bucket(key)
+        async with bucket.lock:
+            bucket.refill()
+            if bucket.tokens < 1:
+                wait = (1 - bucket.tokens) / bucket.rate
+                logger.debug(f"Rate limiting {key}: waiting {wait:.2f}s")
+                await asyncio.sleep(wait)
+                bucket.refill()
+            bucket.tokens -= 1
+            bucket.requests += 1
+
+    def on_success(self, key: tuple[str, str]) -> None:
+        bucket = self._bucket(key)
+        bucket.rate = min(
+            settings.RATE_LIMIT_MAX_RPS, bucket.rate + settings.RATE_LIMIT_INCREASE_RPS
+        )
+
+    def on_throttle(self, key: tuple[str, str], reason: str) -> None:
+        bucket = self._bucket(key)
+        bucket.refill()
+        bucket.rate = max(
+            settings.RATE_LIMIT_MIN_RPS, bucket.rate * settings.RATE_LIMIT_DECREASE_FACTOR
+        )
+        # Drain the bucket so the next request pays the new, slower rate
+        bucket.tokens = min(bucket.tokens, 0.0)
+        bucket.throttle_events[reason] += 1
+        logger.warning(f"Throttled by {key[1]} via {key[0]} ({reason}), rate now {bucket.rate:.2f} rps")
+
+    def stats(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "proxy": proxy,
+                "host": host,
+                "rate_rps": round(bucket.rate, 3),
+                "requests": bucket.requests,
+                "throttle_events": dict(bucket.throttle_events),
+            }
+            for (proxy, host), bucket in self._buckets.items()
+        ]
+
+
+rate_limiter = AdaptiveRateLimiter()
@@ -0,0 +1,143 @@
+from collections import defaultdict
+from typing import Any
+from urllib.parse import urlparse
+
+from playwright.async_api import BrowserContext, Page, Request, Response, Route
+
+from app.config import settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class BlockingProfile:
+    """Which requests a scraping context aborts instead of downloading."""
+
+    def __init__(self, name: str, resource_types: set[str], blocked_hosts: set[str]):
+        self.name = name
+        self.resource_types = resource_types
+        self.blocked_hosts = blocked_hosts
+
+    @property
+    def active(self) -> bool:
+        return bool(self.resource_types or self.blocked_hosts)
+
+    def should_block(self, request: Request) -> bool:
+        if request.resource_type in self.resource_types:
+            return True
+        host = urlparse(request.url).hostname or ""
+        return any(host == h or host.endswith(f".{h}") for h in self.blocked_hosts)
+
+
+# Ads, telemetry and third-party trackers seen on Amazon pages
+THIRD_PARTY_DENYLIST = {
+    "amazon-adsystem.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "facebook.net",
+    "fls-na.amazon.com",
+    "unagi.amazon.com",
+    "unagi-na.amazon.com",
+    "dtm.amazon.com",
+}
+
+PROFILES: dict[str, BlockingProfile] = {
+    "none": BlockingProfile("none", set(), set()),
+    "ads": BlockingProfile("ads", set(), THIRD_PARTY_DENYLIST),
+    "scraping": BlockingProfile(
+        "scraping",
+        {"image", "media", "font", "stylesheet"},
+        THIRD_PARTY_DENYLIST,
+    ),
+}
+
+# Fallback per-type sizes until real responses of that type have been observed
+DEFAULT_RESOURCE_SIZES = {
+    "image": 40_000,
+    "media": 500_000,
+    "font": 60_000,
+    "stylesheet": 50_000,
+    "script": 80_000,
+}
+
+
+class ResourceBlockingStats:
+    """
+    Counters for blocked requests and downloaded bytes.
+    Bytes saved are estimated from the average size of responses of the
+    same resource type observed in contexts that did not block it.
+    """
+
+    def __init__(self) -> None:
+        self.requests_allowed = 0
+        self.requests_blocked: dict[str, int] = defaultdict(int)
+        self.bytes_received = 0
+        self._observed_bytes: dict[str, int] = defaultdict(int)
+        self._observed_count: dict[str, int] = defaultdict(int)
+
+    def record_blocked(self, request: Request) -> None:
+        self.requests_blocked[request.resource_type] += 1
+
+    def record_response(self, response: Response) -> None:
+        self.requests_allowed += 1
+        size = response.headers.get("content-length")
+        if size and size.isdigit():
+            resource_type = response.request.resource_type
+            self.bytes_received += int(size)
+            self._observed_bytes[resource_type] += int(size)
+            self._observed_count[resource_type] += 1
+
+    def average_size(self, resource_type: str) -> int:
+        count = self._observed_count.get(resource_type)
+        if count:
+            return self._observed_bytes[resource_type] // count
+        return DEFAULT_RESOURCE_SIZES.get(resource_type, 20_000)
+
+    def snapshot(self) -> dict[str, Any]:
+        bytes_saved = sum(
+            count * self.average_size(resource_type)
+            for resource_type, count in self.requests_blocked.items()
+        )
+        return {
+            "requests_allowed": self.requests_allowed,
+            "requests_blocked": sum(self.requests_blocked.values()),
+            "requests_blocked_by_type": dict(self.requests_blocked),
+            "bytes_received": self.bytes_received,
+            "bytes_saved_estimated": bytes_saved,
+        }
+
+
+resource_blocking_stats = ResourceBlockingStats()
+
+
+def get_profile(name: str) -> BlockingProfile:
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown resource blocking profile '{name}'") from None
+
+
+async def apply_blocking_profile(target: BrowserContext | Page, profile_name: str) -> None:
+    """
+    Install request interception for `profile_name` on a context or page.
+    A page-level route takes precedence over the context's, so applying
+    "none" to a page gives it full rendering inside a blocking context.
+    """
+    profile = get_profile(profile_name)
+    if not profile.active and isinstance(target, BrowserContext):
+        return
+
+    async def handle_route(route: Route) -> None:
+        if profile.should_block(route.request):
+            resource_blocking_stats.record_blocked(route.request)
+            await route.abort()
+        elif settings.FIXTURE_MODE == "replay":
+            # The replay route, registered earlier, serves it from fixtures
+            await route.fallback()
+        else:
+            await route.continue_()
+
+    await target.route("**/*", handle_route)
+    logger.debug(f"Applied resource blocking profile '{profile.name}'")
@@ -2,16 +2,19 @@ import logging
 import asyncio
 from app.services.amazon_parser import parse_categories_page, get_browser_context
 from app.db.session import AsyncSessionLocal
-from app.services.category_service import get_or_create_category
+from app.services.category_crawler import BESTSELLERS_URL
+from app.services.category_service import upsert_categories
+from app.services.job_service import JOB_KIND_SYNC_CATEGORIES, create_job
 
 logger = logging.getLogger(__name__)
 
-async def sync_amazon_categories():
+async def sync_amazon_categories() -> dict[str, int] | None:
     """
     Фоновая задача: собирает только корневые категории с главной страницы Best Sellers.
+    Возвращает счётчики upsert или None, если синхронизация не удалась.
     """
     logger.info("Запуск ежедневной синхронизации КОРНЕВЫХ категорий Amazon...")
-    main_url = "https://www.amazon.com/gp/bestsellers"
+    main_url = BESTSELLERS_URL
     
     try:
         async with get_browser_context() as context:
@@ -22,20 +25,33 @@ async def sync_amazon_categories():
             
             if not roots:
                 logger.error("Не удалось получить корневые категории. Проверь селекторы или капчу.")
-                return
+                return None
             
             logger.info(f"Найдено {len(roots)} корневых категорий. Начинаем сохранение...")
             
-            # ШАГ 2: Сразу сохраняем в базу (без проваливания внутрь)
+            # ШАГ 2: Сразу сохраняем в базу одной транзакцией (без проваливания внутрь)
             async with AsyncSessionLocal() as db:
-                for cat in roots:
-                    await get_or_create_category(
-                        db=db,
-                        category_url=cat['url'],
-                        category_name=cat['name']
-                    )
-            
-            logger.info(f"Синхронизация успешно завершена. Сохранено {len(roots)} категорий.")
+                counts = await upsert_categories(
+                    db, [{**cat, "depth": 1} for cat in roots]
+                )
+
+            logger.info(
+                f"Синхронизация успешно завершена. Сохранено {len(roots)} категорий: "
+                f"новых {counts['created']}, переименовано {counts['renamed']}, "
+                f"без изменений {counts['unchanged']}."
+            )
+            return counts
 
     except Exception as e:
-        logger.error(f"Критическая ошибка в планировщике категорий: {e}", exc_info=True)
\ No newline at end of file
+        logger.error(f"Критическая ошибка в планировщике категорий: {e}", exc_info=True)
+        return None
+
+
+async def enqueue_category_sync() -> None:
+    """
+    Режим JOB_EXECUTION_MODE=worker: API не запускает браузер,
+    синхронизацию выполнит процесс worker.py.
+    """
+    async with AsyncSessionLocal() as db:
+        job = await create_job(db, BESTSELLERS_URL, kind=JOB_KIND_SYNC_CATEGORIES)
+    logger.info(f"Синхронизация категорий поставлена в очередь: задача {job.id}")
\ No newline at end of file
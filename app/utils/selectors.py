@@ -26,3 +26,24 @@ class AmazonSelectors:
     BULLET_POINTS = ["#feature-bullets ul li span.a-list-item"]
 
     MAIN_IMAGE = ["#landingImage", "#imgBlkFront"]
+
+    CATEGORY_SIDEBAR = "#zg_left_col1, #zg_left_col2, #zg-left-col"
+
+    # Best-seller list entries (current grid layout and the older list layout)
+    BESTSELLER_ITEM = "#gridItemRoot, li.zg-item-immersion"
+    BESTSELLER_RANK = ".zg-bdg-text, .zg-badge-text"
+    BESTSELLER_LINK = "a[href*='/dp/']"
+    BESTSELLER_ASIN = "[data-asin]"
+    BESTSELLER_TITLE = [
+        "._cDEzb_p13n-sc-css-line-clamp-3_g3dy1",
+        ".p13n-sc-truncate-desktop-type2",
+        ".p13n-sc-truncated",
+    ]
+    BESTSELLER_PRICE = ["._cDEzb_p13n-sc-price_3mJ9Z", ".p13n-sc-price", "span.a-color-price"]
+    BESTSELLER_RATING = [".a-icon-star-small .a-icon-alt", ".a-icon-star .a-icon-alt"]
+    BESTSELLER_REVIEWS = [".a-icon-row .a-size-small"]
+    BESTSELLER_IMAGE = "img"
+
+    DELIVERY_LOCATION = "#glow-ingress-line2"
+
+    CAPTCHA = "form[action*='validateCaptcha']"
@@ -0,0 +1,27 @@
+import asyncio
+from typing import Any, Callable, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls sharing a key into one in-flight task.
+    Callers that arrive while the task runs await the same result.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[str, asyncio.Task[Any]] = {}
+
+    async def do(self, key: str, fn: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _task: self._tasks.pop(key, None))
+
+        # Shield so one cancelled caller doesn't cancel the shared work
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> list[str]:
+        return list(self._tasks)
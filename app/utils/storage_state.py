@@ -0,0 +1,67 @@
+import hashlib
+import json
+import os
+import time
+import uuid
+
+from playwright.async_api import StorageState
+
+from app.config import settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def storage_state_key(proxy: str | None, user_agent: str) -> str:
+    """Cookies are only valid for the exit IP and browser fingerprint that created them."""
+    raw = f"{proxy or 'direct'}|{user_agent}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _state_path(key: str) -> str:
+    return os.path.join(settings.STORAGE_STATE_DIR, f"{key}.json")
+
+
+def load_storage_state(key: str) -> StorageState | None:
+    """Return the cached storage_state for `key`, or None if missing or expired."""
+    path = _state_path(key)
+    try:
+        age = time.time() - os.path.getmtime(path)
+        if age > settings.STORAGE_STATE_TTL_SECONDS:
+            logger.info(f"Storage state {key[:8]} expired ({age:.0f}s old)")
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read storage state {path}: {e}")
+        return None
+
+
+def save_storage_state(key: str, state: StorageState) -> None:
+    """Cache `state` under `key`. Best effort: a failed write only logs."""
+    path = _state_path(key)
+    # Unique temp name: contexts sharing a key may save at the same time
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.makedirs(settings.STORAGE_STATE_DIR, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        # Atomic replace so concurrent readers never see a partial file
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not save storage state {path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return
+    logger.info(f"Saved storage state {key[:8]}")
+
+
+def invalidate_storage_state(key: str) -> None:
+    try:
+        os.remove(_state_path(key))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,92 @@
+"""
+Time browser-free HTML extraction, inline and across a process pool.
+
+Usage:
+    python -m benchmarks.bench_extraction --pages 200 --workers 1 2 4
+    python -m benchmarks.bench_extraction --html-file saved_product_page.html
+"""
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from app.services.amazon_parser import parse_categories_html, parse_product_html
+from app.services.html_extractor import extract_bestseller_items
+from benchmarks.sample_pages import bestseller_page_html, product_page_html
+
+PRODUCT_URL = "https://www.amazon.com/sample/dp/{asin}"
+
+
+def parse_one(html: str, index: int) -> bool:
+    data = parse_product_html(html, PRODUCT_URL.format(asin=f"B{index:09d}"), index + 1)
+    return data is not None
+
+
+def time_inline(pages: list[str]) -> list[float]:
+    timings = []
+    for index, html in enumerate(pages):
+        started = time.perf_counter()
+        parse_one(html, index)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def time_pool(pages: list[str], workers: int) -> float:
+    """Wall time to parse every page on `workers` spawned processes."""
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        # Warm the workers so process start-up and imports aren't timed
+        await asyncio.gather(*(loop.run_in_executor(pool, partial(parse_one, pages[0], 0)) for _ in range(workers)))
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(loop.run_in_executor(pool, partial(parse_one, html, index)) for index, html in enumerate(pages))
+        )
+        return time.perf_counter() - started
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def main(pages_count: int, page_bytes: int, workers: list[int], html_file: str | None) -> None:
+    if html_file:
+        with open(html_file, encoding="utf-8") as handle:
+            pages = [handle.read()] * pages_count
+    else:
+        pages = [
+            product_page_html(f"B{index:09d}", title=f"Product {index}", target_bytes=page_bytes, seed=index)
+            for index in range(pages_count)
+        ]
+    size_kb = statistics.mean(len(page) for page in pages) / 1024
+    print(f"{len(pages)} product pages, {size_kb:.0f} KB average")
+
+    timings = time_inline(pages)
+    print(
+        f"{'inline':>10}: {len(pages) / sum(timings):>7.1f} pages/s  "
+        f"p50 {percentile(timings, 50) * 1000:.1f} ms  p95 {percentile(timings, 95) * 1000:.1f} ms"
+    )
+    for count in workers:
+        elapsed = await time_pool(pages, count)
+        print(f"{f'{count} procs':>10}: {len(pages) / elapsed:>7.1f} pages/s")
+
+    listing = bestseller_page_html()
+    started = time.perf_counter()
+    for _ in range(20):
+        extract_bestseller_items(listing)
+        parse_categories_html(listing)
+    print(f"best-seller page (grid + sidebar): {(time.perf_counter() - started) / 20 * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--page-bytes", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--html-file", default=None, help="Saved product page to parse repeatedly")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.pages, args.page_bytes, args.workers, args.html_file))
@@ -0,0 +1,165 @@
+"""
+Time GET / product listing queries against a synthetic products table.
+
+Usage:
+    python -m benchmarks.bench_products --products 1000000
+    python -m benchmarks.bench_products --database-url sqlite+aiosqlite:///./bench.sqlite3
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Any
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.models import Category, Product
+from app.services.product_service import ProductService
+
+SEED_BATCH_SIZE = 10_000
+LIGHT_FIELDS = ["asin", "title", "price", "rating", "main_image_url"]
+
+
+async def seed(session_factory, products: int, categories: int) -> None:
+    """Fill the tables with `products` rows spread over `categories` categories."""
+    rng = random.Random(42)
+    async with session_factory() as db:
+        await db.execute(
+            insert(Category),
+            [
+                {"id": index + 1, "name": f"Category {index}", "url": f"https://www.amazon.com/zgbs/c{index}"}
+                for index in range(categories)
+            ],
+        )
+        for start in range(0, products, SEED_BATCH_SIZE):
+            rows = []
+            for index in range(start, min(start + SEED_BATCH_SIZE, products)):
+                rows.append(
+                    {
+                        "asin": f"B{index:09d}",
+                        "title": f"Benchmark product {index} with a realistic length title",
+                        "rank": index % 100 + 1,
+                        "price": round(rng.uniform(5, 500), 2) if rng.random() > 0.05 else None,
+                        "currency": "USD",
+                        "rating": round(rng.uniform(1, 5), 1) if rng.random() > 0.1 else None,
+                        "reviews_count": rng.randint(0, 100000),
+                        "is_prime": rng.random() > 0.5,
+                        "bullet_points": [f"Feature {n} of product {index}, " * 4 for n in range(5)],
+                        "main_image_url": f"https://m.media-amazon.com/images/I/{index}.jpg",
+                        "category_id": index % categories + 1,
+                    }
+                )
+            await db.execute(insert(Product), rows)
+            await db.commit()
+
+
+async def legacy_list(db: AsyncSession, category_url: str, sort_by: str | None) -> list[Product]:
+    """The pre-pagination implementation: every matching ORM row, no limit."""
+    query = select(Product).join(Category).where(Category.url == category_url)
+    if sort_by == "price":
+        query = query.order_by(Product.price.asc())
+    elif sort_by == "rating":
+        query = query.order_by(Product.rating.desc())
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+
+async def time_pages(
+    session_factory, params: dict[str, Any], pages: int, limit: int, fields: list[str] | None
+) -> tuple[float, float, int]:
+    """Median first-page time, median time of the following pages, JSON bytes per page."""
+    first_times: list[float] = []
+    for _ in range(5):
+        async with session_factory() as db:
+            started = time.perf_counter()
+            rows, cursor = await ProductService.get_products_page(db, **params, limit=limit, fields=fields)
+            first_times.append(time.perf_counter() - started)
+    payload = len(json.dumps(rows, default=str))
+
+    deep_times: list[float] = []
+    async with session_factory() as db:
+        for _ in range(pages):
+            if not cursor:
+                break
+            started = time.perf_counter()
+            rows, cursor = await ProductService.get_products_page(
+                db, **params, limit=limit, cursor=cursor, fields=fields
+            )
+            deep_times.append(time.perf_counter() - started)
+
+    return (
+        statistics.median(first_times),
+        statistics.median(deep_times) if deep_times else 0.0,
+        payload,
+    )
+
+
+async def main(database_url: str, products: int, categories: int, pages: int, limit: int) -> None:
+    engine = create_async_engine(database_url, echo=False)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_factory() as db:
+        existing = (await db.execute(select(func.count()).select_from(Product))).scalar_one()
+    if existing != products:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        started = time.perf_counter()
+        await seed(session_factory, products, categories)
+        print(f"Seeded {products} products in {time.perf_counter() - started:.1f}s")
+
+    category_url = "https://www.amazon.com/zgbs/c7"
+    cases: list[tuple[str, dict[str, Any]]] = [
+        ("all, by id", {}),
+        ("all, price asc", {"sort_by": "price"}),
+        ("all, price desc", {"sort_by": "-price"}),
+        ("all, rating desc", {"sort_by": "rating"}),
+        ("category, price asc", {"category_url": category_url, "sort_by": "price"}),
+        ("category, rating desc", {"category_url": category_url, "sort_by": "rating"}),
+        ("max_price=50, price desc", {"max_price": 50.0, "sort_by": "-price"}),
+        ("min_rating=4.5, rating", {"min_rating": 4.5, "sort_by": "rating"}),
+    ]
+
+    print(
+        f"{'case':>26} {'fields':>7} {'first ms':>9} {'next ms':>9} {'bytes/page':>11}"
+    )
+    for name, params in cases:
+        for label, fields in (("all", None), ("light", LIGHT_FIELDS)):
+            first, deep, payload = await time_pages(session_factory, params, pages, limit, fields)
+            print(
+                f"{name:>26} {label:>7} {first * 1000:>9.2f} {deep * 1000:>9.2f} {payload:>11}"
+            )
+
+    for sort_by in ("price", "rating"):
+        async with session_factory() as db:
+            started = time.perf_counter()
+            rows = await legacy_list(db, category_url, sort_by)
+            elapsed = time.perf_counter() - started
+        print(f"legacy full load, category by {sort_by}: {len(rows)} rows in {elapsed * 1000:.1f} ms")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--categories", type=int, default=500)
+    parser.add_argument("--pages", type=int, default=20, help="Pages to follow after the first")
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    url = args.database_url
+    if url is None:
+        path = os.path.join(tempfile.mkdtemp(), "bench_products.sqlite3")
+        url = f"sqlite+aiosqlite:///{path}"
+
+    asyncio.run(main(url, args.products, args.categories, args.pages, args.limit))
@@ -0,0 +1,395 @@
+"""
+End-to-end scraping benchmark against the local Amazon stand-in.
+
+Runs sync_amazon_categories and then scrape_category (parse_category_full
+plus the DB write) for N categories through real Chromium, with
+FIXTURE_MODE=replay. It reports:
+- throughput, per-product latency percentiles and time per stage;
+- peak RSS of this process and of Chromium;
+- all of it as JSON that a later run can be compared against.
+
+Usage:
+    python -m benchmarks.bench_scrape --categories 10 --top-n 20 --output bench.json
+    python -m benchmarks.bench_scrape --baseline bench.json --max-regression 0.1
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from functools import wraps
+from typing import Any, Callable
+
+# Compared against --baseline; True when higher is better
+REGRESSION_METRICS: dict[str, bool] = {
+    "throughput.categories_per_min": True,
+    "throughput.products_per_min": True,
+    "latency_ms.product.p95": False,
+    "latency_ms.extract.p95": False,
+    "stages.db_write.p95_ms": False,
+}
+
+
+class StageTimer:
+    """Collects wall-clock durations of wrapped coroutine functions by stage."""
+
+    def __init__(self) -> None:
+        self.durations: dict[str, list[float]] = defaultdict(list)
+
+    def wrap(self, owner: Any, name: str, stage: str) -> None:
+        original: Callable[..., Any] = getattr(owner, name)
+        durations = self.durations[stage]
+
+        @wraps(original)
+        async def timed(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return await original(*args, **kwargs)
+            finally:
+                durations.append(time.perf_counter() - started)
+
+        setattr(owner, name, timed)
+
+    def summary(self, percentile: Callable[[list[float], float], float]) -> dict[str, dict[str, float]]:
+        return {
+            stage: {
+                "count": len(values),
+                "total_s": round(sum(values), 3),
+                "mean_ms": round(sum(values) / len(values) * 1000, 2),
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+            }
+            for stage, values in self.durations.items()
+            if values
+        }
+
+
+class ProcessTreeSampler:
+    """
+    Peak RSS of Chromium and the Playwright driver, summed over all
+    processes descending from this one (Linux /proc; shared pages are
+    counted once per process).
+    """
+
+    def __init__(self, interval: float = 0.25) -> None:
+        self.interval = interval
+        self.peaks = {"chromium": 0, "driver": 0}
+        self.supported = os.path.isdir("/proc/self")
+        self._task: asyncio.Task | None = None
+
+    @staticmethod
+    def _descendants(root: int) -> list[int]:
+        children: dict[int, list[int]] = defaultdict(list)
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    # comm may contain spaces; the fields after it are fixed
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children[ppid].append(int(entry))
+        found, stack = [], [root]
+        while stack:
+            for child in children.get(stack.pop(), []):
+                found.append(child)
+                stack.append(child)
+        return found
+
+    @staticmethod
+    def _rss_kb(pid: int) -> tuple[str, int]:
+        name, rss = "", 0
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("Name:"):
+                        name = line.split()[1]
+                    elif line.startswith("VmRSS:"):
+                        rss = int(line.split()[1])
+        except OSError:
+            pass
+        return name, rss
+
+    def sample(self) -> None:
+        totals = {"chromium": 0, "driver": 0}
+        for pid in self._descendants(os.getpid()):
+            name, rss = self._rss_kb(pid)
+            if "chrom" in name or "headless" in name:
+                totals["chromium"] += rss
+            else:
+                totals["driver"] += rss
+        for key, value in totals.items():
+            self.peaks[key] = max(self.peaks[key], value)
+
+    async def _run(self) -> None:
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self.supported:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+def python_peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def configure_environment(args: argparse.Namespace, port: int) -> None:
+    """Settings are read at import time, so this runs before any app import."""
+    workdir = tempfile.mkdtemp(prefix="bench_scrape_")
+    os.environ.update(
+        {
+            "FIXTURE_MODE": "replay",
+            "FIXTURE_SERVER_URL": f"http://127.0.0.1:{port}",
+            "DATABASE_URL": args.database_url or f"sqlite+aiosqlite:///{workdir}/bench.sqlite3",
+            "STORAGE_STATE_DIR": os.path.join(workdir, "storage_state"),
+            "HTML_ARCHIVE_DIR": os.path.join(workdir, "archive"),
+            "SCRAPE_MODE": args.mode,
+            "EXTRACTION_MODE": args.extraction_mode,
+            "TOP_N_PRODUCTS": str(args.top_n),
+            "BROWSER_POOL_SIZE": str(args.browsers),
+            "LOG_LEVEL": "WARNING",
+        }
+    )
+
+
+def seed_storage_states() -> None:
+    """
+    Cache an empty US-location session for every user agent, so runs don't
+    include the one-off location popover flow (see --cold-location).
+    """
+    from app.utils.anti_block import USER_AGENTS
+    from app.utils.storage_state import save_storage_state, storage_state_key
+
+    for user_agent in USER_AGENTS:
+        save_storage_state(storage_state_key("replay", user_agent), {"cookies": [], "origins": []})
+
+
+def instrument(timer: StageTimer) -> None:
+    from playwright.async_api import Page
+
+    from app.services import amazon_parser
+    from app.services.browser_pool import browser_pool
+    from app.services.product_service import ProductService
+
+    timer.wrap(browser_pool, "_launch", "launch")
+    timer.wrap(Page, "goto", "goto")
+    timer.wrap(amazon_parser, "bypass_soft_block", "soft_block_check")
+    timer.wrap(amazon_parser, "is_captcha_page", "soft_block_check")
+    timer.wrap(amazon_parser, "ensure_us_location", "us_location")
+    timer.wrap(amazon_parser, "scroll_until_loaded", "listing_scroll")
+    timer.wrap(amazon_parser, "extract_bestseller_entries", "listing_extract")
+    for name in ("extract_raw_fields_bulk", "extract_raw_fields_html", "extract_raw_fields_handles"):
+        timer.wrap(amazon_parser, name, "extract")
+    timer.wrap(amazon_parser, "parse_product_page", "product")
+    timer.wrap(ProductService, "save_parsed_products", "db_write")
+
+
+def latency_summary(values: list[float], percentile: Callable[[list[float], float], float]) -> dict[str, float]:
+    if not values:
+        return {}
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values) * 1000, 2),
+        "p50": round(percentile(values, 50) * 1000, 2),
+        "p95": round(percentile(values, 95) * 1000, 2),
+        "p99": round(percentile(values, 99) * 1000, 2),
+    }
+
+
+async def run(args: argparse.Namespace, port: int) -> dict[str, Any]:
+    from sqlalchemy import select
+
+    from app.db.base import Base
+    from app.db.session import AsyncSessionLocal, engine
+    from app.models import Category
+    from app.services.browser_pool import browser_pool
+    from app.services.html_extractor import shutdown_pool
+    from app.services.scrape_service import scrape_category
+    from app.utils.scheduler import sync_amazon_categories
+    from benchmarks.bench_extraction import percentile
+    from benchmarks.fixture_server import ROOT_CATEGORIES, start_server
+
+    server = start_server(
+        port=port,
+        fixture_dir=args.fixture_dir,
+        root_categories=min(args.categories, len(ROOT_CATEGORIES)),
+        product_bytes=args.product_bytes,
+        soft_block_rate=args.soft_block_rate,
+        latency_ms=args.latency_ms,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    if not args.cold_location:
+        seed_storage_states()
+
+    timer = StageTimer()
+    instrument(timer)
+    sampler = ProcessTreeSampler()
+    sampler.start()
+    await browser_pool.start()
+    try:
+        started = time.perf_counter()
+        await sync_amazon_categories()
+        sync_seconds = time.perf_counter() - started
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(Category).where(Category.depth == 1).order_by(Category.id))
+            categories = list(result.scalars().all())[: args.categories]
+        if not categories:
+            raise RuntimeError("sync_amazon_categories stored no categories; is Chromium installed?")
+
+        limit = asyncio.Semaphore(args.concurrency)
+        outcomes: list[dict | None] = []
+
+        async def scrape(category: Category) -> None:
+            async with limit:
+                try:
+                    outcomes.append(await scrape_category(category, mode=args.mode))
+                except Exception as e:
+                    print(f"{category.url}: {e}", file=sys.stderr)
+                    outcomes.append(None)
+
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            await asyncio.gather(*(scrape(category) for category in categories))
+        wall = time.perf_counter() - started
+    finally:
+        sampler.sample()
+        await sampler.stop()
+        await browser_pool.stop()
+        shutdown_pool()
+        await engine.dispose()
+        server.shutdown()
+
+    done = [outcome for outcome in outcomes if outcome]
+    products = sum(outcome["parsed"] for outcome in done)
+    durations = timer.durations
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+        "sync": {"seconds": round(sync_seconds, 3), "categories": len(categories)},
+        "throughput": {
+            "categories": len(done),
+            "failed_categories": len(outcomes) - len(done),
+            "products": products,
+            "wall_seconds": round(wall, 3),
+            "categories_per_min": round(len(done) / wall * 60, 2),
+            "products_per_min": round(products / wall * 60, 2),
+        },
+        "latency_ms": {
+            "product": latency_summary(durations["product"], percentile),
+            "extract": latency_summary(durations["extract"], percentile),
+        },
+        "stages": timer.summary(percentile),
+        "memory": {
+            "python_peak_mb": python_peak_rss_mb(),
+            "chromium_peak_mb": round(sampler.peaks["chromium"] / 1024, 1) if sampler.supported else None,
+            "driver_peak_mb": round(sampler.peaks["driver"] / 1024, 1) if sampler.supported else None,
+        },
+        "fixture_server": dict(server.counters),
+    }
+
+
+def lookup(results: dict[str, Any], path: str) -> float | None:
+    value: Any = results
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], max_regression: float) -> list[str]:
+    """Print metric changes against the baseline and return the regressions."""
+    regressions = []
+    print(f"{'metric':>32} {'baseline':>10} {'current':>10} {'change':>8}")
+    for path, higher_is_better in REGRESSION_METRICS.items():
+        old, new = lookup(baseline, path), lookup(results, path)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        worse = -change if higher_is_better else change
+        flag = "  REGRESSION" if worse > max_regression else ""
+        print(f"{path:>32} {old:>10} {new:>10} {change:>+8.1%}{flag}")
+        if flag:
+            regressions.append(path)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--categories", type=int, default=10, help="Root categories to scrape (max 24)")
+    parser.add_argument("--rounds", type=int, default=1, help="Times every category is scraped")
+    parser.add_argument("--top-n", type=int, default=20)
+    parser.add_argument("--mode", choices=["full", "listing", "tiered"], default="full")
+    parser.add_argument("--extraction-mode", choices=["bulk", "handles", "html"], default="bulk")
+    parser.add_argument("--concurrency", type=int, default=2, help="Categories scraped at once")
+    parser.add_argument("--browsers", type=int, default=2)
+    parser.add_argument("--product-bytes", type=int, default=1_000_000)
+    parser.add_argument("--soft-block-rate", type=float, default=0.0)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated server latency")
+    parser.add_argument("--fixture-dir", default=None, help="Recorded fixtures to serve first")
+    parser.add_argument("--cold-location", action="store_true", help="Include the US location setup")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--output", default=None, help="Write the results JSON here")
+    parser.add_argument("--baseline", default=None, help="Results JSON of an earlier run to compare with")
+    parser.add_argument("--max-regression", type=float, default=0.1)
+    args = parser.parse_args()
+
+    port = free_port()
+    configure_environment(args, port)
+    results = asyncio.run(run(args, port))
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
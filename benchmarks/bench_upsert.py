@@ -0,0 +1,116 @@
+"""
+Compare the legacy per-row ORM save with the bulk ON CONFLICT upsert.
+
+Usage:
+    python -m benchmarks.bench_upsert --sizes 10 1000 100000
+    python -m benchmarks.bench_upsert --database-url postgresql+asyncpg://...
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.models import Category, Product, ProductSnapshot
+from app.services.product_service import ProductService
+
+
+async def legacy_save(db: AsyncSession, product_data: list[dict[str, Any]], category_id: int) -> int:
+    """The pre-upsert implementation: one SELECT per item, ORM attribute updates."""
+    processed_count = 0
+    for item in product_data:
+        result = await db.execute(select(Product).where(Product.asin == item["asin"]))
+        existing_product = result.scalars().first()
+
+        if existing_product:
+            for key, value in item.items():
+                setattr(existing_product, key, value)
+            existing_product.category_id = category_id
+        else:
+            db.add(Product(**item, category_id=category_id))
+        processed_count += 1
+
+    await db.commit()
+    return processed_count
+
+
+def make_products(count: int, seed: int) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "asin": f"B{index:09d}",
+            "title": f"Benchmark product {index}",
+            "rank": index + 1,
+            "price": round(rng.uniform(5, 500), 2),
+            "currency": "USD",
+            "list_price": None,
+            "discount_percentage": None,
+            "rating": round(rng.uniform(1, 5), 1),
+            "reviews_count": rng.randint(0, 100000),
+            "is_prime": rng.random() > 0.5,
+            "best_sellers_rank": None,
+            "bullet_points": ["Feature one", "Feature two"],
+            "main_image_url": f"https://m.media-amazon.com/images/I/{index}.jpg",
+        }
+        for index in range(count)
+    ]
+
+
+async def run_case(session_factory, save, size: int) -> tuple[float, float]:
+    """Time a cold insert of `size` rows, then a full update of the same rows."""
+    async with session_factory() as db:
+        await db.execute(delete(ProductSnapshot))
+        await db.execute(delete(Product))
+        await db.commit()
+        category_id = (await db.execute(select(Category.id))).scalar_one()
+
+    timings = []
+    for seed in (1, 2):
+        rows = make_products(size, seed)
+        async with session_factory() as db:
+            started = time.perf_counter()
+            await save(db, rows, category_id)
+            timings.append(time.perf_counter() - started)
+    return timings[0], timings[1]
+
+
+async def main(database_url: str, sizes: list[int]) -> None:
+    engine = create_async_engine(database_url, echo=False)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_factory() as db:
+        db.add(Category(name="Benchmark", url="https://www.amazon.com/zgbs/benchmark"))
+        await db.commit()
+
+    paths = {"legacy": legacy_save, "upsert": ProductService.save_parsed_products}
+    print(f"{'rows':>8} {'path':>8} {'insert s':>10} {'update s':>10} {'rows/s':>10}")
+    for size in sizes:
+        for name, save in paths.items():
+            insert_time, update_time = await run_case(session_factory, save, size)
+            throughput = 2 * size / (insert_time + update_time)
+            print(f"{size:>8} {name:>8} {insert_time:>10.3f} {update_time:>10.3f} {throughput:>10.0f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 100_000])
+    args = parser.parse_args()
+
+    url = args.database_url
+    if url is None:
+        path = os.path.join(tempfile.mkdtemp(), "bench_upsert.sqlite3")
+        url = f"sqlite+aiosqlite:///{path}"
+
+    asyncio.run(main(url, args.sizes))
@@ -0,0 +1,334 @@
+"""
+Local Amazon stand-in for offline scrapes (FIXTURE_MODE=replay).
+
+Serves the recorded fixture when one exists for the requested URL and
+synthesizes everything else from sample_pages:
+    /                              home page with a working location popover
+    /gp/bestsellers                root best-seller page, sidebar of root categories
+    .../zgbs/<slug>[/<node>]       category grid (?pg=2 for ranks 51-100) and subcategory sidebar
+    .../dp/<ASIN>                  product page
+A share of pages can be served as soft blocks ("Continue shopping") or
+CAPTCHA pages to exercise the anti-block paths. GET /__fixtures/stats
+returns request counters.
+
+Usage:
+    python -m benchmarks.fixture_server --port 8765 --soft-block-rate 0.05
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from functools import lru_cache
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from app.utils.fixtures import ORIGINAL_URL_HEADER, load_fixture
+from benchmarks.sample_pages import bestseller_page_html, product_page_html
+
+ROOT_CATEGORIES = [
+    "appliances", "arts-crafts", "automotive", "baby-products", "beauty", "books",
+    "electronics", "fashion", "garden", "grocery", "health-household", "home-garden",
+    "industrial", "kitchen", "movies-tv", "music", "musical-instruments", "office-products",
+    "pet-supplies", "software", "sports-outdoors", "tools", "toys-and-games", "video-games",
+]
+PAGE_SIZE = 50
+LIST_SIZE = 100
+# Child node ids are parent * NODE_BASE + index, so a node's depth is its length in base NODE_BASE
+NODE_BASE = 100
+CONTINUE_COOKIE = "fixture-continue"
+
+HOME_PAGE = """<!doctype html>
+<html lang="en-us"><head><title>Amazon.com</title></head>
+<body>
+<div id="nav-belt">
+  <a id="nav-global-location-popover-link" href="#"
+     onclick="document.getElementById('glux').style.display='block'; return false;">
+    <span id="glow-ingress-line1">Deliver to</span>
+    <span id="glow-ingress-line2">New York 10001</span>
+  </a>
+</div>
+<div id="glux" style="display:none">
+  <input id="GLUXZipUpdateInput" type="text">
+  <div class="a-popover-footer">
+    <button id="GLUXConfirmClose" type="button"
+            onclick="document.getElementById('glux').style.display='none'">Done</button>
+  </div>
+</div>
+<div id="pageContent"><a href="/gp/bestsellers">Best Sellers</a></div>
+</body></html>"""
+
+# Clicking remembers this URL in a cookie, so the reload gets the real page
+SOFT_BLOCK_PAGE = """<!doctype html>
+<html lang="en-us"><head><title>Amazon.com</title></head>
+<body><div class="a-box"><div class="a-box-inner">
+  <h4>Click the button below to continue shopping</h4>
+  <button type="button" class="a-button-text"
+          onclick="document.cookie = '{cookie}=' + encodeURIComponent(location.pathname + location.search) + '; path=/'; location.reload();">Continue shopping</button>
+</div></div></body></html>"""
+
+CAPTCHA_PAGE = """<!doctype html>
+<html lang="en-us"><head><title>Amazon.com</title></head>
+<body><h4>Enter the characters you see below</h4>
+<form method="get" action="/errors/validateCaptcha">
+  <input type="text" id="captchacharacters" name="field-keywords">
+  <button type="submit">Continue shopping</button>
+</form></body></html>"""
+
+
+def _seed(*parts: Any) -> int:
+    digest = hashlib.sha1("|".join(map(str, parts)).encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big")
+
+
+def _asin_prefix(slug: str, node: int) -> str:
+    # "B" plus 3 base-36 characters; ranks fill the other 6
+    value = _seed(slug, node) % 36**3
+    chars = ""
+    for _ in range(3):
+        value, digit = divmod(value, 36)
+        chars += "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"[digit]
+    return f"B{chars}"
+
+
+def node_depth(node: int) -> int:
+    depth = 0
+    while node:
+        node //= NODE_BASE
+        depth += 1
+    return depth
+
+
+def category_href(slug: str, node: int) -> str:
+    path = f"/Best-Sellers-{slug.title()}/zgbs/{slug}"
+    if node:
+        path = f"/Best-Sellers-{slug.title()}-{node}/zgbs/{slug}/{node}"
+    return f"{path}/ref=zg_bs_nav_{slug}_{node_depth(node)}"
+
+
+@lru_cache(maxsize=64)
+def render_root_page(root_categories: int, page_bytes: int) -> str:
+    links = [
+        (slug.replace("-", " ").title(), category_href(slug, 0))
+        for slug in ROOT_CATEGORIES[:root_categories]
+    ]
+    return bestseller_page_html(
+        "bestsellers", count=PAGE_SIZE, sidebar_links=links, target_bytes=page_bytes, asin_prefix="B000"
+    )
+
+
+@lru_cache(maxsize=256)
+def render_category_page(
+    slug: str, node: int, page_number: int, subcategories: int, max_depth: int, page_bytes: int
+) -> str:
+    links: list[tuple[str, str]] = []
+    # Root categories are depth 1, matching the crawler's depth numbering
+    if node_depth(node) + 1 < max_depth:
+        links = [
+            (f"{slug.replace('-', ' ').title()} {child}", category_href(slug, child))
+            for child in (node * NODE_BASE + index for index in range(1, subcategories + 1))
+        ]
+    start_rank = (page_number - 1) * PAGE_SIZE + 1
+    count = max(0, min(PAGE_SIZE, LIST_SIZE - start_rank + 1))
+    return bestseller_page_html(
+        slug,
+        start_rank=start_rank,
+        count=count,
+        sidebar_links=links,
+        target_bytes=page_bytes,
+        seed=_seed(slug, node, page_number),
+        asin_prefix=_asin_prefix(slug, node),
+    )
+
+
+@lru_cache(maxsize=512)
+def render_product_page(asin: str, page_bytes: int) -> str:
+    rng = random.Random(_seed(asin))
+    price = rng.randint(500, 50000) / 100
+    return product_page_html(
+        asin,
+        title=f"Fixture product {asin}",
+        price=price,
+        list_price=round(price * rng.choice([1.0, 1.25, 1.5]), 2),
+        rating=rng.randint(30, 50) / 10,
+        reviews_count=rng.randint(10, 90000),
+        is_prime=rng.random() < 0.7,
+        target_bytes=page_bytes,
+        seed=_seed(asin),
+    )
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        fixture_dir: str | None = None,
+        root_categories: int = len(ROOT_CATEGORIES),
+        subcategories: int = 10,
+        max_depth: int = 3,
+        product_bytes: int = 1_000_000,
+        listing_bytes: int = 600_000,
+        soft_block_rate: float = 0.0,
+        captcha_rate: float = 0.0,
+        latency_ms: float = 0.0,
+        seed: int = 0,
+    ):
+        super().__init__(address, FixtureHandler)
+        self.fixture_dir = fixture_dir
+        self.root_categories = root_categories
+        self.subcategories = subcategories
+        self.max_depth = max_depth
+        self.product_bytes = product_bytes
+        self.listing_bytes = listing_bytes
+        self.soft_block_rate = soft_block_rate
+        self.captcha_rate = captcha_rate
+        self.latency = latency_ms / 1000
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counters: dict[str, int] = {}
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f"http://{host}:{port}"
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+
+    def roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < rate
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    server: FixtureServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: str, content_type: str = "text/html; charset=utf-8") -> None:
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _continued(self, path_and_query: str) -> bool:
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        morsel = cookie.get(CONTINUE_COOKIE)
+        return morsel is not None and unquote(morsel.value) == path_and_query
+
+    def do_GET(self) -> None:
+        server = self.server
+        parts = urlsplit(self.path)
+        if parts.path == "/__fixtures/stats":
+            self._send(200, json.dumps(server.counters), "application/json")
+            return
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        kind, html = self.render(parts.path, parse_qs(parts.query))
+        if html is None:
+            server.count("not_found")
+            self._send(404, "<html><body>Page not found</body></html>")
+            return
+
+        if kind != "home":
+            path_and_query = parts.path + (f"?{parts.query}" if parts.query else "")
+            if server.roll(server.captcha_rate):
+                server.count("captcha")
+                self._send(503, CAPTCHA_PAGE)
+                return
+            if not self._continued(path_and_query) and server.roll(server.soft_block_rate):
+                server.count("soft_block")
+                self._send(200, SOFT_BLOCK_PAGE.replace("{cookie}", CONTINUE_COOKIE))
+                return
+
+        server.count(kind)
+        self._send(200, html)
+
+    def render(self, path: str, query: dict[str, list[str]]) -> tuple[str, str | None]:
+        server = self.server
+        original_url = self.headers.get(ORIGINAL_URL_HEADER)
+        if server.fixture_dir and original_url:
+            recorded = load_fixture(original_url, server.fixture_dir)
+            if recorded is not None:
+                return "recorded", recorded
+
+        segments = [segment for segment in path.split("/") if segment]
+        if not segments:
+            return "home", HOME_PAGE
+
+        if "dp" in segments:
+            index = segments.index("dp")
+            if index + 1 < len(segments):
+                return "product", render_product_page(segments[index + 1], server.product_bytes)
+
+        slug = None
+        node = 0
+        if "zgbs" in segments:
+            index = segments.index("zgbs")
+            rest = [s for s in segments[index + 1 :] if not s.startswith("ref=")]
+            if rest:
+                slug = rest[0]
+                if len(rest) > 1 and rest[1].isdigit():
+                    node = int(rest[1])
+        elif segments[:2] == ["gp", "bestsellers"]:
+            rest = [s for s in segments[2:] if not s.startswith("ref=")]
+            if not rest:
+                return "root", render_root_page(server.root_categories, server.listing_bytes)
+            slug = rest[0]
+
+        if slug is None or slug not in ROOT_CATEGORIES[: server.root_categories]:
+            return "not_found", None
+        try:
+            page_number = int(query.get("pg", ["1"])[0])
+        except ValueError:
+            page_number = 1
+        return "category", render_category_page(
+            slug, node, page_number, server.subcategories, server.max_depth, server.listing_bytes
+        )
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0, **options: Any) -> FixtureServer:
+    """Serve on a daemon thread (port 0 picks a free port); stop with shutdown()."""
+    server = FixtureServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, name="fixture-server", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixture-dir", default=None, help="Recorded fixtures to serve first")
+    parser.add_argument("--root-categories", type=int, default=len(ROOT_CATEGORIES))
+    parser.add_argument("--subcategories", type=int, default=10)
+    parser.add_argument("--max-depth", type=int, default=3)
+    parser.add_argument("--product-bytes", type=int, default=1_000_000)
+    parser.add_argument("--listing-bytes", type=int, default=600_000)
+    parser.add_argument("--soft-block-rate", type=float, default=0.0)
+    parser.add_argument("--captcha-rate", type=float, default=0.0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    options = vars(args)
+    server = FixtureServer((options.pop("host"), options.pop("port")), **options)
+    print(f"Serving Amazon fixtures on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
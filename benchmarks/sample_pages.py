@@ -0,0 +1,162 @@
+"""
+Synthetic Amazon-like pages matching AmazonSelectors.
+
+Markup follows the live layouts closely enough for every selector in the
+table to hit, and pages are padded with inline scripts and markup to the
+size of real ones (product pages are ~1 MB), so parse timings are realistic.
+"""
+import random
+from html import escape
+
+
+def _padding(rng: random.Random, target_bytes: int) -> str:
+    """Inline scripts and nested markup that selectors must skip over."""
+    chunks = []
+    size = 0
+    index = 0
+    while size < target_bytes:
+        script = "<script>window.P%d={" % index + ",".join(
+            f'"k{n}":"{rng.getrandbits(64):x}"' for n in range(40)
+        ) + "};</script>"
+        block = (
+            f'<div class="a-section a-spacing-small" id="pad{index}">'
+            + "".join(
+                f'<span class="a-size-base">Padding text {index}-{n}</span>' for n in range(20)
+            )
+            + "</div>"
+        )
+        chunk = script + block
+        chunks.append(chunk)
+        size += len(chunk)
+        index += 1
+    return "".join(chunks)
+
+
+def product_page_html(
+    asin: str,
+    title: str = "Sample Product",
+    price: float | None = 24.99,
+    list_price: float | None = 34.99,
+    rating: float | None = 4.6,
+    reviews_count: int | None = 12345,
+    is_prime: bool = True,
+    bullet_points: list[str] | None = None,
+    target_bytes: int = 1_000_000,
+    seed: int = 0,
+) -> str:
+    rng = random.Random(seed)
+    bullets = bullet_points if bullet_points is not None else [
+        f"Feature {n}: durable, lightweight and easy to use" for n in range(1, 7)
+    ]
+    discount = (
+        f'<span class="a-size-large savingsPercentage">-{round((1 - price / list_price) * 100)}%</span>'
+        if price and list_price and list_price > price
+        else ""
+    )
+    price_html = (
+        f'<span class="a-price"><span class="a-offscreen">${price:,.2f}</span>'
+        f'<span aria-hidden="true"><span class="a-price-whole">{int(price)}</span></span></span>'
+        if price is not None
+        else ""
+    )
+    list_price_html = (
+        f'<span class="a-price a-text-price"><span class="a-offscreen">${list_price:,.2f}</span></span>'
+        if list_price is not None
+        else ""
+    )
+    rating_html = (
+        f'<span id="acrPopover" title="{rating} out of 5 stars">'
+        f'<span class="a-size-base a-color-base">{rating}</span></span>'
+        if rating is not None
+        else ""
+    )
+    reviews_html = (
+        f'<span id="acrCustomerReviewText">{reviews_count:,} ratings</span>'
+        if reviews_count is not None
+        else ""
+    )
+    prime_html = '<i class="a-icon a-icon-prime"></i>' if is_prime else ""
+
+    return f"""<!doctype html>
+<html lang="en-us"><head><title>Amazon.com: {escape(title)}</title>
+<style>.a-offscreen{{position:absolute;left:-10000px}}</style></head>
+<body>
+<div id="nav-belt"><span id="glow-ingress-line2">New York 10001</span></div>
+{_padding(rng, target_bytes // 2)}
+<div id="centerCol">
+  <div id="titleSection"><h1 id="title"><span id="productTitle">  {escape(title)}  </span></h1></div>
+  <div id="averageCustomerReviews">{rating_html}{reviews_html}</div>
+  <div id="corePriceDisplay_desktop_feature_div">{discount}{price_html}{list_price_html}</div>
+  {prime_html}
+  <div id="feature-bullets"><ul>
+    {"".join(f'<li><span class="a-list-item"> {escape(b)} </span></li>' for b in bullets)}
+  </ul></div>
+</div>
+<div id="leftCol"><img id="landingImage" src="https://m.media-amazon.com/images/I/{asin}.jpg" alt="{escape(title)}"></div>
+<div id="detailBullets_feature_div"><table id="productDetails_detailBullets_sections1">
+  <tr><th>ASIN</th><td>{asin}</td></tr>
+  <tr><th>Best Sellers Rank</th><td><span>#{rng.randint(1, 5000):,} in Electronics</span>
+  <span>#{rng.randint(1, 100)} in Earbud Headphones</span></td></tr>
+</table></div>
+{_padding(rng, target_bytes // 2)}
+</body></html>"""
+
+
+def bestseller_page_html(
+    category_slug: str = "electronics",
+    start_rank: int = 1,
+    count: int = 50,
+    subcategories: int = 30,
+    target_bytes: int = 600_000,
+    seed: int = 0,
+    sidebar_links: list[tuple[str, str]] | None = None,
+    asin_prefix: str | None = None,
+) -> str:
+    """
+    Best-seller grid of `count` entries from `start_rank`. `sidebar_links`
+    replaces the generated subcategory links with (name, href) pairs; ASINs
+    are `asin_prefix` (4 characters, default from the seed) plus the rank.
+    """
+    rng = random.Random(seed)
+    prefix = asin_prefix or f"B{seed:03d}"[:4]
+    items = []
+    for rank in range(start_rank, start_rank + count):
+        asin = f"{prefix}{rank:06d}"[:10]
+        title = f"Best Seller {rank} in {category_slug}"
+        items.append(
+            f"""<div id="gridItemRoot" class="a-column a-span12">
+  <div class="zg-grid-general-faceout"><div data-asin="{asin}">
+    <span class="zg-bdg-text">#{rank}</span>
+    <a class="a-link-normal" href="/{title.replace(' ', '-')}/dp/{asin}/ref=zg_bs_c_{category_slug}_d_sccl_{rank}?psc=1">
+      <img alt="{escape(title)}" src="https://images-na.ssl-images-amazon.com/images/I/{asin}.jpg">
+      <div class="_cDEzb_p13n-sc-css-line-clamp-3_g3dy1">{escape(title)}</div>
+    </a>
+    <div class="a-icon-row"><i class="a-icon a-icon-star-small"><span class="a-icon-alt">{rng.randint(30, 50) / 10} out of 5 stars</span></i>
+      <span class="a-size-small">{rng.randint(10, 90000):,}</span></div>
+    <span class="_cDEzb_p13n-sc-price_3mJ9Z">${rng.randint(500, 50000) / 100:,.2f}</span>
+  </div></div>
+</div>"""
+        )
+    if sidebar_links is None:
+        sidebar_links = [
+            (
+                f"{category_slug.title()} Subcategory {n}",
+                f"/Best-Sellers-{category_slug}-{n}/zgbs/{category_slug}/{1000 + n}/ref=zg_bs_nav_{category_slug}_1",
+            )
+            for n in range(subcategories)
+        ]
+    sidebar = "".join(
+        f'<div role="treeitem"><a href="{escape(href)}">{escape(name)}</a></div>'
+        for name, href in sidebar_links
+    )
+    return f"""<!doctype html>
+<html lang="en-us"><head><title>Amazon Best Sellers: {category_slug}</title></head>
+<body>
+<div id="zg-left-col"><div role="group">
+  <div role="treeitem"><a href="/gp/bestsellers/ref=zg_bs_unv_0">Any Department</a></div>
+  {sidebar}
+</div></div>
+<div class="p13n-desktop-grid">{"".join(items)}</div>
+<ul class="a-pagination"><li class="a-last"><a href="/gp/bestsellers/{category_slug}/ref=zg_bs_pg_2?pg=2">Next page</a></li></ul>
+{_padding(rng, target_bytes)}
+</body></html>"""
@@ -5,19 +5,25 @@ const API_BASE = "https://amazon-parser-4tja.onrender.com";
 
 function App() {
   const [products, setProducts] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [parsing, setParsing] = useState(false);
   const [url, setUrl] = useState("");
   const [sortBy, setSortBy] = useState("");
   const [categories, setCategories] = useState([]);
   const [parsedUrls, setParsedUrls] = useState([]);
 
-  const fetchProducts = async (currentUrl = url) => {
-    setLoading(true);
+  // Without a cursor the list is replaced; with one, the next page is appended
+  const fetchProducts = async (currentUrl = url, cursor = null) => {
+    const setBusy = cursor ? setLoadingMore : setLoading;
+    setBusy(true);
     try {
       const params = new URLSearchParams();
       if (sortBy) params.append('sort_by', sortBy);
       if (currentUrl) params.append('category_url', currentUrl);
+      if (cursor) params.append('cursor', cursor);
+      params.append('fields', 'asin,title,rank,price,currency,list_price,rating,reviews_count,is_prime,main_image_url');
 
       const res = await fetch(`${API_BASE}/?${params.toString()}`, {
         headers: {
@@ -26,11 +32,12 @@ function App() {
         }
       });
       const data = await res.json();
-      setProducts(data);
+      setProducts(prev => cursor ? [...prev, ...data] : data);
+      setNextCursor(res.headers.get('X-Next-Cursor'));
     } catch (error) {
       console.error("Fetch error:", error);
     } finally {
-      setLoading(false);
+      setBusy(false);
     }
   };
 
@@ -168,7 +175,7 @@ useEffect(() => {
 
       <main className="max-w-7xl mx-auto px-4 py-8">
         <h2 className="text-xl font-bold mb-6 pb-2 border-b border-gray-300">
-          Best Sellers <span className="text-gray-500 font-normal text-sm ml-2">({products.length} items found)</span>
+          Best Sellers <span className="text-gray-500 font-normal text-sm ml-2">({products.length}{nextCursor ? '+' : ''} items loaded)</span>
         </h2>
 
         {loading || parsing ? (
@@ -230,6 +237,18 @@ useEffect(() => {
             ))}
           </div>
         )}
+
+        {!loading && !parsing && nextCursor && (
+          <div className="flex justify-center mt-8">
+            <button
+              onClick={() => fetchProducts(url, nextCursor)}
+              disabled={loadingMore}
+              className="bg-[#febd69] hover:bg-[#f3a847] transition-colors px-6 py-2 rounded-md text-sm font-medium text-[#131921] disabled:opacity-60"
+            >
+              {loadingMore ? "Loading..." : "Load more"}
+            </button>
+          </div>
+        )}
       </main>
 
       <footer className="mt-20 border-t border-gray-300 bg-white py-12 text-center">
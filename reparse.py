@@ -0,0 +1,45 @@
+import argparse
+import asyncio
+import json
+from datetime import datetime
+
+
+async def main(args: argparse.Namespace) -> None:
+    from app.db.base import Base
+    from app.db.session import engine
+    from app.services.reparse_service import reparse_archive
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        stats = await reparse_archive(
+            page_type=args.type,
+            category_url=args.category_url,
+            asin=args.asin,
+            since=args.since,
+            until=args.until,
+            latest_only=not args.all_fetches,
+            limit=args.limit,
+            workers=args.workers,
+        )
+    finally:
+        await engine.dispose()
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Re-run extraction over archived HTML and re-ingest the products."
+    )
+    parser.add_argument("--type", choices=["product", "category"], default=None)
+    parser.add_argument("--category-url", default=None)
+    parser.add_argument("--asin", default=None)
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None, help="ISO date or datetime")
+    parser.add_argument("--until", type=datetime.fromisoformat, default=None)
+    parser.add_argument(
+        "--all-fetches", action="store_true", help="Re-parse every fetch, not just the latest per URL"
+    )
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="Parse processes (default: all cores)")
+
+    asyncio.run(main(parser.parse_args()))
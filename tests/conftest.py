@@ -0,0 +1,28 @@
+import os
+import tempfile
+
+# Point the app at a throwaway database before any app module creates the engine
+_db_dir = tempfile.mkdtemp(prefix="amazon-parser-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/test.sqlite3"
+
+import pytest
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.db.base import Base
+from app.db.session import AsyncSessionLocal, engine
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    """A session on an empty schema; the engine is disposed with the test's event loop."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as session:
+        yield session
+    await engine.dispose()
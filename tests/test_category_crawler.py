@@ -0,0 +1,124 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy import select
+
+from app.config import settings
+from app.models import Category, CrawlFrontierEntry
+from app.services import category_crawler
+from app.services.lease_service import acquire_lease, release_lease
+
+pytestmark = pytest.mark.anyio
+
+ROOT = category_crawler.BESTSELLERS_URL
+
+# url -> subcategory links shown in its sidebar
+TREE = {
+    ROOT: ["books", "toys"],
+    "books": ["books/fiction", "books/history"],
+    # Links carry ref= tracking segments that differ per page
+    "toys": ["toys/puzzles", "books/ref=zg_bs_nav_toys_1"],
+    "books/fiction": ["books/fiction/fantasy"],
+}
+
+
+def link(slug: str) -> dict:
+    return {"name": slug.split("/")[-1].title(), "url": f"https://www.amazon.com/zgbs/{slug}"}
+
+
+def slug_of(url: str) -> str:
+    return ROOT if url == ROOT else url.removeprefix("https://www.amazon.com/zgbs/")
+
+
+@pytest.fixture
+def fake_amazon(monkeypatch):
+    visited: list[str] = []
+
+    class FakeContext:
+        async def new_page(self):
+            return object()
+
+    @asynccontextmanager
+    async def fake_browser_context(*args, **kwargs):
+        yield FakeContext()
+
+    async def fake_inject_stealth(page):
+        pass
+
+    async def fake_parse_categories_page(page, url):
+        visited.append(slug_of(url))
+        return [link(child) for child in TREE.get(slug_of(url), [])]
+
+    monkeypatch.setattr(category_crawler, "get_browser_context", fake_browser_context)
+    monkeypatch.setattr(category_crawler, "inject_stealth", fake_inject_stealth)
+    monkeypatch.setattr(category_crawler, "parse_categories_page", fake_parse_categories_page)
+    return visited
+
+
+async def test_crawl_walks_the_tree_breadth_first_and_dedupes(db, fake_amazon):
+    stats = await category_crawler.crawl_category_tree(max_depth=3, concurrency=1)
+
+    assert fake_amazon[:3] == [ROOT, "books", "toys"]
+    assert sorted(fake_amazon) == sorted([ROOT, "books", "toys", "books/fiction", "books/history", "toys/puzzles"])
+    assert stats["failed"] == 0
+    assert stats["frontier"] == {category_crawler.FRONTIER_DONE: 7}
+
+    depths = dict((await db.execute(select(Category.url, Category.depth))).all())
+    assert depths[link("books")["url"]] == 1
+    assert depths[link("books/fiction/fantasy")["url"]] == 3
+
+
+async def test_crawl_is_skipped_while_another_process_holds_the_lease(db, fake_amazon, monkeypatch):
+    from app.services import lease_service
+
+    our_owner = lease_service.LEASE_OWNER
+    monkeypatch.setattr(lease_service, "LEASE_OWNER", "other-host:1:deadbeef")
+    assert await acquire_lease(category_crawler.CRAWL_LEASE_KEY)
+    monkeypatch.setattr(lease_service, "LEASE_OWNER", our_owner)
+
+    stats = await category_crawler.crawl_category_tree()
+    assert stats["skipped"] == 1
+    assert fake_amazon == []
+
+
+async def test_crawl_stops_when_its_lease_is_lost(db, fake_amazon, monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPE_LEASE_TTL_SECONDS", 0.03)
+    original = category_crawler.parse_categories_page
+
+    async def slow_parse(page, url):
+        if slug_of(url) == "books":
+            # Another process took over: the lease row is gone
+            await release_lease(category_crawler.CRAWL_LEASE_KEY)
+            await asyncio.sleep(10)
+        return await original(page, url)
+
+    monkeypatch.setattr(category_crawler, "parse_categories_page", slow_parse)
+    stats = await category_crawler.crawl_category_tree(max_depth=3, concurrency=1)
+
+    assert stats["lease_lost"] == 1
+    assert "toys" not in fake_amazon
+
+
+async def test_crash_before_categories_are_written_is_repaired_on_retry(db, fake_amazon, monkeypatch):
+    upsert = category_crawler.upsert_categories
+    crashed = False
+
+    async def crash_once(session, rows):
+        nonlocal crashed
+        if not crashed and any(row["url"] == link("books/fiction")["url"] for row in rows):
+            crashed = True
+            raise ConnectionError("process died mid-write")
+        return await upsert(session, rows)
+
+    monkeypatch.setattr(category_crawler, "upsert_categories", crash_once)
+    stats = await category_crawler.crawl_category_tree(max_depth=3, concurrency=1)
+
+    assert crashed and stats["failed"] == 1
+    rows = (await db.execute(select(Category.url, Category.id, Category.parent_id))).all()
+    parents = {url: parent_id for url, _, parent_id in rows}
+    ids = {url: category_id for url, category_id, _ in rows}
+    assert parents[link("books/fiction")["url"]] == ids[link("books")["url"]]
+    assert parents[link("books/fiction/fantasy")["url"]] == ids[link("books/fiction")["url"]]
+    frontier = (await db.execute(select(CrawlFrontierEntry.url))).scalars().all()
+    assert set(frontier) - {ROOT} == set(ids)
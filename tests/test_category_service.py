@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import func, select
+
+from app.models import Category
+from app.services.category_service import (
+    get_or_create_category,
+    normalize_category_url,
+    upsert_categories,
+)
+
+pytestmark = pytest.mark.anyio
+
+BOOKS = "https://www.amazon.com/Best-Sellers-Books/zgbs/books"
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        BOOKS,
+        f"{BOOKS}/",
+        f"{BOOKS}/ref=zg_bs_nav_books_0",
+        f"{BOOKS}?pd_rd_w=abc#top",
+        f"  HTTPS://WWW.AMAZON.COM/Best-Sellers-Books/zgbs/books ",
+    ],
+)
+def test_normalize_category_url(url):
+    assert normalize_category_url(url) == BOOKS
+
+
+async def test_url_variants_share_one_category(db):
+    first = await get_or_create_category(db, f"{BOOKS}/ref=zg_bs_nav_books_0")
+    second = await get_or_create_category(db, f"{BOOKS}/?th=1")
+
+    assert first.id == second.id
+    assert first.url == BOOKS
+    assert (await db.execute(select(func.count(Category.id)))).scalar() == 1
+
+
+async def test_upsert_categories_counts_created_renamed_unchanged(db):
+    toys = "https://www.amazon.com/zgbs/toys"
+    counts = await upsert_categories(
+        db, [{"name": "Books", "url": BOOKS}, {"name": "Toys", "url": toys}]
+    )
+    assert counts == {"created": 2, "renamed": 0, "unchanged": 0}
+
+    counts = await upsert_categories(
+        db, [{"name": "Books", "url": BOOKS}, {"name": "Toys & Games", "url": toys}]
+    )
+    assert counts == {"created": 0, "renamed": 1, "unchanged": 1}
+
+    names = dict((await db.execute(select(Category.url, Category.name))).all())
+    assert names == {BOOKS: "Books", toys: "Toys & Games"}
+
+
+async def test_upsert_categories_keeps_existing_tree_position(db):
+    await upsert_categories(db, [{"name": "Books", "url": BOOKS, "parent_id": None, "depth": 1}])
+    await upsert_categories(db, [{"name": "Books", "url": BOOKS, "depth": 3}])
+
+    depth = (await db.execute(select(Category.depth).where(Category.url == BOOKS))).scalar()
+    assert depth == 1
+
+
+async def test_upsert_categories_shares_rows_with_get_or_create(db):
+    counts = await upsert_categories(
+        db,
+        [
+            {"name": "Books", "url": f"{BOOKS}/ref=zg_bs_nav_books_0"},
+            {"name": "Books", "url": f"{BOOKS}/"},
+        ],
+    )
+    assert counts == {"created": 1, "renamed": 0, "unchanged": 0}
+
+    category = await get_or_create_category(db, f"{BOOKS}?th=1")
+    assert category.url == BOOKS
+    assert (await db.execute(select(func.count(Category.id)))).scalar() == 1
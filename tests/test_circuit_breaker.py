@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.utils import anti_block
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.errors import BlockedError, CircuitOpenError
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_WINDOW", 4)
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_MIN_SAMPLES", 4)
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_BLOCK_RATE", 0.5)
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_COOLDOWN_SECONDS", 60)
+    breaker = CircuitBreaker()
+    monkeypatch.setattr(anti_block, "circuit_breaker", breaker)
+    return breaker
+
+
+def trip(breaker: CircuitBreaker) -> None:
+    for blocked in (True, True, False, False):
+        breaker.record(blocked)
+
+
+def end_cooldown(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_COOLDOWN_SECONDS", 0)
+
+
+def test_opens_at_the_block_rate_after_min_samples(breaker):
+    for blocked in (True, True, False):
+        breaker.record(blocked)
+    assert breaker.state == "closed"
+
+    breaker.record(False)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_one_trial_after_cooldown_then_closes_on_success(breaker, monkeypatch):
+    trip(breaker)
+    end_cooldown(monkeypatch)
+
+    assert breaker.check() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    breaker.record(blocked=False)
+    assert breaker.state == "closed"
+    assert breaker.check() is False
+
+
+def test_blocked_trial_reopens(breaker, monkeypatch):
+    trip(breaker)
+    end_cooldown(monkeypatch)
+    breaker.check()
+    breaker.record(blocked=True)
+
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_COOLDOWN_SECONDS", 60)
+    assert breaker.state == "open"
+    assert breaker.times_opened == 2
+
+
+@pytest.mark.anyio
+async def test_retry_classified_retries_blocks_and_feeds_the_breaker(breaker, monkeypatch):
+    monkeypatch.setattr(anti_block, "RETRY_POLICIES", {**anti_block.RETRY_POLICIES, "block": (2, 0.0)})
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise BlockedError("soft block")
+        return "page"
+
+    assert await anti_block.retry_classified(load, "test") == "page"
+    assert breaker.stats()["samples"] == 3
+    assert breaker.block_rate == pytest.approx(2 / 3)
+
+
+@pytest.mark.anyio
+async def test_cancelled_trial_frees_the_half_open_slot(breaker, monkeypatch):
+    trip(breaker)
+    end_cooldown(monkeypatch)
+    started = asyncio.Event()
+
+    async def slow_load():
+        started.set()
+        await asyncio.sleep(10)
+
+    trial = asyncio.ensure_future(anti_block.retry_classified(slow_load, "trial"))
+    await started.wait()
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    # The next request becomes the trial instead of failing until restart
+    assert breaker.check() is True
@@ -0,0 +1,42 @@
+import pytest
+
+from app.services.history_service import get_price_drops, get_product_history, get_rank_movers
+from app.services.product_service import ProductService
+from tests.test_product_upsert import make_category, product
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_price_drops_sum_deltas_within_category(db):
+    books = await make_category(db)
+    toys = await make_category(db, url="https://www.amazon.com/gp/bestsellers/toys")
+    await ProductService.save_parsed_products(
+        db, [product("A1", 1, price=20.0), product("A2", 2, price=10.0)], books
+    )
+    await ProductService.save_parsed_products(db, [product("T1", 1, price=8.0)], toys)
+
+    await ProductService.save_parsed_products(
+        db, [product("A1", 1, price=18.0), product("A2", 2, price=12.0)], books
+    )
+    await ProductService.save_parsed_products(db, [product("A1", 1, price=15.0)], books)
+    await ProductService.save_parsed_products(db, [product("T1", 1, price=6.0)], toys)
+
+    drops = await get_price_drops(db, days=1, category_id=books)
+    assert [(drop["asin"], drop["price_change"]) for drop in drops] == [("A1", -5.0)]
+    assert drops[0]["previous_price"] == 20.0
+
+    everywhere = await get_price_drops(db, days=1)
+    assert [drop["asin"] for drop in everywhere] == ["A1", "T1"]
+
+
+async def test_rank_movers_and_history(db):
+    books = await make_category(db)
+    await ProductService.save_parsed_products(db, [product("A1", 5), product("A2", 1)], books)
+    await ProductService.save_parsed_products(db, [product("A1", 1), product("A2", 2)], books)
+
+    movers = await get_rank_movers(db, books, days=1)
+    assert [(m["asin"], m["rank_change"]) for m in movers] == [("A1", -4), ("A2", 1)]
+
+    history = await get_product_history(db, "A1")
+    assert [point["rank"] for point in history] == [5, 1]
+    assert [point["price"] for point in history] == [10.0, 10.0]
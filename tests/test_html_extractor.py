@@ -0,0 +1,72 @@
+import lxml.html
+import pytest
+
+from app.services.amazon_parser import (
+    build_category_links,
+    build_product_data,
+    parse_categories_html,
+)
+from app.services.html_extractor import (
+    extract_bestseller_items,
+    extract_category_links,
+    extract_product_fields,
+    text_of,
+)
+from benchmarks.sample_pages import bestseller_page_html, product_page_html
+
+
+@pytest.mark.parametrize(
+    "html, expected",
+    [
+        ("<span>  Echo   Dot\n (5th Gen) </span>", "Echo Dot (5th Gen)"),
+        ("<div>Books<div><span>1,234</span> items</div></div>", "Books\n1,234 items"),
+        ("<li>Toys<br>&amp; Games</li>", "Toys\n& Games"),
+        ("<p>Price <script>var x = 1;</script><!-- note -->$5<style>p{}</style></p>", "Price $5"),
+        ("<div><p></p><p> Only line </p></div>", "Only line"),
+    ],
+)
+def test_text_of_matches_inner_text_line_breaks(html, expected):
+    assert text_of(lxml.html.fragment_fromstring(html, create_parent="div")) == expected
+
+
+def test_sidebar_names_use_the_first_line_like_the_browser_path():
+    html = """
+        <div id="zg_left_col1">
+          <a href="/Best-Sellers-Books/zgbs/books/ref=zg_bs_nav_0">
+            <div>Books</div><div class="badge">New</div>
+          </a>
+          <a href="/gp/bestsellers/zgbs/toys">Toys<br>&amp; Games</a>
+        </div>
+    """
+    # What el.innerText.trim() returns for the same links in a browser
+    browser_links = [
+        {"name": "Books\nNew", "href": "/Best-Sellers-Books/zgbs/books/ref=zg_bs_nav_0"},
+        {"name": "Toys\n& Games", "href": "/gp/bestsellers/zgbs/toys"},
+    ]
+
+    assert extract_category_links(html) == browser_links
+    assert parse_categories_html(html) == build_category_links(browser_links)
+    assert [link["name"] for link in parse_categories_html(html)] == ["Books", "Toys"]
+
+
+def test_product_fields_of_a_sample_page():
+    html = product_page_html("B000TEST01", title="Echo Dot", price=24.99, reviews_count=12345)
+    raw = extract_product_fields(html)
+
+    assert raw["title"] == "Echo Dot"
+    assert raw["price"] == "$24.99"
+    assert raw["is_prime"] is True
+
+    data = build_product_data(raw, "https://www.amazon.com/dp/B000TEST01", rank=3)
+    assert data["asin"] == "B000TEST01"
+    assert data["price"] == 24.99
+    assert data["reviews_count"] == 12345
+    assert isinstance(data["best_sellers_rank"], int)
+
+
+def test_bestseller_items_of_a_sample_page():
+    items = extract_bestseller_items(bestseller_page_html(count=3, target_bytes=0))
+
+    assert len(items) == 3
+    assert all(item["href"] and "/dp/" in item["href"] for item in items)
+    assert all(item["listing"]["asin"] and item["listing"]["title"] for item in items)
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from sqlalchemy import update
+
+from app.config import settings
+from app.models import ParseJob
+from app.services import job_runner as job_runner_module
+from app.services.job_runner import JobRunner
+from app.services.job_service import (
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    claim_next_job,
+    create_job,
+    get_job,
+)
+
+pytestmark = pytest.mark.anyio
+
+URL = "https://www.amazon.com/Best-Sellers-Books/zgbs/books"
+OWNER = "worker-a"
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_VISIBILITY_TIMEOUT_SECONDS", 0.06)
+    return JobRunner(owner=OWNER)
+
+
+async def claimed_job(db) -> ParseJob:
+    await create_job(db, URL)
+    job = await claim_next_job(db, OWNER)
+    assert job is not None
+    return job
+
+
+async def job_state(db, job_id: str) -> ParseJob:
+    db.expire_all()
+    job = await get_job(db, job_id)
+    assert job is not None
+    return job
+
+
+async def test_finished_job_stores_its_result(db, runner, monkeypatch):
+    async def execute(job, progress):
+        await asyncio.sleep(0.1)  # outlives a few heartbeats
+        return {"parsed": 3}
+
+    monkeypatch.setattr(runner, "_execute", execute)
+    job = await claimed_job(db)
+    await runner.run_job(job)
+
+    job = await job_state(db, job.id)
+    assert (job.status, job.result) == (JOB_SUCCEEDED, {"parsed": 3})
+
+
+async def test_lost_lease_cancels_the_job_without_finishing_it(db, runner, monkeypatch):
+    cancelled = asyncio.Event()
+
+    async def execute(job, progress):
+        # Another worker re-claims the job after our lease expired
+        await db.execute(update(ParseJob).where(ParseJob.id == job.id).values(locked_by="worker-b"))
+        await db.commit()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    monkeypatch.setattr(runner, "_execute", execute)
+    job = await claimed_job(db)
+    await asyncio.wait_for(runner.run_job(job), timeout=5)
+
+    assert cancelled.is_set()
+    job = await job_state(db, job.id)
+    assert (job.status, job.locked_by, job.result) == (JOB_RUNNING, "worker-b", None)
+
+
+async def test_renewal_errors_are_retried(db, runner, monkeypatch):
+    renew = job_runner_module.renew_job_lease
+    calls = 0
+
+    async def flaky_renew(*args):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ConnectionError("database is restarting")
+        return await renew(*args)
+
+    async def execute(job, progress):
+        await asyncio.sleep(0.15)
+        return {"parsed": 1}
+
+    monkeypatch.setattr(job_runner_module, "renew_job_lease", flaky_renew)
+    monkeypatch.setattr(runner, "_execute", execute)
+    job = await claimed_job(db)
+    await runner.run_job(job)
+
+    assert calls > 1
+    assert (await job_state(db, job.id)).status == JOB_SUCCEEDED
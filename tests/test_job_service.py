@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta, timezone
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models import ParseJob
+from app.services.job_service import (
+    JOB_FAILED,
+    JOB_KIND_CRAWL_TREE,
+    JOB_KIND_SYNC_CATEGORIES,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    claim_next_job,
+    create_job,
+    finish_job,
+    get_job,
+    get_job_stats,
+    renew_job_lease,
+)
+
+pytestmark = pytest.mark.anyio
+
+URL = "https://www.amazon.com/Best-Sellers-Books/zgbs/books"
+
+
+async def expire_lease(db, job_id: str) -> None:
+    await db.execute(
+        update(ParseJob)
+        .where(ParseJob.id == job_id)
+        .values(lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+    )
+    await db.commit()
+
+
+async def test_claim_leases_the_oldest_queued_job_once(db):
+    first = await create_job(db, URL)
+    await create_job(db, URL, mode="listing")
+
+    claimed = await claim_next_job(db, "worker-a")
+    assert claimed.id == first.id
+    assert claimed.status == JOB_RUNNING
+    assert claimed.locked_by == "worker-a"
+    assert claimed.attempts == 1
+
+    second = await claim_next_job(db, "worker-b")
+    assert second.id != first.id and second.mode == "listing"
+    assert await claim_next_job(db, "worker-c") is None
+
+
+async def test_only_the_lease_holder_renews_and_finishes(db):
+    job = await create_job(db, URL)
+    await claim_next_job(db, "worker-a")
+
+    assert await renew_job_lease(db, job.id, "worker-a")
+    assert not await renew_job_lease(db, job.id, "worker-b")
+
+    await finish_job(db, job.id, "worker-b", result={"parsed": 1})
+    assert (await get_job(db, job.id)).status == JOB_RUNNING
+
+    await finish_job(db, job.id, "worker-a", result={"parsed": 1})
+    finished = await get_job(db, job.id)
+    assert finished.status == JOB_SUCCEEDED
+    assert finished.result == {"parsed": 1}
+    assert finished.locked_by is None
+    assert not await renew_job_lease(db, job.id, "worker-a")
+
+
+async def test_expired_lease_is_reclaimed_then_failed_after_max_attempts(db, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_MAX_ATTEMPTS", 2)
+    job = await create_job(db, URL)
+
+    await claim_next_job(db, "crashed-1")
+    await expire_lease(db, job.id)
+    reclaimed = await claim_next_job(db, "worker-b")
+    assert reclaimed.id == job.id
+    assert reclaimed.attempts == 2
+
+    await expire_lease(db, job.id)
+    assert await claim_next_job(db, "worker-c") is None
+    failed = await get_job(db, job.id)
+    assert failed.status == JOB_FAILED
+    assert failed.error
+
+
+async def test_stats_report_depth_per_status(db):
+    job = await create_job(db, URL)
+    await create_job(db, "https://www.amazon.com/Best-Sellers-Toys-Games/zgbs/toys-and-games")
+    await claim_next_job(db, "worker-a")
+    await finish_job(db, job.id, "worker-a", error="boom")
+
+    stats = await get_job_stats(db)
+    assert stats["queue_depth"] == 1
+    assert stats["running"] == 0
+    assert stats["by_status"] == {JOB_QUEUED: 1, JOB_FAILED: 1}
+    assert stats["finished_in_window"] == 1
+
+
+async def test_active_job_is_returned_instead_of_a_duplicate(db):
+    first = await create_job(db, f"{URL}/ref=zg_bs_nav_books_0")
+    again = await create_job(db, f"{URL}/")
+    assert again.id == first.id
+    assert first.category_url == URL
+
+    # A different mode or kind is a different job
+    assert (await create_job(db, URL, mode="listing")).id != first.id
+    assert (await create_job(db, URL, kind=JOB_KIND_SYNC_CATEGORIES)).id != first.id
+
+
+async def test_concurrent_enqueues_create_one_job(db):
+    async def enqueue():
+        async with AsyncSessionLocal() as session:
+            return (await create_job(session, URL)).id
+
+    ids = await asyncio.gather(*(enqueue() for _ in range(10)))
+    assert len(set(ids)) == 1
+    assert (await db.execute(select(func.count(ParseJob.id)))).scalar() == 1
+
+
+async def test_finished_job_no_longer_dedupes(db):
+    job = await create_job(db, URL, kind=JOB_KIND_CRAWL_TREE)
+    await claim_next_job(db, "worker-a")
+    assert (await create_job(db, URL, kind=JOB_KIND_CRAWL_TREE)).id == job.id
+
+    await finish_job(db, job.id, "worker-a", result={})
+    assert (await create_job(db, URL, kind=JOB_KIND_CRAWL_TREE)).id != job.id
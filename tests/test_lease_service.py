@@ -0,0 +1,86 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+
+from app.config import settings
+from app.models import ScrapeLease
+from app.services import lease_service
+from app.services.lease_service import (
+    LeaseLostError,
+    acquire_lease,
+    release_lease,
+    renew_lease,
+    run_holding_lease,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def other_owner(monkeypatch):
+    """Act as a different process for the duration of a block."""
+
+    class OtherOwner:
+        def __enter__(self):
+            monkeypatch.setattr(lease_service, "LEASE_OWNER", "other-host:1:deadbeef")
+
+        def __exit__(self, *exc):
+            monkeypatch.undo()
+
+    return OtherOwner()
+
+
+async def test_live_lease_blocks_other_owners(db, other_owner):
+    assert await acquire_lease("k")
+    with other_owner:
+        assert not await acquire_lease("k")
+        assert not await renew_lease("k")
+
+
+async def test_expired_lease_can_be_taken_over(db, other_owner):
+    assert await acquire_lease("k")
+    await db.execute(
+        update(ScrapeLease).values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+    )
+    await db.commit()
+    with other_owner:
+        assert await acquire_lease("k")
+    assert not await renew_lease("k")
+
+
+async def test_holder_renews_until_release(db):
+    assert await acquire_lease("k")
+    assert await renew_lease("k")
+    await release_lease("k")
+    assert not await renew_lease("k")
+
+
+async def test_run_holding_lease_returns_the_result(db, monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPE_LEASE_TTL_SECONDS", 0.03)
+    assert await acquire_lease("k")
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return 42
+
+    assert await run_holding_lease("k", work) == 42
+
+
+async def test_run_holding_lease_cancels_work_once_the_lease_is_lost(db, monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPE_LEASE_TTL_SECONDS", 0.03)
+    assert await acquire_lease("k")
+    cancelled = asyncio.Event()
+
+    async def work():
+        await release_lease("k")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(LeaseLostError):
+        await run_holding_lease("k", work)
+    assert cancelled.is_set()
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import select
+
+from app.models import Category, Product
+from app.services.product_service import ProductService
+
+pytestmark = pytest.mark.anyio
+
+
+async def make_category(db, url="https://www.amazon.com/gp/bestsellers/books") -> int:
+    category = Category(name="Books", url=url)
+    db.add(category)
+    await db.commit()
+    return category.id
+
+
+def product(asin: str, rank: int, price: float | None = 10.0, **extra) -> dict:
+    return {"asin": asin, "title": f"Product {asin}", "rank": rank, "price": price, **extra}
+
+
+async def test_first_save_inserts_every_row(db):
+    category_id = await make_category(db)
+    counts = await ProductService.save_parsed_products(
+        db, [product("A1", 1), product("A2", 2)], category_id
+    )
+    assert counts == {"inserted": 2, "updated": 0, "unchanged": 0}
+
+
+async def test_identical_rows_are_left_unchanged(db):
+    category_id = await make_category(db)
+    rows = [product("A1", 1), product("A2", 2)]
+    await ProductService.save_parsed_products(db, rows, category_id)
+
+    counts = await ProductService.save_parsed_products(db, rows, category_id)
+    assert counts == {"inserted": 0, "updated": 0, "unchanged": 2}
+
+
+async def test_changed_and_new_rows_are_counted_separately(db):
+    category_id = await make_category(db)
+    await ProductService.save_parsed_products(db, [product("A1", 1), product("A2", 2)], category_id)
+
+    counts = await ProductService.save_parsed_products(
+        db, [product("A1", 1, price=12.5), product("A2", 2), product("A3", 3)], category_id
+    )
+    assert counts == {"inserted": 1, "updated": 1, "unchanged": 1}
+    price = (await db.execute(select(Product.price).where(Product.asin == "A1"))).scalar()
+    assert price == 12.5
+
+
+async def test_duplicate_asins_collapse_to_the_last_row(db):
+    category_id = await make_category(db)
+    counts = await ProductService.save_parsed_products(
+        db, [product("A1", 1, price=1.0), product("A1", 4, price=2.0), {"title": "no asin"}], category_id
+    )
+    assert counts == {"inserted": 1, "updated": 0, "unchanged": 0}
+    row = (await db.execute(select(Product.rank, Product.price))).one()
+    assert tuple(row) == (4, 2.0)
+
+
+async def test_rows_with_different_key_sets_share_one_save(db):
+    category_id = await make_category(db)
+    counts = await ProductService.save_parsed_products(
+        db, [product("A1", 1), product("A2", 2, bullet_points=["a", "b"])], category_id
+    )
+    assert counts == {"inserted": 2, "updated": 0, "unchanged": 0}
@@ -0,0 +1,75 @@
+import pytest
+
+from app.services.amazon_parser import parse_best_sellers_rank
+from app.services.product_service import ProductService
+from tests.test_product_upsert import make_category, product
+
+pytestmark = pytest.mark.anyio
+
+PRICES = [5.0, None, 3.0, 5.0, 1.0, None, 8.0]
+
+
+async def seed(db) -> None:
+    category_id = await make_category(db)
+    rows = [product(f"A{i}", i + 1, price=price) for i, price in enumerate(PRICES)]
+    await ProductService.save_parsed_products(db, rows, category_id)
+
+
+async def walk(db, sort_by, limit=2, **filters) -> list[dict]:
+    seen, cursor = [], None
+    while True:
+        page, cursor = await ProductService.get_products_page(
+            db, sort_by=sort_by, limit=limit, cursor=cursor, fields=["asin", "price"], **filters
+        )
+        assert len(page) <= limit
+        seen.extend(page)
+        if cursor is None:
+            return seen
+
+
+@pytest.mark.parametrize(
+    "sort_by, expected",
+    [
+        (None, ["A0", "A1", "A2", "A3", "A4", "A5", "A6"]),
+        ("price", ["A4", "A2", "A0", "A3", "A6", "A1", "A5"]),
+        ("-price", ["A6", "A3", "A0", "A2", "A4", "A1", "A5"]),
+    ],
+)
+async def test_pages_cover_every_row_once_with_nulls_last(db, sort_by, expected):
+    await seed(db)
+    for limit in (1, 2, 3, 100):
+        assert [row["asin"] for row in await walk(db, sort_by, limit)] == expected
+
+
+async def test_fields_projection_and_filters(db):
+    await seed(db)
+    page, cursor = await ProductService.get_products_page(
+        db, max_price=5.0, sort_by="price", fields=["asin"]
+    )
+    assert page == [{"asin": "A4"}, {"asin": "A2"}, {"asin": "A0"}, {"asin": "A3"}]
+    assert cursor is None
+
+
+async def test_unknown_category_and_bad_input(db):
+    await seed(db)
+    assert await ProductService.get_products_page(
+        db, category_url="https://www.amazon.com/zgbs/nope"
+    ) == ([], None)
+    with pytest.raises(ValueError):
+        await ProductService.get_products_page(db, fields=["password"])
+    _, cursor = await ProductService.get_products_page(db, sort_by="price", limit=1)
+    with pytest.raises(ValueError):
+        await ProductService.get_products_page(db, sort_by="rating", cursor=cursor)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Best Sellers Rank: #1,234 in Books (See Top 100 in Books)", 1234),
+        ("#7 in Toys & Games #2 in Puzzles", 7),
+        ("Best Sellers Rank", None),
+        (None, None),
+    ],
+)
+def test_parse_best_sellers_rank(text, expected):
+    assert parse_best_sellers_rank(text) == expected
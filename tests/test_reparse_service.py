@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import select
+
+from app.config import settings
+from app.models import Product
+from app.services.category_service import get_or_create_category
+from app.services.html_archive import archive_page
+from app.services.reparse_service import reparse_archive
+from benchmarks.sample_pages import product_page_html
+
+pytestmark = pytest.mark.anyio
+
+BOOKS = "https://www.amazon.com/zgbs/books"
+
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "HTML_ARCHIVE_ENABLED", True)
+    monkeypatch.setattr(settings, "HTML_ARCHIVE_DIR", str(tmp_path))
+
+
+async def archive_product(asin: str, category_url: str, **page) -> None:
+    html = product_page_html(asin, target_bytes=0, **page)
+    url = f"https://www.amazon.com/dp/{asin}"
+    await archive_page(html, url, "product", asin=asin, category_url=category_url, rank=1)
+
+
+async def test_reparse_upserts_archived_products(db, archive):
+    await get_or_create_category(db, BOOKS)
+    await archive_product("B000TEST01", BOOKS, price=19.99)
+    await archive_product("B000TEST02", "https://www.amazon.com/zgbs/deleted")
+
+    stats = await reparse_archive(workers=1)
+
+    assert stats["pages"] == 2
+    assert stats["products"] == 1
+    assert stats["inserted"] == 1
+    assert stats["skipped_products"] == 1
+    assert isinstance(stats["seconds"], float)
+
+    product = (await db.execute(select(Product))).scalars().one()
+    assert (product.asin, product.price) == ("B000TEST01", 19.99)
+
+
+async def test_reparse_without_pages(db, archive):
+    assert await reparse_archive(workers=1) == {
+        "pages": 0,
+        "failed_pages": 0,
+        "products": 0,
+        "skipped_products": 0,
+        "inserted": 0,
+        "updated": 0,
+        "unchanged": 0,
+        "seconds": 0.0,
+    }
@@ -0,0 +1,101 @@
+import pytest
+from sqlalchemy import select
+
+from app.models import Product
+from app.services import scrape_service
+from app.services.category_service import get_or_create_category
+
+pytestmark = pytest.mark.anyio
+
+BOOKS = "https://www.amazon.com/zgbs/books"
+
+
+def grid_row(asin: str, rank: int, price: float = 10.0) -> dict:
+    return {
+        "asin": asin,
+        "title": f"Book {asin}",
+        "rank": rank,
+        "price": price,
+        "currency": "$",
+        "rating": 4.5,
+        "reviews_count": 100,
+        "main_image_url": None,
+        "url": f"https://www.amazon.com/dp/{asin}",
+    }
+
+
+@pytest.fixture
+def fake_amazon(monkeypatch):
+    """Serves `grid` as the listing and records which detail pages were loaded."""
+    state: dict = {"grid": [], "detailed": [], "broken": set()}
+
+    async def fake_listing(category_url, progress=None, top_n=None):
+        return [dict(row) for row in state["grid"]]
+
+    async def fake_full(category_url, progress=None, top_n=None, mode=None):
+        assert mode == "listing"
+        return await fake_listing(category_url)
+
+    async def fake_product_pages(category_url, entries, progress=None):
+        pages = []
+        for entry in entries:
+            asin = entry["url"].rsplit("/", 1)[-1]
+            state["detailed"].append(asin)
+            if asin not in state["broken"]:
+                row = next(row for row in state["grid"] if row["asin"] == asin)
+                pages.append({**row, "bullet_points": ["Hardcover"]})
+        return pages
+
+    monkeypatch.setattr(scrape_service, "parse_category_listing", fake_listing)
+    monkeypatch.setattr(scrape_service, "parse_category_full", fake_full)
+    monkeypatch.setattr(scrape_service, "parse_product_pages", fake_product_pages)
+    return state
+
+
+async def stored(db) -> dict[str, Product]:
+    result = await db.execute(select(Product).execution_options(populate_existing=True))
+    return {product.asin: product for product in result.scalars()}
+
+
+async def test_tiered_only_loads_details_for_changed_listings(db, fake_amazon):
+    category = await get_or_create_category(db, BOOKS)
+    fake_amazon["grid"] = [grid_row("A1", 1), grid_row("A2", 2)]
+
+    await scrape_service._scrape_and_store(category.id, BOOKS, mode="tiered")
+    assert fake_amazon["detailed"] == ["A1", "A2"]
+
+    fake_amazon["detailed"].clear()
+    fake_amazon["grid"] = [grid_row("A1", 1), grid_row("A2", 2, price=12.0)]
+    result = await scrape_service._scrape_and_store(category.id, BOOKS, mode="tiered")
+
+    assert fake_amazon["detailed"] == ["A2"]
+    assert result["unchanged"] == 1
+    assert (await stored(db))["A2"].price == 12.0
+
+
+async def test_tiered_loads_details_for_products_saved_by_listing_mode(db, fake_amazon):
+    category = await get_or_create_category(db, BOOKS)
+    fake_amazon["grid"] = [grid_row("A1", 1)]
+
+    await scrape_service._scrape_and_store(category.id, BOOKS, mode="listing")
+    assert (await stored(db))["A1"].listing_hash is None
+
+    await scrape_service._scrape_and_store(category.id, BOOKS, mode="tiered")
+    assert fake_amazon["detailed"] == ["A1"]
+    products = await stored(db)
+    assert products["A1"].bullet_points == ["Hardcover"]
+    assert products["A1"].listing_hash is not None
+
+
+async def test_tiered_retries_failed_detail_pages(db, fake_amazon):
+    category = await get_or_create_category(db, BOOKS)
+    fake_amazon["grid"] = [grid_row("A1", 1)]
+    fake_amazon["broken"] = {"A1"}
+
+    await scrape_service._scrape_and_store(category.id, BOOKS, mode="tiered")
+    assert (await stored(db))["A1"].listing_hash is None
+
+    fake_amazon["broken"] = set()
+    await scrape_service._scrape_and_store(category.id, BOOKS, mode="tiered")
+    assert fake_amazon["detailed"] == ["A1", "A1"]
+    assert (await stored(db))["A1"].bullet_points == ["Hardcover"]
@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_calls_share_one_run():
+    flights = SingleFlight()
+    calls = 0
+
+    async def scrape():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(flights.do("books|full", scrape) for _ in range(5)))
+    assert results == [1] * 5
+    assert flights.in_flight() == []
+
+    assert await flights.do("books|full", scrape) == 2
+
+
+async def test_cancelled_caller_does_not_cancel_shared_work():
+    flights = SingleFlight()
+    started = asyncio.Event()
+
+    async def scrape():
+        started.set()
+        await asyncio.sleep(0.02)
+        return "done"
+
+    first = asyncio.ensure_future(flights.do("k", scrape))
+    await started.wait()
+    second = asyncio.ensure_future(flights.do("k", scrape))
+    first.cancel()
+
+    assert await second == "done"
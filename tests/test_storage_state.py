@@ -0,0 +1,45 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.config import settings
+from app.utils.storage_state import load_storage_state, save_storage_state, storage_state_key
+
+STATE = {"cookies": [{"name": "i18n-prefs", "value": "USD"}], "origins": []}
+
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_STATE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_saved_state_round_trips(state_dir):
+    key = storage_state_key("http://proxy:8080", "Mozilla/5.0")
+    save_storage_state(key, STATE)
+    assert load_storage_state(key) == STATE
+
+
+def test_concurrent_saves_of_one_key_do_not_collide(state_dir):
+    key = storage_state_key(None, "Mozilla/5.0")
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: save_storage_state(key, STATE), range(200)))
+
+    assert load_storage_state(key) == STATE
+    assert os.listdir(state_dir) == [f"{key}.json"]
+
+
+def test_failed_write_is_not_raised(state_dir, monkeypatch):
+    blocked = state_dir / "not-a-directory"
+    blocked.write_text("")
+    monkeypatch.setattr(settings, "STORAGE_STATE_DIR", str(blocked))
+
+    save_storage_state("key", STATE)
+    assert load_storage_state("key") is None
+
+
+def test_expired_state_is_ignored(state_dir, monkeypatch):
+    save_storage_state("key", STATE)
+    monkeypatch.setattr(settings, "STORAGE_STATE_TTL_SECONDS", -1)
+    assert load_storage_state("key") is None
@@ -0,0 +1,45 @@
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from app.config import settings
+from app.main import app
+from app.models import ParseJob
+from app.services.job_service import JOB_KIND_CRAWL_TREE, JOB_KIND_SYNC_CATEGORIES
+
+pytestmark = pytest.mark.anyio
+
+URL = "https://www.amazon.com/Best-Sellers-Books/zgbs/books"
+
+
+@pytest.fixture
+async def client(db, monkeypatch):
+    """API in worker mode; the lifespan is not run, so no browser is started."""
+    monkeypatch.setattr(settings, "JOB_EXECUTION_MODE", "worker")
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+async def test_concurrent_parse_requests_enqueue_one_job(client, db):
+    responses = await asyncio.gather(
+        *(client.post("/parse", json={"category_url": f"{URL}/ref=zg_{i}"}) for i in range(8))
+    )
+    assert {response.json()["status"] for response in responses} == {"queued"}
+    assert len({response.json()["job_id"] for response in responses}) == 1
+    assert len((await db.execute(select(ParseJob))).all()) == 1
+
+
+async def test_admin_browser_work_is_queued_for_workers(client, db):
+    sync = (await client.post("/categories/api/admin/force-sync-categories")).json()
+    assert sync["job_id"] == (await client.post("/categories/api/admin/force-sync-categories")).json()["job_id"]
+
+    crawl = (await client.post("/categories/api/admin/crawl-tree", params={"reset": True})).json()
+
+    jobs = {job.id: job for job in (await db.execute(select(ParseJob))).scalars()}
+    assert jobs[sync["job_id"]].kind == JOB_KIND_SYNC_CATEGORIES
+    assert jobs[crawl["job_id"]].kind == JOB_KIND_CRAWL_TREE
+    assert jobs[crawl["job_id"]].mode == "reset"
@@ -0,0 +1,68 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+
+
+async def serve(concurrency: int | None) -> None:
+    from app.db.base import Base
+    from app.db.session import engine
+    from app.services.browser_pool import browser_pool
+    from app.services.html_extractor import shutdown_pool
+    from app.services.job_runner import job_runner
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await browser_pool.start()
+    await job_runner.start(concurrency)
+    try:
+        await stop.wait()
+    finally:
+        await job_runner.stop()
+        await browser_pool.stop()
+        shutdown_pool()
+        await engine.dispose()
+
+
+def run_process(concurrency: int | None) -> None:
+    asyncio.run(serve(concurrency))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Scraping workers: each process owns a browser pool and leases parse jobs."
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=int(os.environ.get("WORKER_PROCESSES", os.cpu_count() or 1)),
+    )
+    parser.add_argument("--concurrency", type=int, default=None, help="Jobs per process")
+    args = parser.parse_args()
+
+    # spawn gives every process its own event loop, pools and lease owner ID
+    ctx = multiprocessing.get_context("spawn")
+    processes = [
+        ctx.Process(target=run_process, args=(args.concurrency,), name=f"worker-{index}")
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(signum, _frame):
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signum)
+
+    signal.signal(signal.SIGINT, forward)
+    signal.signal(signal.SIGTERM, forward)
+
+    for process in processes:
+        process.join()